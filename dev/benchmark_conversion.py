@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# File: dev/benchmark_conversion.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from collections import deque
+from unicorn_fy.record_pool import RecordPool
+from unicorn_fy.unicorn_fy import UnicornFy
+import gc
+import time
+
+# Benchmark of the different conversion modes for high-rate streams. The last `BACKLOG` results are kept alive to
+# simulate a consumer, otherwise the garbage collector would never have to run.
+# Usage: python3 dev/benchmark_conversion.py
+
+ROUNDS = 200000
+BACKLOG = 1000
+
+STREAM_DATA = {
+    'aggTrade': (UnicornFy.binance_com_websocket,
+                 '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1592584651517,"s":"BTCUSDT","a":315753210,'
+                 '"p":"9319.00000000","q":"0.01864900","f":343675554,"l":343675554,"T":1592584651516,"m":true,'
+                 '"M":true}}'),
+    'bookTicker': (UnicornFy.binance_com_futures_websocket,
+                   '{"stream":"galausdt@bookTicker","data":{"e":"bookTicker","u":1592216279872,"s":"GALAUSDT",'
+                   '"b":"0.07661","B":"40088","a":"0.07662","A":"929","T":1654792470066,"E":1654792470073}}'),
+    'depthUpdate': (UnicornFy.binance_com_futures_websocket,
+                    '{"stream":"btcusdt@depth@100ms","data":{"e":"depthUpdate","E":1654854178479,"T":1654854178470,'
+                    '"s":"BTCUSDT","U":1594332829840,"u":1594332837247,"pu":1594332829814,'
+                    '"b":[["28499.90","0.141"],["28500.00","151.746"]],"a":[["29406.80","1.077"]]}}'),
+    'markPriceUpdate': (UnicornFy.binance_com_futures_websocket,
+                        '{"stream":"btcusdt@markPrice","data":{"e":"markPriceUpdate","E":1562305380000,"s":"BTCUSDT",'
+                        '"p":"11794.15000000","i":"11784.62659091","P":"11784.25641265","r":"0.00038167",'
+                        '"T":1562306400000}}'),
+}
+
+gc_pause = {'start': 0.0, 'total': 0.0}
+
+
+def gc_callback(phase, info):
+    if phase == "start":
+        gc_pause['start'] = time.perf_counter()
+    else:
+        gc_pause['total'] += time.perf_counter() - gc_pause['start']
+
+
+def benchmark(converter, stream_data_json, **kwargs) -> tuple:
+    backlog = deque()
+    record_pool = kwargs.get('record_pool')
+    gc.collect()
+    gen0_collections = gc.get_stats()[0]['collections']
+    gc_pause['total'] = 0.0
+    start_time = time.perf_counter()
+    for _ in range(ROUNDS):
+        backlog.append(converter(stream_data_json, **kwargs))
+        if len(backlog) > BACKLOG:
+            unicorn_fied_data = backlog.popleft()
+            if record_pool is not None:
+                record_pool.release(unicorn_fied_data)
+    runtime = time.perf_counter() - start_time
+    return runtime, gc.get_stats()[0]['collections'] - gen0_collections, gc_pause['total']
+
+
+def print_result(mode, result):
+    runtime, collections, pause = result
+    print(f"\t{mode:<9} {runtime / ROUNDS * 1000000:.2f} µs/msg, {collections} gen-0 collections, "
+          f"{pause * 1000:.2f} ms gc pause")
+
+
+gc.callbacks.append(gc_callback)
+print(f"Rounds per benchmark: {ROUNDS}")
+for event_type, (converter, stream_data_json) in STREAM_DATA.items():
+    print(f"{event_type}:")
+    print_result("copy:", benchmark(converter, stream_data_json))
+    if event_type in ('aggTrade', 'bookTicker', 'depthUpdate'):
+        print_result("in_place:", benchmark(converter, stream_data_json, in_place=True))
+    if event_type in ('bookTicker', 'markPriceUpdate'):
+        print_result("pooled:", benchmark(converter, stream_data_json, record_pool=RecordPool()))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# File: dev/benchmark_handoff.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from collections import deque
+from unicorn_fy.converter_worker import ConverterWorker
+import statistics
+import threading
+import time
+
+# Benchmark of the handoff latency between a receiving and a converting thread: polling with `time.sleep(0.01)` like
+# in `dev/test_stream_everything_and_unicorn_fy.py` vs. `ConverterWorker` with its `SpscRingBuffer`.
+# Usage: python3 dev/benchmark_handoff.py
+
+MESSAGES = 2000
+INTERVAL = 0.001
+
+
+def produce(add):
+    for _ in range(MESSAGES):
+        add(time.perf_counter())
+        time.sleep(INTERVAL)
+
+
+def print_result(name, latencies):
+    latencies = sorted(latencies)
+    print(f"{name}: median {statistics.median(latencies) * 1000000:.1f} µs, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000000:.1f} µs")
+
+
+def benchmark_polling():
+    latencies = []
+    stream_buffer = deque()
+
+    def consume():
+        while len(latencies) < MESSAGES:
+            try:
+                latencies.append(time.perf_counter() - stream_buffer.popleft())
+            except IndexError:
+                time.sleep(0.01)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    produce(stream_buffer.append)
+    consumer.join()
+    return latencies
+
+
+def benchmark_converter_worker():
+    latencies = []
+    with ConverterWorker(process_unicorn_fied_data=lambda sent: latencies.append(time.perf_counter() - sent),
+                         converter=lambda sent: sent) as converter_worker:
+        produce(converter_worker.add)
+    return latencies
+
+
+print_result("polling", benchmark_polling())
+print_result("ConverterWorker", benchmark_converter_worker())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# File: dev/benchmark_import_time.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+
+import os
+import statistics
+import subprocess
+import sys
+
+# Benchmark of `import unicorn_fy` in fresh interpreters, reported by `python -X importtime`. The slowest imports
+# of the last run are listed and `requests` must not be imported anymore.
+# Usage: python3 dev/benchmark_import_time.py
+
+RUNS = 20
+TOP = 10
+
+
+def import_time():
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                             "import sys, unicorn_fy; print('requests' in sys.modules)"],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, cumulative_time, name = line[len("import time:"):].split("|")
+        if self_time.strip().isdigit():
+            imports.append((int(cumulative_time), int(self_time), name.rstrip()))
+    total = next(cumulative for cumulative, _, name in imports if name.strip() == "unicorn_fy")
+    return total, imports, result.stdout.strip() == "True"
+
+
+totals = []
+imports = []
+requests_imported = False
+for _ in range(RUNS):
+    total, imports, requests_imported = import_time()
+    totals.append(total)
+print(f"import unicorn_fy: median {statistics.median(totals) / 1000:.1f} ms, min {min(totals) / 1000:.1f} ms "
+      f"({RUNS} runs)")
+print(f"requests imported: {requests_imported}")
+print("Slowest imports (self time) of the last run:")
+for cumulative, self_time, name in sorted(imports, key=lambda item: item[1], reverse=True)[:TOP]:
+    print(f"  {self_time / 1000:7.2f} ms {name.strip()}")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# File: dev/benchmark_sharded_conversion.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+
+from unicorn_fy.sharded_converter import ShardedConverter
+import os
+import time
+
+# Benchmark of the throughput of `ShardedConverter` with a growing amount of shards.
+# Usage: python3 dev/benchmark_sharded_conversion.py
+
+FRAMES_PER_SYMBOL = 5000
+SYMBOLS = [f"sym{number}usdt" for number in range(64)]
+
+frames = []
+for trade_id in range(FRAMES_PER_SYMBOL):
+    for symbol in SYMBOLS:
+        frames.append(f'{{"stream":"{symbol}@aggTrade","data":{{"e":"aggTrade","E":1592584651517,'
+                      f'"s":"{symbol.upper()}","a":{trade_id},"p":"9319.00000000","q":"0.01864900","f":343675554,'
+                      f'"l":343675554,"T":1592584651516,"m":true,"M":true}}}}')
+
+shards = 1
+while shards <= (os.cpu_count() or 1):
+    converted_frames = 0
+    sharded_converter = ShardedConverter(shards=shards, converter="binance_com_websocket", batch_size=500)
+    start_time = time.perf_counter()
+    for frame in frames:
+        sharded_converter.add(frame)
+    sharded_converter.stop()
+    while True:
+        batch = sharded_converter.get_batch()
+        if batch is None:
+            break
+        converted_frames += len(batch)
+    runtime = time.perf_counter() - start_time
+    sharded_converter.join()
+    print(f"{shards} shard(s): {converted_frames / runtime:.0f} frames/s")
+    shards *= 2
@@ -40,7 +40,7 @@
 from unicorn_fy.unicorn_fy import UnicornFy
 
 with UnicornFy() as ufy:
-    print("is_update_available: " + str(ufy.is_update_available()))
+    print("is_update_available: " + str(ufy.is_update_available(timeout=5)))
     print("get_latest_version: " + str(ufy.get_latest_version()))
     print("get_version: " + str(ufy.get_version()))
     print("get_latest_release_info: " + str(ufy.get_latest_release_info()))
\ No newline at end of file
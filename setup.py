@@ -94,7 +94,8 @@ setup(
          'Telegram': 'https://t.me/unicorndevs',
      },
      packages=find_packages(exclude=[f"dev/{source_dir}"], include=[source_dir]),
-     ext_modules=cythonize(extensions, compiler_directives={'language_level': "3"}),
+     ext_modules=cythonize(extensions, compiler_directives={'language_level': "3",
+                                                            'freethreading_compatible': True}),
      python_requires='>=3.8.0',
      package_data={'': ['*.so', '*.dll', '*.py', '*.pyd', '*.pyi']},
      include_package_data=True,
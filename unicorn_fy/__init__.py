@@ -1 +1,25 @@
 from .unicorn_fy import UnicornFy
+from .stream_name import StreamName, parse_stream_name
+from .record_pool import BookTickerRecord, MarkPriceArrayRecord, MarkPriceRecord, PooledRecord, RecordPool
+from .record_view import RecordView
+from .record_serializer import RecordSerializer
+from .rest_converter import RestConverter
+from .binary_codec import BinaryCodec
+from .frame_builder import FrameBuilder
+from .ticker_delta_tracker import TickerDeltaTracker
+from .depth_diff_tracker import DepthDiffTracker
+from .top_of_book import TopOfBook
+from .conflator import Conflator
+from .deduplicator import Deduplicator
+from .ring_buffer import SpscRingBuffer
+from .converter_worker import ConverterWorker
+from .file_sink import FileSink
+from .sharded_converter import ShardedConverter
+from .threaded_converter import SynchronizedProxy, ThreadedConverter, is_gil_enabled
+from .shared_memory_channel import SharedMemoryChannel
+from .futures_account_state import FuturesAccountState
+from .spot_account_state import SpotAccountState
+from .order_tracker import OrderTracker
+from .rolling_trade_stats import RollingTradeStats
+from .sequence_gap_detector import SequenceGapDetector
+from .latency_monitor import LatencyMonitor
@@ -0,0 +1,337 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/binary_codec.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from typing import Optional
+import struct
+
+# Fields of the binary records in the order of the unicorn_fied dicts: `(key, kind)` with the kinds `e` = event type
+# (not stored), `s` = string id (uint32), `q` = int64, `p` = price (float64 or scaled int64), `?` = bool and
+# `l` = depth level (int16, `False` is stored as 0)
+BINARY_RECORD_LAYOUTS: dict = {
+    'trade': (1, (('stream_type', 's'), ('event_type', 'e'), ('event_time', 'q'), ('symbol', 's'),
+                  ('trade_id', 'q'), ('price', 'p'), ('quantity', 'p'), ('buyer_order_id', 'q'),
+                  ('seller_order_id', 'q'), ('trade_time', 'q'), ('is_market_maker', '?'), ('ignore', '?'))),
+    'aggTrade': (2, (('stream_type', 's'), ('event_type', 'e'), ('event_time', 'q'), ('symbol', 's'),
+                     ('aggregate_trade_id', 'q'), ('price', 'p'), ('quantity', 'p'), ('first_trade_id', 'q'),
+                     ('last_trade_id', 'q'), ('trade_time', 'q'), ('is_market_maker', '?'), ('ignore', '?'))),
+    'bookTicker': (3, (('stream_type', 's'), ('order_book_update_id', 'q'), ('symbol', 's'),
+                       ('best_bid_price', 'p'), ('best_bid_quantity', 'p'), ('best_ask_price', 'p'),
+                       ('best_ask_quantity', 'p'), ('event_type', 'e'), ('pair', 's'))),
+    'depthUpdate': (4, (('stream_type', 's'), ('event_type', 'e'), ('event_time', 'q'), ('transaction_time', 'q'),
+                        ('symbol', 's'), ('depth_level', 'l'), ('first_update_id_in_event', 'q'),
+                        ('final_update_id_in_event', 'q'), ('final_update_id_in_previous_event', 'q'),
+                        ('pair', 's'))),
+}
+# Depth updates are followed by their price levels: the record holds the number of bids and asks
+BINARY_DEPTH_LEVELS: tuple = ('bids', 'asks')
+# Record header: record type id, bit mask of the present fields, string ids of the exchange and the UnicornFy version
+BINARY_RECORD_HEADER: str = "<BIII"
+# Bit of the mask that marks a present `unicorn_fied` field
+BINARY_UNICORN_FIED_BIT: int = 1 << 31
+
+
+class BinaryCodec(object):
+    """
+    Encode unicorn_fied `trade`, `aggTrade`, `bookTicker` and `depthUpdate` dicts to compact fixed-layout binary
+    records and decode them back to the unicorn_fied dict shape.
+
+    Ids and times are stored as int64, prices as float64 or, with `price_decimals`, as int64 scaled by
+    `10 ** price_decimals`. Strings (stream types, symbols, pairs, the exchange and the version) are stored as ids of
+    a string table which grows while encoding - save `get_strings()` next to the encoded data and pass it to the
+    `BinaryCodec` that decodes it. Fields that are missing in a dict (e.g. `pair` of spot events or `unicorn_fied`)
+    are missing in the decoded dict as well.
+
+    Decoded prices are strings: with `price_decimals` they are formatted with exactly `price_decimals` decimals, with
+    float64 prices they are the shortest repr of the float, so trailing zeros of the received strings are not kept.
+    Scaled prices with more decimals than `price_decimals` get truncated.
+
+    :param price_decimals: Store prices as int64 with this number of decimals instead of float64.
+    :type price_decimals: int
+
+    :param strings: The string table of the encoded data.
+    :type strings: list
+    """
+    def __init__(self, price_decimals: Optional[int] = None, strings: Optional[list] = None):
+        self.price_decimals = price_decimals
+        self.price_scale = None if price_decimals is None else 10 ** price_decimals
+        price_format = "d" if price_decimals is None else "q"
+        self.strings: list = []
+        self.string_ids: dict = {}
+        for string in strings or ():
+            self.get_string_id(string)
+        self.layouts: dict = {}
+        self.layouts_by_id: dict = {}
+        for event_type, (type_id, fields) in BINARY_RECORD_LAYOUTS.items():
+            record_format = BINARY_RECORD_HEADER
+            for key, kind in fields:
+                if kind == 'e':
+                    continue
+                record_format += {'s': "I", 'q': "q", 'p': price_format, '?': "?", 'l': "h"}[kind]
+            if event_type == 'depthUpdate':
+                record_format += "II"
+            layout = (type_id, event_type, fields, tuple((key, kind) for key, kind in fields if kind != 'e'),
+                      struct.Struct(record_format))
+            self.layouts[event_type] = layout
+            self.layouts_by_id[type_id] = layout
+        self.level_format = "<%d" + price_format
+        self.buffer = bytearray()
+
+    def _from_price(self, value, as_float: bool = False):
+        if self.price_scale is None:
+            return value if as_float else repr(value)
+        if as_float:
+            return value / self.price_scale
+        if self.price_decimals == 0:
+            return str(value)
+        whole, fraction = divmod(abs(value), self.price_scale)
+        return f"{'-' if value < 0 else ''}{whole}.{fraction:0{self.price_decimals}d}"
+
+    def _to_price(self, value):
+        if self.price_scale is None:
+            return float(value)
+        if type(value) is str:
+            whole, _, fraction = value.partition('.')
+            return int(whole + fraction[:self.price_decimals].ljust(self.price_decimals, '0'))
+        return round(value * self.price_scale)
+
+    def get_string_id(self, string: str) -> int:
+        """
+        Get the id of a string in the string table, new strings get added.
+
+        :param string: The string.
+        :type string: str
+
+        :return: int
+        """
+        try:
+            return self.string_ids[string]
+        except KeyError:
+            self.string_ids[string] = len(self.strings)
+            self.strings.append(string)
+            return self.string_ids[string]
+
+    def get_strings(self) -> list:
+        """
+        Get the string table which is needed to decode the encoded data.
+
+        :return: list
+        """
+        return list(self.strings)
+
+    def get_size(self, unicorn_fied_data) -> Optional[int]:
+        """
+        Get the size of the binary record of a unicorn_fied dict.
+
+        :param unicorn_fied_data: The unicorn_fied dict.
+        :type unicorn_fied_data: dict
+
+        :return: int or None if the event type is not supported
+        """
+        layout = self.layouts.get(unicorn_fied_data.get('event_type'))
+        if layout is None:
+            return None
+        size = layout[4].size
+        if layout[1] == 'depthUpdate':
+            size += 16 * sum(len(unicorn_fied_data.get(side) or ()) for side in BINARY_DEPTH_LEVELS)
+        return size
+
+    def encode_into(self, buffer, offset: int, unicorn_fied_data) -> int:
+        """
+        Encode a unicorn_fied dict into a buffer.
+
+        :param buffer: A writable buffer (`bytearray`, `memoryview`, `mmap`) with enough space.
+        :type buffer: bytearray
+
+        :param offset: The position to write the record to.
+        :type offset: int
+
+        :param unicorn_fied_data: The unicorn_fied dict.
+        :type unicorn_fied_data: dict
+
+        :return: int - the position behind the record, or `offset` if the event type is not supported
+        """
+        layout = self.layouts.get(unicorn_fied_data.get('event_type'))
+        if layout is None:
+            return offset
+        type_id, event_type, _, packed_fields, record_struct = layout
+        unicorn_fied = unicorn_fied_data.get('unicorn_fied')
+        if unicorn_fied is None:
+            mask = 0
+            exchange_id = version_id = 0
+        else:
+            mask = BINARY_UNICORN_FIED_BIT
+            exchange_id = self.get_string_id(unicorn_fied[0])
+            version_id = self.get_string_id(unicorn_fied[1])
+        values = []
+        bit = 1
+        for key, kind in packed_fields:
+            value = unicorn_fied_data.get(key)
+            if value is None:
+                values.append(0)
+            else:
+                mask |= bit
+                if kind == 'p':
+                    values.append(self._to_price(value))
+                elif kind == 's':
+                    values.append(self.get_string_id(value))
+                elif kind == 'l':
+                    values.append(value or 0)
+                else:
+                    values.append(value)
+            bit <<= 1
+        if event_type == 'depthUpdate':
+            levels = [unicorn_fied_data.get(side) or () for side in BINARY_DEPTH_LEVELS]
+            values.extend(len(side) for side in levels)
+        record_struct.pack_into(buffer, offset, type_id, mask, exchange_id, version_id, *values)
+        offset += record_struct.size
+        if event_type == 'depthUpdate':
+            flat_levels = [self._to_price(value) for side in levels for level in side for value in level[:2]]
+            if flat_levels:
+                struct.pack_into(self.level_format % len(flat_levels), buffer, offset, *flat_levels)
+                offset += 8 * len(flat_levels)
+        return offset
+
+    def encode(self, unicorn_fied_data) -> Optional[bytes]:
+        """
+        Encode a unicorn_fied dict.
+
+        :param unicorn_fied_data: The unicorn_fied dict.
+        :type unicorn_fied_data: dict
+
+        :return: bytes or None if the event type is not supported
+        """
+        size = self.get_size(unicorn_fied_data)
+        if size is None:
+            return None
+        buffer = bytearray(size)
+        self.encode_into(buffer, 0, unicorn_fied_data)
+        return bytes(buffer)
+
+    def encode_batch(self, unicorn_fied_data_list, buffer=None) -> memoryview:
+        """
+        Encode unicorn_fied dicts into one buffer, unsupported event types are skipped.
+
+        Without `buffer` the records are written to a buffer of the codec which is reused by the next call, copy the
+        returned view (`bytes(view)`) if it has to outlive the next call.
+
+        :param unicorn_fied_data_list: The unicorn_fied dicts.
+        :type unicorn_fied_data_list: list
+
+        :param buffer: A preallocated writable buffer.
+        :type buffer: bytearray
+
+        :return: memoryview of the written records
+        """
+        size = sum(self.get_size(unicorn_fied_data) or 0 for unicorn_fied_data in unicorn_fied_data_list)
+        if buffer is None:
+            if len(self.buffer) < size:
+                # a new buffer instead of resizing, views of the last batch may still exist
+                self.buffer = bytearray(max(size, 2 * len(self.buffer)))
+            buffer = self.buffer
+        elif len(buffer) < size:
+            raise ValueError(f"The buffer is too small: {len(buffer)} bytes, {size} bytes needed")
+        offset = 0
+        for unicorn_fied_data in unicorn_fied_data_list:
+            offset = self.encode_into(buffer, offset, unicorn_fied_data)
+        return memoryview(buffer)[:offset]
+
+    def decode(self, buffer, offset: int = 0, as_float: bool = False) -> tuple:
+        """
+        Decode one record.
+
+        :param buffer: The encoded records.
+        :type buffer: bytes
+
+        :param offset: The position of the record.
+        :type offset: int
+
+        :param as_float: Return prices as float instead of str.
+        :type as_float: bool
+
+        :return: tuple - the unicorn_fied dict and the position of the next record
+        """
+        _, event_type, fields, _, record_struct = self.layouts_by_id[buffer[offset]]
+        values = record_struct.unpack_from(buffer, offset)
+        offset += record_struct.size
+        mask = values[1]
+        unicorn_fied_data = {}
+        index = 0
+        for key, kind in fields:
+            if kind == 'e':
+                unicorn_fied_data[key] = event_type
+                continue
+            if mask & (1 << index):
+                value = values[4 + index]
+                if kind == 'p':
+                    value = self._from_price(value, as_float=as_float)
+                elif kind == 's':
+                    value = self.strings[value]
+                elif kind == 'l':
+                    value = value or False
+                unicorn_fied_data[key] = value
+            index += 1
+        if event_type == 'depthUpdate':
+            for side, count in zip(BINARY_DEPTH_LEVELS, values[-2:]):
+                flat_levels = struct.unpack_from(self.level_format % (2 * count), buffer, offset)
+                offset += 16 * count
+                unicorn_fied_data[side] = [[self._from_price(flat_levels[i], as_float=as_float),
+                                            self._from_price(flat_levels[i + 1], as_float=as_float)]
+                                           for i in range(0, 2 * count, 2)]
+        if mask & BINARY_UNICORN_FIED_BIT:
+            unicorn_fied_data['unicorn_fied'] = [self.strings[values[2]], self.strings[values[3]]]
+        return unicorn_fied_data, offset
+
+    def decode_batch(self, buffer, as_float: bool = False) -> list:
+        """
+        Decode all records of a buffer.
+
+        :param buffer: The encoded records.
+        :type buffer: bytes
+
+        :param as_float: Return prices as float instead of str.
+        :type as_float: bool
+
+        :return: list
+        """
+        records = []
+        offset = 0
+        while offset < len(buffer):
+            unicorn_fied_data, offset = self.decode(buffer, offset=offset, as_float=as_float)
+            records.append(unicorn_fied_data)
+        return records
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/conflator.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from .stream_name import parse_stream_name
+from collections import deque
+from typing import Optional
+import threading
+import time
+
+
+class Conflator(object):
+    """
+    Conflation stage between the raw stream buffer and the conversion for latest-value streams.
+
+    Only the newest raw frame per key is kept for `bookTicker`, `markPriceUpdate`, `indexPriceUpdate` and kline
+    streams, the key is the stream name (e.g. `btcusdt@bookTicker`) of combined streams or the event type and symbol
+    (plus the interval of klines) of raw streams. It is extracted by a substring search, so stale frames are dropped
+    without decoding them. All other frames are passed through in their original order. Closed klines are never
+    dropped.
+
+    `add()` can be called from the receiving thread and `get_frames()` from the converting thread.
+
+    :param flush_interval: Conflated frames are released by `get_frames()` at most every `flush_interval` seconds,
+                           `0` releases them on every call.
+    :type flush_interval: float
+
+    :param event_types: The event types to conflate.
+    :type event_types: tuple
+    """
+    # Longer prefixes first, `markPriceKline_` must not be matched by `markPrice`
+    STREAM_CHANNELS: dict = {'bookTicker': 'bookTicker',
+                             'markPriceKline_': 'markPrice_kline',
+                             'indexPriceKline_': 'indexPrice_kline',
+                             'markPrice': 'markPriceUpdate',
+                             'indexPrice': 'indexPriceUpdate',
+                             'continuousKline_': 'continuous_kline',
+                             'kline_': 'kline'}
+    KLINE_EVENT_TYPES: frozenset = frozenset(('kline', 'continuous_kline', 'markPrice_kline', 'indexPrice_kline'))
+
+    def __init__(self, flush_interval: float = 0.1,
+                 event_types: tuple = ('bookTicker', 'markPriceUpdate', 'indexPriceUpdate', 'kline',
+                                       'continuous_kline', 'markPrice_kline', 'indexPrice_kline')):
+        self.flush_interval = flush_interval
+        self.event_types = frozenset(event_types)
+        self.pending_frames: dict = {}
+        self.passed_frames: deque = deque()
+        self.last_flush: float = time.monotonic()
+        self.received_frames: int = 0
+        self.dropped_frames: int = 0
+        self.dropped_frames_per_event_type: dict = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _find_value(frame: str, pattern: str) -> Optional[str]:
+        start = frame.find(pattern)
+        if start == -1:
+            return None
+        start += len(pattern)
+        return frame[start:frame.find('"', start)]
+
+    def get_key(self, frame: str) -> Optional[tuple]:
+        """
+        Get the conflation key and event type of a raw frame.
+
+        :param frame: Received raw stream data
+        :type frame: str
+
+        :return: tuple `(key, event_type)` or None if the frame must not be conflated.
+        """
+        if frame.startswith('{"stream":"'):
+            stream_name = parse_stream_name(frame[11:frame.find('"', 11)])
+            for prefix, event_type in self.STREAM_CHANNELS.items():
+                if stream_name.channel.startswith(prefix):
+                    if event_type not in self.event_types:
+                        return None
+                    if stream_name.symbol is None and stream_name.is_array is False:
+                        # All market stream with one symbol per frame, e.g. `!bookTicker`
+                        return (stream_name.stream, self._find_value(frame, '"s":"')), event_type
+                    return stream_name.stream, event_type
+            return None
+        if frame.startswith('['):
+            # Arrays are full states of all symbols, so the latest one is enough
+            event_type = self._find_value(frame, '"e":"')
+            if event_type not in self.event_types:
+                return None
+            return event_type, event_type
+        event_type = self._find_value(frame, '"e":"')
+        if event_type not in self.event_types:
+            return None
+        if event_type in self.KLINE_EVENT_TYPES:
+            # `i` is the interval only in klines, continuous klines have a pair `ps` and a contract type `ct`
+            return (event_type, self._find_value(frame, '"s":"'), self._find_value(frame, '"ps":"'),
+                    self._find_value(frame, '"ct":"'), self._find_value(frame, '"i":"')), event_type
+        if event_type == 'indexPriceUpdate':
+            # The pair is in `i`, there is no `s`
+            return (event_type, self._find_value(frame, '"i":"')), event_type
+        return (event_type, self._find_value(frame, '"s":"')), event_type
+
+    def add(self, frame) -> None:
+        """
+        Add a received raw frame.
+
+        :param frame: Received raw stream data
+        :type frame: str
+
+        :return: None
+        """
+        key = None
+        if isinstance(frame, str):
+            key = self.get_key(frame)
+        with self.lock:
+            self.received_frames += 1
+            if key is None:
+                self.passed_frames.append(frame)
+                return
+            key, event_type = key
+            stale_frame = self.pending_frames.pop(key, None)
+            if stale_frame is not None:
+                if '"x":true' in stale_frame:
+                    self.passed_frames.append(stale_frame)
+                else:
+                    self.dropped_frames += 1
+                    self.dropped_frames_per_event_type[event_type] = \
+                        self.dropped_frames_per_event_type.get(event_type, 0) + 1
+            self.pending_frames[key] = frame
+
+    def get_frames(self, force: bool = False) -> list:
+        """
+        Get all passed through frames and, if the flush interval is over, the conflated frames.
+
+        :param force: Release the conflated frames regardless of the flush interval.
+        :type force: bool
+
+        :return: list
+        """
+        with self.lock:
+            frames = list(self.passed_frames)
+            self.passed_frames.clear()
+            now = time.monotonic()
+            if force is True or now - self.last_flush >= self.flush_interval:
+                frames.extend(self.pending_frames.values())
+                self.pending_frames = {}
+                self.last_flush = now
+            return frames
+
+    def get_stats(self) -> dict:
+        """
+        Get the counters of the conflation stage.
+
+        :return: dict
+        """
+        with self.lock:
+            return {'received_frames': self.received_frames,
+                    'dropped_frames': self.dropped_frames,
+                    'dropped_frames_per_event_type': dict(self.dropped_frames_per_event_type),
+                    'pending_frames': len(self.pending_frames) + len(self.passed_frames)}
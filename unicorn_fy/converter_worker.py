@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/converter_worker.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from .ring_buffer import SpscRingBuffer
+from .unicorn_fy import UnicornFy
+from typing import Callable, Optional
+import logging
+import threading
+
+logger = logging.getLogger("unicorn_fy")
+
+
+class ConverterWorker(threading.Thread):
+    """
+    Thread that converts raw frames handed over by a receiving thread through a `SpscRingBuffer`.
+
+    The receiving thread calls `add()` (e.g. as `process_stream_data` callback of the UNICORN Binance WebSocket API),
+    the worker drains the buffer in batches, converts each frame with `converter` and hands the result to
+    `process_unicorn_fied_data`. There is no polling with sleeps, the worker spins briefly and then parks until the
+    next frame arrives. Exceptions of the converter and of `process_unicorn_fied_data` are logged and counted in
+    `get_stats()`, the worker keeps running.
+
+    :param process_unicorn_fied_data: Callback for each converted frame, runs in the worker thread.
+    :type process_unicorn_fied_data: function
+
+    :param converter: The converter function, e.g. `UnicornFy.binance_com_futures_websocket`
+    :type converter: function
+
+    :param converter_kwargs: Keyword arguments for the converter, e.g. `{'as_view': True}`
+    :type converter_kwargs: dict
+
+    :param capacity: Capacity of the ring buffer.
+    :type capacity: int
+
+    :param batch_size: Maximum amount of frames converted per drain of the ring buffer.
+    :type batch_size: int
+
+    :param spin_count: How many times the worker checks for new frames before it parks.
+    :type spin_count: int
+    """
+    def __init__(self,
+                 process_unicorn_fied_data: Callable,
+                 converter: Callable = UnicornFy.binance_com_websocket,
+                 converter_kwargs: Optional[dict] = None,
+                 capacity: int = 65536,
+                 batch_size: int = 1000,
+                 spin_count: int = 1000):
+        super().__init__(name="UnicornFy-ConverterWorker", daemon=True)
+        self.process_unicorn_fied_data = process_unicorn_fied_data
+        self.converter = converter
+        self.converter_kwargs = converter_kwargs if converter_kwargs is not None else {}
+        self.batch_size = batch_size
+        self.ring_buffer = SpscRingBuffer(capacity=capacity, spin_count=spin_count)
+        self.converted_frames: int = 0
+        self.failed_frames: int = 0
+        self.failed_callbacks: int = 0
+        self.stop_request: bool = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, error_traceback):
+        self.stop()
+
+    def add(self, stream_data_json) -> bool:
+        """
+        Hand over a received raw frame, must only be called by one producing thread.
+
+        :param stream_data_json: The received raw stream data
+        :type stream_data_json: str
+
+        :return: bool - False if the ring buffer is full and the frame got dropped.
+        """
+        return self.ring_buffer.push(stream_data_json)
+
+    def get_stats(self) -> dict:
+        """
+        Get the counters of the worker and its ring buffer.
+
+        :return: dict
+        """
+        stats = self.ring_buffer.get_stats()
+        stats['converted_frames'] = self.converted_frames
+        stats['failed_frames'] = self.failed_frames
+        stats['failed_callbacks'] = self.failed_callbacks
+        return stats
+
+    def run(self) -> None:
+        while self.stop_request is False or len(self.ring_buffer) > 0:
+            for stream_data_json in self.ring_buffer.pop_batch(max_items=self.batch_size, timeout=0.5):
+                try:
+                    unicorn_fied_data = self.converter(stream_data_json, **self.converter_kwargs)
+                except Exception as error_msg:
+                    self.failed_frames += 1
+                    logger.error(f"ConverterWorker.run() - Can not convert {stream_data_json} - error: {error_msg}")
+                    continue
+                self.converted_frames += 1
+                try:
+                    self.process_unicorn_fied_data(unicorn_fied_data)
+                except Exception as error_msg:
+                    self.failed_callbacks += 1
+                    logger.error(f"ConverterWorker.run() - Can not process {unicorn_fied_data} - error: {error_msg}")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Convert the remaining frames and stop the worker.
+
+        :param timeout: Maximum time in seconds to wait for the worker.
+        :type timeout: float
+
+        :return: None
+        """
+        self.stop_request = True
+        self.ring_buffer.wake_up()
+        if self.is_alive():
+            self.join(timeout)
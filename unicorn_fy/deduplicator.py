@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/deduplicator.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from collections import deque
+from typing import Optional
+import math
+import re
+import threading
+
+
+class Deduplicator(object):
+    """
+    Memory bounded deduplication of `aggTrade`, `trade`, `depthUpdate`, `executionReport` and `ORDER_TRADE_UPDATE`
+    events received twice, e.g. by redundant connections or after a resubscription.
+
+    The events are identified by their natural ids: `aggregate_trade_id`, `trade_id` and `final_update_id_in_event`
+    per `(event_type, symbol)` (depth updates per `(stream_type, symbol)`) and `order_id` + `trade_id` for order
+    events (`order_id`, execution type, status and `event_time` for order events without a trade).
+
+    The sequence ids are tracked in a sliding window of `window_size` ids behind the highest id per symbol, stored as
+    bits of an int: out of order events within the window are passed once, events behind the window are dropped. Order
+    events keep the last `window_size` ids per symbol. With `approximate=True` all ids go to two rotating Bloom
+    filters of `capacity` ids each instead, the memory is fixed and independent of the number of symbols, but a
+    fraction of about `error_rate` of new events is dropped as false positives.
+
+    `is_duplicate_frame()` and `filter_frames()` extract the ids of `aggTrade`, `trade` and `depthUpdate` frames by a
+    regex search, so duplicates are dropped before the conversion. `is_duplicate()` checks unicorn_fied dicts and
+    covers the order events too. Each call records the id, so check every event with one of them only. All methods
+    can be called from multiple threads.
+
+    :param window_size: Number of ids per symbol within which out of order events are accepted.
+    :type window_size: int
+
+    :param approximate: Use Bloom filters instead of the per symbol windows.
+    :type approximate: bool
+
+    :param capacity: Number of ids per Bloom filter generation.
+    :type capacity: int
+
+    :param error_rate: False positive rate of the Bloom filters.
+    :type error_rate: float
+    """
+    # Raw frames: event type pattern and id pattern
+    EVENT_TYPE_PATTERN = re.compile(r'"e":"([^"]*)"')
+    SYMBOL_PATTERN = re.compile(r'"s":"([^"]*)"')
+    ID_PATTERNS: dict = {'aggTrade': re.compile(r'"a":(\d+)'),
+                         'trade': re.compile(r'"t":(\d+)'),
+                         'depthUpdate': re.compile(r'"u":(\d+)')}
+    ID_KEYS: dict = {'aggTrade': 'aggregate_trade_id',
+                     'trade': 'trade_id',
+                     'depthUpdate': 'final_update_id_in_event'}
+    ORDER_EVENT_TYPES: frozenset = frozenset(('executionReport', 'ORDER_TRADE_UPDATE'))
+
+    def __init__(self, window_size: int = 4096, approximate: bool = False, capacity: int = 1000000,
+                 error_rate: float = 0.001):
+        self.window_size = window_size
+        self.window_mask = (1 << window_size) - 1
+        self.approximate = approximate
+        # scope: [highest id, bits of the seen ids behind it]
+        self.windows: dict = {}
+        # scope: (deque of the last ids, set of the last ids)
+        self.recent_ids: dict = {}
+        self.capacity = capacity
+        self.bloom_size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.bloom_hashes = max(1, round(self.bloom_size / capacity * math.log(2)))
+        self.bloom_filters: list = []
+        self.bloom_count: int = 0
+        if approximate is True:
+            self.bloom_filters = [bytearray((self.bloom_size + 7) // 8), bytearray((self.bloom_size + 7) // 8)]
+        self.received_events: int = 0
+        self.duplicates: int = 0
+        self.duplicates_per_event_type: dict = {}
+        self.expired_ids: int = 0
+        self.lock = threading.Lock()
+
+    def _check_bloom(self, key) -> bool:
+        key_hash = hash(key)
+        first_hash = key_hash & 0xFFFFFFFF
+        second_hash = (key_hash >> 32) | 1
+        positions = [(first_hash + i * second_hash) % self.bloom_size for i in range(self.bloom_hashes)]
+        current_filter, previous_filter = self.bloom_filters
+        if all(current_filter[position >> 3] & (1 << (position & 7)) for position in positions) or \
+                all(previous_filter[position >> 3] & (1 << (position & 7)) for position in positions):
+            return True
+        for position in positions:
+            current_filter[position >> 3] |= 1 << (position & 7)
+        self.bloom_count += 1
+        if self.bloom_count >= self.capacity:
+            self.bloom_filters = [bytearray(len(current_filter)), current_filter]
+            self.bloom_count = 0
+        return False
+
+    def _check_recent_id(self, scope: tuple, event_id) -> bool:
+        recent_ids = self.recent_ids.get(scope)
+        if recent_ids is None:
+            recent_ids = self.recent_ids[scope] = (deque(), set())
+        id_queue, id_set = recent_ids
+        if event_id in id_set:
+            return True
+        id_queue.append(event_id)
+        id_set.add(event_id)
+        if len(id_queue) > self.window_size:
+            id_set.discard(id_queue.popleft())
+        return False
+
+    def _check_window(self, scope: tuple, event_id: int) -> bool:
+        window = self.windows.get(scope)
+        if window is None:
+            self.windows[scope] = [event_id, 1]
+            return False
+        highest_id, bits = window
+        if event_id > highest_id:
+            shift = event_id - highest_id
+            window[0] = event_id
+            window[1] = ((bits << shift) | 1) & self.window_mask if shift < self.window_size else 1
+            return False
+        offset = highest_id - event_id
+        if offset >= self.window_size:
+            self.expired_ids += 1
+            return True
+        if bits & (1 << offset):
+            return True
+        window[1] = bits | (1 << offset)
+        return False
+
+    def _check(self, event_type: str, scope: tuple, event_id) -> bool:
+        with self.lock:
+            self.received_events += 1
+            if self.approximate is True:
+                is_duplicate = self._check_bloom((scope, event_id))
+            elif event_type in self.ORDER_EVENT_TYPES:
+                is_duplicate = self._check_recent_id(scope, event_id)
+            else:
+                is_duplicate = self._check_window(scope, event_id)
+            if is_duplicate is True:
+                self.duplicates += 1
+                self.duplicates_per_event_type[event_type] = self.duplicates_per_event_type.get(event_type, 0) + 1
+            return is_duplicate
+
+    def get_key(self, frame: str) -> Optional[tuple]:
+        """
+        Get the event type, scope and id of a raw frame.
+
+        :param frame: Received raw stream data
+        :type frame: str
+
+        :return: tuple `(event_type, scope, id)` or None if the frame has no cheaply extractable id.
+        """
+        event_type = self.EVENT_TYPE_PATTERN.search(frame)
+        if event_type is None:
+            return None
+        event_type = event_type.group(1)
+        id_pattern = self.ID_PATTERNS.get(event_type)
+        if id_pattern is None:
+            return None
+        event_id = id_pattern.search(frame)
+        symbol = self.SYMBOL_PATTERN.search(frame)
+        if event_id is None or symbol is None:
+            return None
+        if event_type == 'depthUpdate' and frame.startswith('{"stream":"'):
+            scope = (frame[11:frame.find('"', 11)], symbol.group(1))
+        else:
+            scope = (event_type, symbol.group(1))
+        return event_type, scope, int(event_id.group(1))
+
+    def is_duplicate_frame(self, frame) -> bool:
+        """
+        Check a raw frame and record its id, frames without extractable id are never duplicates.
+
+        :param frame: Received raw stream data
+        :type frame: str
+
+        :return: bool
+        """
+        if not isinstance(frame, str):
+            return False
+        key = self.get_key(frame)
+        if key is None:
+            return False
+        return self._check(*key)
+
+    def filter_frames(self, frames) -> list:
+        """
+        Remove the duplicates of a list of raw frames.
+
+        :param frames: Received raw stream data.
+        :type frames: list
+
+        :return: list
+        """
+        return [frame for frame in frames if not self.is_duplicate_frame(frame)]
+
+    def is_duplicate(self, unicorn_fied_data) -> bool:
+        """
+        Check a unicorn_fied event and record its id, other event types are never duplicates.
+
+        :param unicorn_fied_data: The unicorn_fied event.
+        :type unicorn_fied_data: dict
+
+        :return: bool
+        """
+        event_type = unicorn_fied_data.get('event_type')
+        if event_type in self.ORDER_EVENT_TYPES:
+            trade_id = unicorn_fied_data.get('trade_id')
+            if trade_id is not None and trade_id > 0:
+                event_id = (unicorn_fied_data.get('order_id'), trade_id)
+            else:
+                event_id = (unicorn_fied_data.get('order_id'), unicorn_fied_data.get('current_execution_type'),
+                            unicorn_fied_data.get('current_order_status'), unicorn_fied_data.get('event_time'))
+            return self._check(event_type, (event_type, unicorn_fied_data.get('symbol')), event_id)
+        id_key = self.ID_KEYS.get(event_type)
+        if id_key is None:
+            return False
+        if event_type == 'depthUpdate':
+            scope = (unicorn_fied_data.get('stream_type'), unicorn_fied_data.get('symbol'))
+        else:
+            scope = (event_type, unicorn_fied_data.get('symbol'))
+        return self._check(event_type, scope, unicorn_fied_data[id_key])
+
+    def get_stats(self) -> dict:
+        """
+        Get the counters of the deduplication stage.
+
+        :return: dict
+        """
+        with self.lock:
+            return {'received_events': self.received_events,
+                    'duplicates': self.duplicates,
+                    'duplicates_per_event_type': dict(self.duplicates_per_event_type),
+                    'expired_ids': self.expired_ids,
+                    'scopes': len(self.windows) + len(self.recent_ids)}
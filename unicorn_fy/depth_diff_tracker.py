@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/depth_diff_tracker.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from typing import Optional
+
+
+class DepthDiffTracker(object):
+    """
+    Keep the last snapshot of each partial book depth stream (`depth5`, `depth10`, `depth20`) and emit only the
+    changed levels.
+
+    Feed the unicorn_fied data of `UnicornFy.binance_com_websocket()` (`event_type` `depth`) or
+    `UnicornFy.binance_com_futures_websocket()` (`event_type` `depthUpdate` with a `depth_level`) into `update()`.
+    Snapshots are tracked per `stream_type` and compared with the previous one in a single merge pass over the sorted
+    levels of each side. A level that dropped out of the top N levels counts as deleted.
+
+    The diff has the fields of the snapshot except `bids` and `asks`, `event_type` is `depthDiff` and `bids` and
+    `asks` are `{'insert': [[price, quantity], ...], 'update': [[price, quantity], ...], 'delete': [price, ...]}`.
+    The first snapshot of a stream is emitted as inserts.
+    """
+    UPDATE_ID_KEYS: tuple = ('last_update_id', 'final_update_id_in_event')
+
+    def __init__(self):
+        # stream_type: [update id, bids, asks]
+        self.books: dict = {}
+        self.snapshots: int = 0
+        self.unchanged_snapshots: int = 0
+        self.stale_snapshots: int = 0
+        self.inserts: int = 0
+        self.updates: int = 0
+        self.deletes: int = 0
+
+    @staticmethod
+    def _diff(previous_levels: list, levels: list, descending: bool) -> dict:
+        inserts = []
+        updates = []
+        deletes = []
+        previous_index = index = 0
+        while previous_index < len(previous_levels) and index < len(levels):
+            previous_level = previous_levels[previous_index]
+            level = levels[index]
+            # Prices are only parsed if the strings differ, most levels keep their price between snapshots
+            if previous_level[0] == level[0]:
+                if previous_level[1] != level[1]:
+                    updates.append(level)
+                previous_index += 1
+                index += 1
+            elif (float(previous_level[0]) < float(level[0])) is not descending:
+                # The previous level sorts first, so it is missing in the new snapshot
+                deletes.append(previous_level[0])
+                previous_index += 1
+            else:
+                inserts.append(level)
+                index += 1
+        deletes.extend(level[0] for level in previous_levels[previous_index:])
+        inserts.extend(levels[index:])
+        return {'insert': inserts, 'update': updates, 'delete': deletes}
+
+    def get_book(self, stream_type: str) -> Optional[dict]:
+        """
+        Get the last snapshot of a stream.
+
+        :param stream_type: The `stream_type` of the snapshots, e.g. `btcusdt@depth20@100ms`
+        :type stream_type: str
+
+        :return: dict `{'bids': [...], 'asks': [...]}` or None
+        """
+        book = self.books.get(stream_type)
+        if book is None:
+            return None
+        return {'bids': book[1], 'asks': book[2]}
+
+    def get_stats(self) -> dict:
+        """
+        Get the counters of the diff stage.
+
+        :return: dict
+        """
+        return {'streams': len(self.books),
+                'snapshots': self.snapshots,
+                'unchanged_snapshots': self.unchanged_snapshots,
+                'stale_snapshots': self.stale_snapshots,
+                'inserts': self.inserts,
+                'updates': self.updates,
+                'deletes': self.deletes}
+
+    def remove_stream(self, stream_type: str) -> bool:
+        """
+        Forget the snapshot of a stream, its next snapshot is emitted as inserts.
+
+        :param stream_type: The `stream_type` of the snapshots, e.g. `btcusdt@depth20@100ms`
+        :type stream_type: str
+
+        :return: bool
+        """
+        return self.books.pop(stream_type, None) is not None
+
+    def reset(self) -> None:
+        """
+        Forget all snapshots.
+
+        :return: None
+        """
+        self.books = {}
+
+    def update(self, unicorn_fied_data: dict) -> Optional[dict]:
+        """
+        Apply a unicorn_fied partial book depth snapshot and return its diff to the previous one.
+
+        :param unicorn_fied_data: The unicorn_fied depth data.
+        :type unicorn_fied_data: dict
+
+        :return: dict or None if nothing changed, the snapshot is older than the previous one or the event is no
+                 partial book depth snapshot
+        """
+        event_type = unicorn_fied_data.get('event_type')
+        if event_type != 'depth' and not (event_type == 'depthUpdate' and unicorn_fied_data.get('depth_level')):
+            return None
+        self.snapshots += 1
+        update_id = None
+        for key in self.UPDATE_ID_KEYS:
+            if key in unicorn_fied_data:
+                update_id = unicorn_fied_data[key]
+                break
+        bids = unicorn_fied_data['bids']
+        asks = unicorn_fied_data['asks']
+        book = self.books.get(unicorn_fied_data['stream_type'])
+        if book is not None:
+            if update_id is not None and book[0] is not None and update_id <= book[0]:
+                self.stale_snapshots += 1
+                return None
+            if bids == book[1] and asks == book[2]:
+                book[0] = update_id
+                self.unchanged_snapshots += 1
+                return None
+        if book is None:
+            bid_diff = {'insert': list(bids), 'update': [], 'delete': []}
+            ask_diff = {'insert': list(asks), 'update': [], 'delete': []}
+        else:
+            bid_diff = self._diff(book[1], bids, descending=True)
+            ask_diff = self._diff(book[2], asks, descending=False)
+        self.books[unicorn_fied_data['stream_type']] = [update_id, bids, asks]
+        for side_diff in (bid_diff, ask_diff):
+            self.inserts += len(side_diff['insert'])
+            self.updates += len(side_diff['update'])
+            self.deletes += len(side_diff['delete'])
+        diff = {key: value for key, value in unicorn_fied_data.items() if key != 'bids' and key != 'asks'}
+        diff['event_type'] = "depthDiff"
+        diff['bids'] = bid_diff
+        diff['asks'] = ask_diff
+        return diff
@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/file_sink.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from .ring_buffer import SpscRingBuffer
+from typing import Callable, Optional
+import logging
+import os
+import threading
+import time
+import ujson as json
+
+logger = logging.getLogger("unicorn_fy")
+
+FILE_SINK_EXTENSIONS: dict = {None: ".ndjson", "gzip": ".ndjson.gz", "lzma": ".ndjson.xz"}
+FILE_SINK_OVERFLOW_POLICIES: tuple = ("block", "drop")
+
+
+class FileSink(threading.Thread):
+    """
+    Thread that writes unicorn_fied records as newline delimited JSON (NDJSON) into rotating files.
+
+    The converting thread hands the records over with `add()` through a `SpscRingBuffer`, the serialization,
+    compression and all disk I/O happen in this thread. Serialized records are collected and written with one
+    `write()` call as soon as `buffer_size` bytes are pending or `flush_interval` seconds passed since the last write.
+
+    A file is closed after `max_file_size` bytes (measured on disk, after the compression) or `rotation_interval`
+    seconds, the next write opens a new file `<prefix>-<UTC time>-<file number>.ndjson[.gz|.xz]` in `directory`. The
+    size is checked after each write, a file can exceed `max_file_size` by one write.
+
+    If the disk falls behind and the ring buffer is full, `add()` waits up to `block_timeout` seconds for free space
+    with the overflow policy "block" (`None` waits as long as the sink is running) or drops the record at once with
+    "drop". Dropped records are counted in `get_stats()`.
+
+    Pooled records and `RecordView` objects are copied with `to_dict()` in `add()`, they can be released right after.
+
+    :param directory: Directory of the files, it is created if it does not exist.
+    :type directory: str
+
+    :param prefix: Prefix of the file names.
+    :type prefix: str
+
+    :param compression: `None`, "gzip" or "lzma"
+    :type compression: str
+
+    :param compression_level: Compression level, by default 6 for both "gzip" and "lzma".
+    :type compression_level: int
+
+    :param max_file_size: Rotate the file after this amount of bytes.
+    :type max_file_size: int
+
+    :param rotation_interval: Rotate the file after this amount of seconds, `None` rotates by size only.
+    :type rotation_interval: float
+
+    :param buffer_size: Amount of pending bytes written with one `write()` call.
+    :type buffer_size: int
+
+    :param flush_interval: Write pending records at the latest this amount of seconds after the last write.
+    :type flush_interval: float
+
+    :param fsync: Call `os.fsync()` after each write, otherwise only when a file is closed.
+    :type fsync: bool
+
+    :param overflow: Overflow policy, "block" or "drop".
+    :type overflow: str
+
+    :param block_timeout: Maximum time in seconds `add()` waits with the overflow policy "block".
+    :type block_timeout: float
+
+    :param capacity: Capacity of the ring buffer in records.
+    :type capacity: int
+
+    :param batch_size: Maximum amount of records serialized per drain of the ring buffer.
+    :type batch_size: int
+
+    :param on_file_closed: Callback with the path of each closed file, runs in the sink thread.
+    :type on_file_closed: function
+    """
+    def __init__(self,
+                 directory: str = ".",
+                 prefix: str = "unicorn_fy",
+                 compression: Optional[str] = None,
+                 compression_level: int = 6,
+                 max_file_size: int = 256 * 1024 * 1024,
+                 rotation_interval: Optional[float] = None,
+                 buffer_size: int = 1024 * 1024,
+                 flush_interval: float = 1.0,
+                 fsync: bool = False,
+                 overflow: str = "block",
+                 block_timeout: Optional[float] = None,
+                 capacity: int = 65536,
+                 batch_size: int = 1000,
+                 on_file_closed: Optional[Callable] = None):
+        super().__init__(name="UnicornFy-FileSink", daemon=True)
+        if compression not in FILE_SINK_EXTENSIONS:
+            raise ValueError(f"FileSink() - unknown compression: {compression}")
+        if overflow not in FILE_SINK_OVERFLOW_POLICIES:
+            raise ValueError(f"FileSink() - unknown overflow policy: {overflow}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.compression = compression
+        self.compression_level = compression_level
+        self.max_file_size = max_file_size
+        self.rotation_interval = rotation_interval
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.batch_size = batch_size
+        self.on_file_closed = on_file_closed
+        self.ring_buffer = SpscRingBuffer(capacity=capacity)
+        self.file = None
+        self.raw_file = None
+        self.file_path: Optional[str] = None
+        self.file_opened: float = 0.0
+        self.files: list = []
+        self.dropped_records: int = 0
+        self.failed_records: int = 0
+        self.written_records: int = 0
+        self.written_bytes: int = 0
+        self.writes: int = 0
+        self.write_errors: int = 0
+        self.stop_request: bool = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, error_traceback):
+        self.stop()
+
+    def _close_file(self) -> None:
+        try:
+            if self.file is not self.raw_file:
+                # Writes the rest of the compressed stream, the raw file stays open
+                self.file.close()
+            self.raw_file.flush()
+            os.fsync(self.raw_file.fileno())
+            self.raw_file.close()
+        except OSError as error_msg:
+            self.write_errors += 1
+            logger.error(f"FileSink._close_file() - can not close {self.file_path}: {error_msg}")
+        self.file = None
+        self.raw_file = None
+        self.files.append(self.file_path)
+        if self.on_file_closed is not None:
+            self.on_file_closed(self.file_path)
+
+    def _open_file(self) -> None:
+        self.file_path = os.path.join(self.directory,
+                                      f"{self.prefix}-{time.strftime('%Y%m%d-%H%M%S', time.gmtime())}-"
+                                      f"{len(self.files):05d}{FILE_SINK_EXTENSIONS[self.compression]}")
+        self.raw_file = open(self.file_path, "wb")
+        if self.compression == "gzip":
+            # Imported on demand to keep `import unicorn_fy` fast
+            import gzip
+            self.file = gzip.GzipFile(fileobj=self.raw_file, mode="wb", compresslevel=self.compression_level)
+        elif self.compression == "lzma":
+            # Imported on demand to keep `import unicorn_fy` fast
+            import lzma
+            self.file = lzma.LZMAFile(self.raw_file, mode="wb", preset=self.compression_level)
+        else:
+            self.file = self.raw_file
+        self.file_opened = time.monotonic()
+
+    def _serialize(self, records: list) -> bytes:
+        lines = []
+        for record in records:
+            try:
+                lines.append(json.dumps(record))
+            except (TypeError, ValueError, OverflowError) as error_msg:
+                self.failed_records += 1
+                logger.error(f"FileSink._serialize() - can not serialize {record} - error: {error_msg}")
+        if not lines:
+            return b""
+        lines.append("")
+        return "\n".join(lines).encode()
+
+    def _write(self, chunks: list, records: int) -> None:
+        try:
+            if self.file is None:
+                self._open_file()
+            self.file.write(b"".join(chunks))
+            if self.fsync is True:
+                self.file.flush()
+                self.raw_file.flush()
+                os.fsync(self.raw_file.fileno())
+        except OSError as error_msg:
+            self.write_errors += 1
+            self.failed_records += records
+            logger.error(f"FileSink._write() - can not write {records} records to {self.file_path}: {error_msg}")
+            return None
+        self.writes += 1
+        self.written_records += records
+        self.written_bytes += sum(len(chunk) for chunk in chunks)
+        if self.raw_file.tell() >= self.max_file_size:
+            self._close_file()
+
+    def add(self, unicorn_fied_data) -> bool:
+        """
+        Hand over a unicorn_fied record, must only be called by one producing thread.
+
+        :param unicorn_fied_data: The unicorn_fied record, a dict, pooled record or `RecordView`.
+        :type unicorn_fied_data: dict
+
+        :return: bool - False if the record got dropped.
+        """
+        if type(unicorn_fied_data) is not dict:
+            # Pooled records get reused after their release, views are materialized as well
+            unicorn_fied_data = unicorn_fied_data.to_dict()
+        if self.ring_buffer.push(unicorn_fied_data):
+            return True
+        if self.overflow == "block":
+            deadline = None if self.block_timeout is None else time.monotonic() + self.block_timeout
+            while deadline is None or time.monotonic() < deadline:
+                if self.stop_request is True or not self.is_alive():
+                    # Nobody drains the ring buffer anymore
+                    break
+                time.sleep(0.001)
+                if self.ring_buffer.push(unicorn_fied_data):
+                    return True
+        self.dropped_records += 1
+        return False
+
+    def get_files(self) -> list:
+        """
+        Get the paths of the closed files.
+
+        :return: list
+        """
+        return list(self.files)
+
+    def get_stats(self) -> dict:
+        """
+        Get the counters of the sink and its ring buffer.
+
+        `written_bytes` counts the serialized bytes before the compression, the size on disk that `max_file_size`
+        refers to is smaller with compression.
+
+        :return: dict
+        """
+        stats = self.ring_buffer.get_stats()
+        stats['dropped_records'] = self.dropped_records
+        stats['failed_records'] = self.failed_records
+        stats['written_records'] = self.written_records
+        stats['written_bytes'] = self.written_bytes
+        stats['writes'] = self.writes
+        stats['write_errors'] = self.write_errors
+        stats['files'] = len(self.files) + (1 if self.file is not None else 0)
+        return stats
+
+    def run(self) -> None:
+        chunks: list = []
+        pending_bytes = 0
+        pending_records = 0
+        last_write = time.monotonic()
+        while self.stop_request is False or len(self.ring_buffer) > 0:
+            records = self.ring_buffer.pop_batch(max_items=self.batch_size, timeout=min(self.flush_interval, 0.5))
+            now = time.monotonic()
+            if records:
+                failed_records = self.failed_records
+                chunk = self._serialize(records)
+                if chunk:
+                    chunks.append(chunk)
+                    pending_bytes += len(chunk)
+                    pending_records += len(records) - (self.failed_records - failed_records)
+            # Measured from the last write, a steady trickle of records must not postpone the write forever
+            if pending_bytes >= self.buffer_size or (pending_bytes > 0 and now - last_write >= self.flush_interval):
+                self._write(chunks, pending_records)
+                last_write = now
+                chunks = []
+                pending_bytes = 0
+                pending_records = 0
+            if self.file is not None and self.rotation_interval is not None and \
+                    now - self.file_opened >= self.rotation_interval:
+                self._close_file()
+        if chunks:
+            self._write(chunks, pending_records)
+        if self.file is not None:
+            self._close_file()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Write the remaining records, close the file and stop the sink.
+
+        :param timeout: Maximum time in seconds to wait for the sink.
+        :type timeout: float
+
+        :return: None
+        """
+        self.stop_request = True
+        self.ring_buffer.wake_up()
+        if self.is_alive():
+            self.join(timeout)
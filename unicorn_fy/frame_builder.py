@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/frame_builder.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from array import array
+from operator import itemgetter
+from typing import Optional
+
+# Columns per event type: `(key, kind)` or `(key, kind, parent_key)` for fields of nested dicts (klines), the kinds
+# are `q` = int64, `d` = float64 (prices and quantities are parsed from str), `?` = bool and `c` = categorical
+FRAME_COLUMNS: dict = {
+    'aggTrade': (('stream_type', 'c'), ('event_time', 'q'), ('symbol', 'c'), ('aggregate_trade_id', 'q'),
+                 ('price', 'd'), ('quantity', 'd'), ('first_trade_id', 'q'), ('last_trade_id', 'q'),
+                 ('trade_time', 'q'), ('is_market_maker', '?')),
+    'trade': (('stream_type', 'c'), ('event_time', 'q'), ('symbol', 'c'), ('trade_id', 'q'), ('price', 'd'),
+              ('quantity', 'd'), ('buyer_order_id', 'q'), ('seller_order_id', 'q'), ('trade_time', 'q'),
+              ('is_market_maker', '?')),
+    'bookTicker': (('stream_type', 'c'), ('order_book_update_id', 'q'), ('symbol', 'c'), ('best_bid_price', 'd'),
+                   ('best_bid_quantity', 'd'), ('best_ask_price', 'd'), ('best_ask_quantity', 'd')),
+    'kline': (('stream_type', 'c'), ('event_time', 'q'), ('symbol', 'c'),
+              ('kline_start_time', 'q', 'kline'), ('kline_close_time', 'q', 'kline'), ('interval', 'c', 'kline'),
+              ('first_trade_id', 'q', 'kline'), ('last_trade_id', 'q', 'kline'), ('open_price', 'd', 'kline'),
+              ('close_price', 'd', 'kline'), ('high_price', 'd', 'kline'), ('low_price', 'd', 'kline'),
+              ('base_volume', 'd', 'kline'), ('number_of_trades', 'q', 'kline'), ('is_closed', '?', 'kline'),
+              ('quote', 'd', 'kline'), ('taker_by_base_asset_volume', 'd', 'kline'),
+              ('taker_by_quote_asset_volume', 'd', 'kline')),
+    'markPriceUpdate': (('stream_type', 'c'), ('event_time', 'q'), ('symbol', 'c'), ('mark_price', 'd'),
+                        ('index_price', 'd'), ('estimated_settle_price', 'd'), ('funding_rate', 'd'),
+                        ('next_funding_time', 'q')),
+}
+# Array typecodes and numpy dtypes of the column kinds, categoricals are stored as int32 codes
+FRAME_TYPECODES: dict = {'q': ('q', 'int64'), 'd': ('d', 'float64'), '?': ('b', 'bool'), 'c': ('i', 'int32')}
+
+
+class FrameBuilder(object):
+    """
+    Collect unicorn_fied events in typed column buffers per event type and build pandas DataFrames from them.
+
+    The events of `aggTrade`, `trade`, `bookTicker`, `kline` and `markPriceUpdate` streams (see `FRAME_COLUMNS`) are
+    kept until `chunk_size` events are collected, then their fields are converted column by column to `array`
+    buffers: ids and times as int64, prices and quantities as float64, flags as bool and strings like `symbol` as
+    category codes. `to_dataframe()` builds the DataFrame from the buffers without a list of dicts, pandas does not
+    have to infer any type. Events with a `data` list (e.g. `!markPrice@arr`) are added item by item. Missing float
+    fields and strings are NaN, missing int and bool fields 0.
+
+    pandas is an optional dependency which is only needed by `to_dataframe()`.
+
+    :param chunk_size: Number of rows per chunk.
+    :type chunk_size: int
+
+    :param event_types: The event types to collect, default is all of `FRAME_COLUMNS`.
+    :type event_types: tuple
+    """
+    def __init__(self, chunk_size: int = 16384, event_types: Optional[tuple] = None):
+        self.chunk_size = chunk_size
+        self.columns: dict = {}
+        for event_type in event_types or FRAME_COLUMNS:
+            self.columns[event_type] = tuple((column[0], column[1], column[2] if len(column) > 2 else None)
+                                             for column in FRAME_COLUMNS[event_type])
+        # event_type: [converted chunks, events of the current chunk, categories per column]
+        self.tables: dict = {}
+
+    def _get_table(self, event_type: str) -> list:
+        table = self.tables.get(event_type)
+        if table is None:
+            table = [[], [], [({None: -1}, []) if kind == 'c' else None for _, kind, _ in self.columns[event_type]]]
+            self.tables[event_type] = table
+        return table
+
+    @staticmethod
+    def _get_values(items: list, key: str, parent_key: Optional[str]) -> list:
+        try:
+            if parent_key is None:
+                return list(map(itemgetter(key), items))
+            return list(map(itemgetter(key), map(itemgetter(parent_key), items)))
+        except (KeyError, TypeError):
+            values = []
+            for item in items:
+                try:
+                    values.append(item[parent_key][key] if parent_key is not None else item[key])
+                except (KeyError, TypeError):
+                    values.append(None)
+            return values
+
+    def _flush(self, event_type: str) -> None:
+        table = self.tables[event_type]
+        items = table[1]
+        if not items:
+            return
+        chunk = []
+        for (key, kind, parent_key), categories in zip(self.columns[event_type], table[2]):
+            typecode = FRAME_TYPECODES[kind][0]
+            column = self._get_values(items, key, parent_key)
+            if kind == 'c':
+                codes, category_list = categories
+                for value in dict.fromkeys(column):
+                    if value not in codes:
+                        codes[value] = len(category_list)
+                        category_list.append(value)
+                values = array(typecode, map(codes.__getitem__, column))
+            elif kind == 'd':
+                try:
+                    values = array(typecode, map(float, column))
+                except TypeError:
+                    values = array(typecode, [float('nan') if value is None else float(value) for value in column])
+            else:
+                try:
+                    values = array(typecode, column)
+                except TypeError:
+                    values = array(typecode, [value or 0 for value in column])
+            chunk.append(values)
+        table[0].append(chunk)
+        table[1] = []
+
+    def add(self, unicorn_fied_data) -> bool:
+        """
+        Add a unicorn_fied event.
+
+        :param unicorn_fied_data: The unicorn_fied event.
+        :type unicorn_fied_data: dict
+
+        :return: bool - False if the event type is not collected
+        """
+        try:
+            event_type = unicorn_fied_data['event_type']
+        except (KeyError, TypeError):
+            return False
+        table = self.tables.get(event_type)
+        if table is None:
+            if event_type not in self.columns:
+                return False
+            table = self._get_table(event_type)
+        if type(unicorn_fied_data) is dict and 'data' not in unicorn_fied_data:
+            table[1].append(unicorn_fied_data)
+            if len(table[1]) >= self.chunk_size:
+                self._flush(event_type)
+            return True
+        try:
+            items = unicorn_fied_data['data']
+        except KeyError:
+            items = (unicorn_fied_data,)
+        pending_items = table[1]
+        for item in items:
+            if type(item) is not dict:
+                # Pooled records get reused after their release, views are materialized as well
+                item = item.to_dict()
+            pending_items.append(item)
+            if len(pending_items) >= self.chunk_size:
+                self._flush(event_type)
+                pending_items = self.tables[event_type][1]
+        return True
+
+    def add_batch(self, unicorn_fied_data_list) -> int:
+        """
+        Add unicorn_fied events.
+
+        :param unicorn_fied_data_list: The unicorn_fied events.
+        :type unicorn_fied_data_list: list
+
+        :return: int - the number of added events
+        """
+        return sum(self.add(unicorn_fied_data) for unicorn_fied_data in unicorn_fied_data_list)
+
+    def get_event_types(self) -> list:
+        """
+        Get the event types with collected rows.
+
+        :return: list
+        """
+        return list(self.tables)
+
+    def get_row_count(self, event_type: str) -> int:
+        """
+        Get the number of collected rows of an event type.
+
+        :param event_type: The event type, e.g. `aggTrade`
+        :type event_type: str
+
+        :return: int
+        """
+        table = self.tables.get(event_type)
+        if table is None:
+            return 0
+        return sum(len(chunk[0]) for chunk in table[0]) + len(table[1])
+
+    def to_dataframe(self, event_type: str):
+        """
+        Build a DataFrame of the collected rows of an event type, the buffers are kept.
+
+        :param event_type: The event type, e.g. `aggTrade`
+        :type event_type: str
+
+        :return: pandas.DataFrame
+        """
+        try:
+            import numpy
+            import pandas
+        except ImportError:
+            raise ImportError("`FrameBuilder.to_dataframe()` needs the `pandas` package: "
+                              "`pip install pandas`") from None
+        table = self._get_table(event_type)
+        self._flush(event_type)
+        frame_columns = {}
+        for index, (key, kind, _) in enumerate(self.columns[event_type]):
+            dtype = FRAME_TYPECODES[kind][1]
+            values = numpy.concatenate([numpy.frombuffer(chunk[index], dtype=dtype) for chunk in table[0]]) \
+                if table[0] else numpy.empty(0, dtype=dtype)
+            if kind == 'c':
+                values = pandas.Categorical.from_codes(values, categories=table[2][index][1])
+            frame_columns[key] = values
+        return pandas.DataFrame(frame_columns, copy=False)
+
+    def clear(self, event_type: Optional[str] = None) -> None:
+        """
+        Remove the collected rows of one or all event types.
+
+        :param event_type: The event type, e.g. `aggTrade`
+        :type event_type: str
+
+        :return: None
+        """
+        if event_type is None:
+            self.tables = {}
+        else:
+            self.tables.pop(event_type, None)
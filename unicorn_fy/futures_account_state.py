@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/futures_account_state.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from typing import Callable, Optional
+
+
+class FuturesAccountState(object):
+    """
+    Incremental state of a futures account, built from the unicorn_fied `ACCOUNT_UPDATE` and `MARGIN_CALL` events
+    of `UnicornFy.binance_com_futures_websocket()` and `UnicornFy.binance_com_coin_futures_websocket()`.
+
+    Balances are indexed by asset and positions by `(symbol, position_side)`, so every query is a dict lookup. Only
+    fields that actually changed are reported, either as return value of `apply()` or to the `on_change` callback.
+    A change is a dict `{'type': 'balance'|'position', 'key': asset or (symbol, position_side), 'event_type': ...,
+    'event_time': ..., 'changed_fields': {field: (old_value, new_value)}}`. Balance changes of `ACCOUNT_UPDATE`
+    events also carry the `balance_change` of the event, it is a per event delta and not part of the state.
+
+    `margin_type` is stored as `cross` or `isolated` like in `ACCOUNT_UPDATE`, the `CROSSED` and `ISOLATED` of
+    `MARGIN_CALL` are mapped to it.
+
+    Use one instance per (sub-)account.
+
+    :param on_change: Called with each change.
+    :type on_change: function
+    """
+    BALANCE_FIELDS: tuple = ('wallet_balance', 'cross_wallet_balance')
+    POSITION_FIELDS: tuple = ('position_amount', 'entry_price', 'accumulated_realized', 'upnl', 'margin_type',
+                              'isolated_wallet')
+    # MARGIN_CALL position field: position state field
+    MARGIN_CALL_POSITION_FIELDS: tuple = (('amount', 'position_amount'), ('type', 'margin_type'),
+                                          ('price', 'mark_price'), ('pnl', 'upnl'), ('margin', 'maintenance_margin'))
+    MARGIN_TYPES: dict = {'CROSSED': 'cross', 'ISOLATED': 'isolated'}
+
+    def __init__(self, on_change: Optional[Callable] = None):
+        self.on_change = on_change
+        self.balances: dict = {}
+        self.positions: dict = {}
+        self.cross_wallet_balance: Optional[str] = None
+        self.last_event_time: int = 0
+        self.last_margin_call: Optional[dict] = None
+
+    def _update(self, store: dict, key, values: dict, event_type: str, event_time: int, change_type: str,
+                event_values: Optional[dict] = None) -> Optional[dict]:
+        state = store.get(key)
+        if state is None:
+            state = store[key] = {'event_time': 0}
+        elif event_time < state['event_time']:
+            # An older event than the one the state is based on
+            return None
+        changed_fields = {}
+        for field, value in values.items():
+            old_value = state.get(field)
+            if old_value != value:
+                changed_fields[field] = (old_value, value)
+                state[field] = value
+        state['event_time'] = event_time
+        if not changed_fields:
+            return None
+        change = {'type': change_type,
+                  'key': key,
+                  'event_type': event_type,
+                  'event_time': event_time,
+                  'changed_fields': changed_fields}
+        if event_values:
+            change.update(event_values)
+        if self.on_change is not None:
+            self.on_change(change)
+        return change
+
+    def apply(self, unicorn_fied_data: dict) -> list:
+        """
+        Apply a unicorn_fied `ACCOUNT_UPDATE` or `MARGIN_CALL` event, other events are ignored.
+
+        :param unicorn_fied_data: The unicorn_fied event.
+        :type unicorn_fied_data: dict
+
+        :return: list of changes
+        """
+        changes = []
+        event_type = unicorn_fied_data.get('event_type')
+        if event_type == 'ACCOUNT_UPDATE':
+            event_time = unicorn_fied_data['event_time']
+            for balance in unicorn_fied_data['balances']:
+                values = {field: balance[field] for field in self.BALANCE_FIELDS if field in balance}
+                event_values = {'balance_change': balance['balance_change']} if 'balance_change' in balance else None
+                change = self._update(self.balances, balance['asset'], values, event_type, event_time, 'balance',
+                                      event_values)
+                if change is not None:
+                    changes.append(change)
+            for position in unicorn_fied_data['positions']:
+                values = {field: position[field] for field in self.POSITION_FIELDS if field in position}
+                change = self._update(self.positions, (position['symbol'], position['position_side']), values,
+                                      event_type, event_time, 'position')
+                if change is not None:
+                    changes.append(change)
+        elif event_type == 'MARGIN_CALL':
+            event_time = unicorn_fied_data['event_time']
+            if 'cross_wallet' in unicorn_fied_data:
+                self.cross_wallet_balance = unicorn_fied_data['cross_wallet']
+            for position in unicorn_fied_data['positions']:
+                values = {field: position[margin_call_field]
+                          for margin_call_field, field in self.MARGIN_CALL_POSITION_FIELDS
+                          if margin_call_field in position}
+                if 'margin_type' in values:
+                    values['margin_type'] = self.MARGIN_TYPES.get(values['margin_type'], values['margin_type'])
+                change = self._update(self.positions, (position['symbol'], position['side']), values,
+                                      event_type, event_time, 'position')
+                if change is not None:
+                    changes.append(change)
+            self.last_margin_call = unicorn_fied_data
+        else:
+            return changes
+        if unicorn_fied_data['event_time'] > self.last_event_time:
+            self.last_event_time = unicorn_fied_data['event_time']
+        return changes
+
+    def get_balance(self, asset: str) -> Optional[dict]:
+        """
+        Get the balance of an asset.
+
+        :param asset: The asset, e.g. `USDT`
+        :type asset: str
+
+        :return: dict or None
+        """
+        return self.balances.get(asset)
+
+    def get_balances(self) -> dict:
+        """
+        Get all balances by asset.
+
+        :return: dict
+        """
+        return self.balances
+
+    def get_position(self, symbol: str, position_side: str = "BOTH") -> Optional[dict]:
+        """
+        Get a position.
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :param position_side: `BOTH` in one-way mode, `LONG` or `SHORT` in hedge mode.
+        :type position_side: str
+
+        :return: dict or None
+        """
+        return self.positions.get((symbol, position_side))
+
+    def get_open_positions(self) -> dict:
+        """
+        Get all positions with an amount other than zero by `(symbol, position_side)`.
+
+        :return: dict
+        """
+        return {key: position for key, position in self.positions.items()
+                if float(position.get('position_amount') or 0) != 0.0}
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/latency_monitor.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from array import array
+from typing import Optional
+import time
+
+# Histogram buckets in microseconds: 0-3 exact, then 4 buckets per power of two (max. error 25 %) up to ~15 minutes
+HISTOGRAM_BUCKETS: int = 4 + 28 * 4
+
+
+def get_histogram_bucket(latency_us: int) -> int:
+    """
+    Get the histogram bucket of a latency.
+
+    :param latency_us: Latency in microseconds.
+    :type latency_us: int
+
+    :return: int
+    """
+    if latency_us < 4:
+        return latency_us if latency_us > 0 else 0
+    bits = latency_us.bit_length()
+    bucket = bits * 4 - 8 + ((latency_us >> (bits - 3)) & 3)
+    return bucket if bucket < HISTOGRAM_BUCKETS else HISTOGRAM_BUCKETS - 1
+
+
+def get_histogram_bucket_limit(bucket: int) -> int:
+    """
+    Get the upper limit of a histogram bucket in microseconds.
+
+    :param bucket: The bucket.
+    :type bucket: int
+
+    :return: int
+    """
+    if bucket < 4:
+        return bucket + 1
+    shift = bucket // 4 - 1
+    return ((4 | (bucket & 3)) + 1) << shift
+
+
+class LatencyHistogram(object):
+    """
+    Latency histograms of all streams of `LatencyMonitor` for one time field, indexed by stream id.
+
+    Negative latencies are counted in `negative_counts` by their absolute value.
+    """
+    def __init__(self):
+        self.counts = array('q')
+        self.negative_counts = array('q')
+        self.negatives = array('q')
+        self.samples = array('q')
+        self.sums = array('d')
+        self.minimums = array('d')
+        self.maximums = array('d')
+
+    def add_stream(self) -> None:
+        self.counts.extend(array('q', bytes(8 * HISTOGRAM_BUCKETS)))
+        self.negative_counts.extend(array('q', bytes(8 * HISTOGRAM_BUCKETS)))
+        self.negatives.append(0)
+        self.samples.append(0)
+        self.sums.append(0.0)
+        self.minimums.append(float('inf'))
+        self.maximums.append(float('-inf'))
+
+    def add(self, stream_id: int, latency: float) -> None:
+        latency_us = int(latency * 1000)
+        if latency_us < 0:
+            self.negative_counts[stream_id * HISTOGRAM_BUCKETS + get_histogram_bucket(-latency_us)] += 1
+            self.negatives[stream_id] += 1
+        else:
+            self.counts[stream_id * HISTOGRAM_BUCKETS + get_histogram_bucket(latency_us)] += 1
+        self.samples[stream_id] += 1
+        self.sums[stream_id] += latency
+        if latency < self.minimums[stream_id]:
+            self.minimums[stream_id] = latency
+        if latency > self.maximums[stream_id]:
+            self.maximums[stream_id] = latency
+
+    def get_percentile(self, stream_id: int, percentile: float) -> float:
+        rank = self.samples[stream_id] * percentile / 100
+        offset = stream_id * HISTOGRAM_BUCKETS
+        count = 0
+        if self.negatives[stream_id]:
+            # From the most negative bucket upwards, the upper limit of a negative bucket is its lower absolute limit
+            for bucket in range(HISTOGRAM_BUCKETS - 1, -1, -1):
+                count += self.negative_counts[offset + bucket]
+                if count >= rank:
+                    limit = -get_histogram_bucket_limit(bucket - 1) / 1000 if bucket > 0 else 0.0
+                    return min(limit, self.maximums[stream_id])
+        for bucket in range(HISTOGRAM_BUCKETS):
+            count += self.counts[offset + bucket]
+            if count >= rank:
+                return min(get_histogram_bucket_limit(bucket) / 1000, self.maximums[stream_id])
+        return self.maximums[stream_id]
+
+    def get_stats(self, stream_id: int) -> Optional[dict]:
+        samples = self.samples[stream_id]
+        if samples == 0:
+            return None
+        return {'samples': samples,
+                'negative': self.negatives[stream_id],
+                'mean': self.sums[stream_id] / samples,
+                'min': self.minimums[stream_id],
+                'p50': self.get_percentile(stream_id, 50),
+                'p99': self.get_percentile(stream_id, 99),
+                'max': self.maximums[stream_id]}
+
+
+class LatencyMonitor(object):
+    """
+    Exchange-to-local latency of unicorn_fied events per `(stream_type, symbol)`.
+
+    The latency is the local wall clock time of the conversion minus `event_time` and, where present,
+    `transaction_time` in milliseconds. It is collected in histograms with a resolution of 25 %, percentiles are
+    reported as the upper limit of their bucket. Pass an instance to the `latency_monitor` parameter of the websocket
+    converters or call `record()`.
+
+    The latencies include the offset of the local clock to the exchange clock. The minimum latency of all streams is
+    an estimate of this offset plus the shortest network delay, `get_clock_skew()` returns it. Negative latencies
+    show that the local clock is behind, the stats report their number in `negative`.
+
+    Array events like `!markPrice@arr` and `!ticker@arr` have no `event_time` of their own, the latency of each item
+    is recorded under its `stream_type` and `symbol`.
+
+    :param stamp_records: Add `convert_time` (`time.monotonic_ns()`) and `latency` (ms) to converted dicts, off by
+                          default.
+    :type stamp_records: bool
+    """
+    def __init__(self, stamp_records: bool = False):
+        self.stamp_records = stamp_records
+        self.stream_ids: dict = {}
+        self.streams: list = []
+        self.event_time_histogram = LatencyHistogram()
+        self.transaction_time_histogram = LatencyHistogram()
+
+    def _get_stream_id(self, stream_type: str, symbol: Optional[str]) -> int:
+        key = (stream_type, symbol)
+        stream_id = self.stream_ids.get(key)
+        if stream_id is None:
+            stream_id = len(self.streams)
+            self.event_time_histogram.add_stream()
+            self.transaction_time_histogram.add_stream()
+            self.streams.append(key)
+            self.stream_ids[key] = stream_id
+        return stream_id
+
+    def record(self, unicorn_fied_data, receive_time: Optional[float] = None) -> Optional[float]:
+        """
+        Record the latency of a unicorn_fied event, events without `event_time` are ignored. The items of array
+        events are recorded one by one.
+
+        :param unicorn_fied_data: The unicorn_fied event.
+        :type unicorn_fied_data: dict
+
+        :param receive_time: Local receive time in milliseconds since the epoch, by default the current time.
+        :type receive_time: float
+
+        :return: float - latency to `event_time` in milliseconds (of the last item of array events) or None
+        """
+        event_time = unicorn_fied_data.get('event_time')
+        if not event_time:
+            items = unicorn_fied_data.get('data')
+            if type(items) is not list:
+                return None
+            if receive_time is None:
+                receive_time = time.time() * 1000
+            latency = None
+            for item in items:
+                item_latency = self.record(item, receive_time=receive_time)
+                if item_latency is not None:
+                    latency = item_latency
+            return latency
+        if receive_time is None:
+            receive_time = time.time() * 1000
+        stream_id = self.stream_ids.get((unicorn_fied_data.get('stream_type'), unicorn_fied_data.get('symbol')))
+        if stream_id is None:
+            stream_id = self._get_stream_id(unicorn_fied_data.get('stream_type'), unicorn_fied_data.get('symbol'))
+        latency = receive_time - event_time
+        self.event_time_histogram.add(stream_id, latency)
+        transaction_time = unicorn_fied_data.get('transaction_time')
+        if transaction_time:
+            self.transaction_time_histogram.add(stream_id, receive_time - transaction_time)
+        if self.stamp_records is True and type(unicorn_fied_data) is dict:
+            unicorn_fied_data['convert_time'] = time.monotonic_ns()
+            unicorn_fied_data['latency'] = latency
+        return latency
+
+    def get_clock_skew(self) -> Optional[float]:
+        """
+        Get the estimated offset of the local clock to the exchange clock in milliseconds: the minimum latency to
+        `event_time` of all streams.
+
+        :return: float or None
+        """
+        minimums = [minimum for minimum in self.event_time_histogram.minimums if minimum != float('inf')]
+        return min(minimums) if minimums else None
+
+    def get_stats(self, stream_type: str, symbol: Optional[str] = None) -> Optional[dict]:
+        """
+        Get the latency stats of a stream in milliseconds.
+
+        :param stream_type: The `stream_type` of the events, e.g. `btcusdt@aggTrade`
+        :type stream_type: str
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: dict or None
+        """
+        stream_id = self.stream_ids.get((stream_type, symbol))
+        if stream_id is None:
+            return None
+        return {'stream_type': stream_type,
+                'symbol': symbol,
+                'event_time': self.event_time_histogram.get_stats(stream_id),
+                'transaction_time': self.transaction_time_histogram.get_stats(stream_id)}
+
+    def get_all_stats(self) -> list:
+        """
+        Get the latency stats of all streams in milliseconds, sorted by the p99 latency to `event_time` (highest
+        first).
+
+        :return: list
+        """
+        stats = [self.get_stats(stream_type, symbol) for stream_type, symbol in self.streams]
+        return sorted(stats, key=lambda item: item['event_time']['p99'], reverse=True)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/order_tracker.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Optional
+
+TERMINAL_ORDER_STATUS: frozenset = frozenset(('FILLED', 'CANCELED', 'REJECTED', 'EXPIRED', 'EXPIRED_IN_MATCH'))
+
+
+class OrderTracker(object):
+    """
+    Lifecycle state of orders, built from the unicorn_fied `executionReport` (spot, margin) and `ORDER_TRADE_UPDATE`
+    (futures) events.
+
+    Orders are indexed by `(symbol, order_id)`, because Binance order ids are only unique per symbol, and by
+    `client_order_id`. Open orders are additionally indexed by symbol. Orders in a terminal status (`FILLED`,
+    `CANCELED`, `REJECTED`, `EXPIRED`, `EXPIRED_IN_MATCH`) are moved to an archive that holds at most
+    `max_archive_size` orders and drops orders that completed more than `archive_time` seconds (by `event_time`)
+    before the newest event.
+
+    An order is a dict with the keys `symbol`, `order_id`, `client_order_id`, `side`, `order_type`,
+    `order_quantity`, `order_price`, `status`, `cumulative_filled_quantity`, `cumulative_quote_quantity`,
+    `average_price`, `fills`, `commission` (by asset), `trade_ids`, `status_history` (list of
+    `(event_time, status)`), `creation_time` and `event_time`. Amounts are `Decimal`. Trades are counted once per
+    `trade_id`, trades that arrive after the order was archived are still added to it.
+
+    :param max_archive_size: Max number of completed orders to keep.
+    :type max_archive_size: int
+
+    :param archive_time: Seconds to keep completed orders, None to keep them until `max_archive_size` is reached.
+    :type archive_time: int or None
+    """
+    def __init__(self, max_archive_size: int = 10000, archive_time: Optional[int] = None):
+        self.max_archive_size = max_archive_size
+        self.archive_time = archive_time
+        self.open_orders: dict = {}
+        self.open_orders_by_symbol: dict = {}
+        self.archive: OrderedDict = OrderedDict()
+        self.client_order_ids: dict = {}
+        self.last_event_time: int = 0
+
+    @staticmethod
+    def _new_order(unicorn_fied_data: dict, client_order_id: str) -> dict:
+        return {'symbol': unicorn_fied_data['symbol'],
+                'order_id': unicorn_fied_data['order_id'],
+                'client_order_id': client_order_id,
+                'side': unicorn_fied_data['side'],
+                'order_type': unicorn_fied_data['order_type'],
+                'order_quantity': unicorn_fied_data['order_quantity'],
+                'order_price': unicorn_fied_data['order_price'],
+                'status': None,
+                'cumulative_filled_quantity': Decimal(0),
+                'cumulative_quote_quantity': Decimal(0),
+                'average_price': Decimal(0),
+                'fills': 0,
+                'commission': {},
+                'trade_ids': set(),
+                'status_history': [],
+                'creation_time': unicorn_fied_data.get('order_creation_time', unicorn_fied_data['event_time']),
+                'event_time': 0}
+
+    def _evict(self) -> None:
+        if self.archive_time is not None:
+            oldest_event_time = self.last_event_time - self.archive_time * 1000
+            while self.archive:
+                key, order = next(iter(self.archive.items()))
+                if order['event_time'] >= oldest_event_time:
+                    break
+                self._remove_archived(key)
+        while len(self.archive) > self.max_archive_size:
+            self._remove_archived(next(iter(self.archive)))
+
+    def _remove_archived(self, key: tuple) -> None:
+        order = self.archive.pop(key)
+        if self.client_order_ids.get(order['client_order_id']) == key:
+            del self.client_order_ids[order['client_order_id']]
+
+    def apply(self, unicorn_fied_data: dict) -> Optional[dict]:
+        """
+        Apply a unicorn_fied `executionReport` or `ORDER_TRADE_UPDATE` event, other events are ignored.
+
+        :param unicorn_fied_data: The unicorn_fied event.
+        :type unicorn_fied_data: dict
+
+        :return: dict of the updated order or None
+        """
+        event_type = unicorn_fied_data.get('event_type')
+        if event_type != 'executionReport' and event_type != 'ORDER_TRADE_UPDATE':
+            return None
+        key = (unicorn_fied_data['symbol'], unicorn_fied_data['order_id'])
+        # A cancel `executionReport` carries the client order id of the cancel request
+        client_order_id = unicorn_fied_data.get('original_client_order_id') or unicorn_fied_data['client_order_id']
+        order = self.open_orders.get(key)
+        archived = False
+        if order is None:
+            order = self.archive.get(key)
+            if order is not None:
+                # Late event of a completed order
+                archived = True
+            else:
+                order = self._new_order(unicorn_fied_data, client_order_id)
+                self.open_orders[key] = order
+                self.open_orders_by_symbol.setdefault(key[0], {})[key[1]] = order
+                self.client_order_ids[client_order_id] = key
+        is_trade = unicorn_fied_data['current_execution_type'] == 'TRADE'
+        if is_trade:
+            if unicorn_fied_data['trade_id'] in order['trade_ids']:
+                # Duplicate
+                return order
+            order['trade_ids'].add(unicorn_fied_data['trade_id'])
+        event_time = unicorn_fied_data['event_time']
+        if event_time > self.last_event_time:
+            self.last_event_time = event_time
+            if self.archive_time is not None and self.archive:
+                self._evict()
+        cumulative_filled_quantity = Decimal(unicorn_fied_data['cumulative_filled_quantity'])
+        if cumulative_filled_quantity > order['cumulative_filled_quantity']:
+            order['cumulative_filled_quantity'] = cumulative_filled_quantity
+            if event_type == 'executionReport':
+                order['cumulative_quote_quantity'] = \
+                    Decimal(unicorn_fied_data['cumulative_quote_asset_transacted_quantity'])
+                order['average_price'] = order['cumulative_quote_quantity'] / cumulative_filled_quantity
+            else:
+                order['average_price'] = Decimal(unicorn_fied_data['order_avg_price'])
+                order['cumulative_quote_quantity'] = order['average_price'] * cumulative_filled_quantity
+        if is_trade:
+            order['fills'] += 1
+            commission = unicorn_fied_data.get('commission_amount', unicorn_fied_data.get('commission'))
+            commission_asset = unicorn_fied_data.get('commission_asset')
+            if commission is not None and commission_asset:
+                order['commission'][commission_asset] = order['commission'].get(commission_asset, Decimal(0)) + \
+                                                        Decimal(commission)
+        if archived or event_time < order['event_time']:
+            # Completed order or older status than the known one, only the fill values are applied
+            return order
+        order['event_time'] = event_time
+        status = unicorn_fied_data['current_order_status']
+        if status != order['status']:
+            order['status'] = status
+            order['status_history'].append((event_time, status))
+        if status in TERMINAL_ORDER_STATUS:
+            del self.open_orders[key]
+            del self.open_orders_by_symbol[key[0]][key[1]]
+            if not self.open_orders_by_symbol[key[0]]:
+                del self.open_orders_by_symbol[key[0]]
+            self.archive[key] = order
+            self._evict()
+        return order
+
+    def get_order(self, symbol: str, order_id: int) -> Optional[dict]:
+        """
+        Get an open or archived order by its order id.
+
+        :param symbol: The symbol of the order.
+        :type symbol: str
+
+        :param order_id: The order id.
+        :type order_id: int
+
+        :return: dict or None
+        """
+        key = (symbol, order_id)
+        order = self.open_orders.get(key)
+        if order is None:
+            order = self.archive.get(key)
+        return order
+
+    def get_order_by_client_order_id(self, client_order_id: str) -> Optional[dict]:
+        """
+        Get an open or archived order by its client order id.
+
+        :param client_order_id: The client order id.
+        :type client_order_id: str
+
+        :return: dict or None
+        """
+        key = self.client_order_ids.get(client_order_id)
+        if key is None:
+            return None
+        return self.get_order(key[0], key[1])
+
+    def get_open_orders(self, symbol: Optional[str] = None) -> dict:
+        """
+        Get the open orders by `(symbol, order_id)` or, if a symbol is provided, the open orders of this symbol by
+        `order_id`.
+
+        :param symbol: The symbol.
+        :type symbol: str
+
+        :return: dict
+        """
+        if symbol is None:
+            return self.open_orders
+        return self.open_orders_by_symbol.get(symbol, {})
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/record_pool.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from collections import deque
+from typing import Optional
+
+
+class PooledRecord(object):
+    """
+    Base class of the preallocated mutable records used by the pooled conversion mode.
+
+    The attributes have the same names as the keys of the unicorn_fied dict, a record can also be read like a dict
+    (`record['symbol']`, `record.get('event_type')`, `'symbol' in record`), fields that are `None` count as missing
+    like in `to_dict()`. Records must be released with `RecordPool.release()` as soon as they are not needed anymore
+    and must not be used after that.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key, default=None):
+        """
+        Get a field like `dict.get()`
+
+        :param key: Name of the field.
+        :type key: str
+
+        :param default: Returned if the record has no such field or it is `None`.
+
+        :return: value of the field or `default`
+        """
+        value = getattr(self, key, None) if type(key) is str else None
+        return default if value is None else value
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.to_dict()})"
+
+    def clear(self):
+        """
+        Reset all fields to `None`
+
+        :return: None
+        """
+        for key in self.__slots__:
+            setattr(self, key, None)
+
+    def to_dict(self) -> dict:
+        """
+        Materialize the record to the unicorn_fied dict
+
+        :return: dict
+        """
+        unicorn_fied_data = {}
+        for key in self.__slots__:
+            value = getattr(self, key)
+            if value is not None:
+                unicorn_fied_data[key] = value
+        return unicorn_fied_data
+
+
+class BookTickerRecord(PooledRecord):
+    """
+    Pooled record of a `bookTicker` event
+    """
+    __slots__ = ('stream_type', 'order_book_update_id', 'symbol', 'best_bid_price', 'best_bid_quantity',
+                 'best_ask_price', 'best_ask_quantity', 'event_type', 'pair', 'unicorn_fied')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """
+        Reset all fields to `None`
+
+        :return: None
+        """
+        # One chained assignment is much faster than `setattr()` in a loop, this runs on every release
+        self.stream_type = self.order_book_update_id = self.symbol = self.best_bid_price = self.best_bid_quantity = \
+            self.best_ask_price = self.best_ask_quantity = self.event_type = self.pair = self.unicorn_fied = None
+
+
+class MarkPriceRecord(PooledRecord):
+    """
+    Pooled record of a `markPriceUpdate` event
+    """
+    __slots__ = ('stream_type', 'event_type', 'event_time', 'symbol', 'mark_price', 'estimated_settle_price',
+                 'funding_rate', 'next_funding_time', 'index_price', 'unicorn_fied')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """
+        Reset all fields to `None`
+
+        :return: None
+        """
+        self.stream_type = self.event_type = self.event_time = self.symbol = self.mark_price = \
+            self.estimated_settle_price = self.funding_rate = self.next_funding_time = self.index_price = \
+            self.unicorn_fied = None
+
+
+class MarkPriceArrayRecord(PooledRecord):
+    """
+    Pooled wrapper of the `markPriceUpdate` events of one frame, `data` holds the `MarkPriceRecord` items.
+
+    The list of `data` is reused as well, releasing the wrapper releases its items.
+    """
+    __slots__ = ('stream_type', 'event_type', 'data', 'unicorn_fied')
+
+    def __init__(self):
+        self.data: list = []
+        self.clear()
+
+    def clear(self):
+        """
+        Reset all fields to `None` and empty `data`
+
+        :return: None
+        """
+        self.stream_type = None
+        self.event_type = None
+        self.unicorn_fied = None
+        self.data.clear()
+
+    def to_dict(self) -> dict:
+        """
+        Materialize the record and its items to the unicorn_fied dict
+
+        :return: dict
+        """
+        unicorn_fied_data = {'stream_type': self.stream_type,
+                             'event_type': self.event_type,
+                             'data': [item.to_dict() for item in self.data]}
+        if self.unicorn_fied is not None:
+            unicorn_fied_data['unicorn_fied'] = self.unicorn_fied
+        return unicorn_fied_data
+
+
+class RecordPool(object):
+    """
+    Pool of preallocated records for fixed-shape high-frequency events (`bookTicker`, `markPriceUpdate`).
+
+    Pass an instance to the `record_pool` parameter of the websocket converters to receive pooled records instead of
+    dicts for these events: `BookTickerRecord` for `bookTicker` and a `MarkPriceArrayRecord` with `MarkPriceRecord`
+    items for `markPriceUpdate`. A converted pooled record needs no new objects apart from the decoded JSON, the
+    `unicorn_fied` list is shared by all records of an exchange and must not be modified.
+
+    On CPython the pool does not lower the latency: the dicts of the copying path are freed by reference counting
+    right away and do not reach the garbage collector. In `dev/benchmark_conversion.py` the pooled conversion was 5
+    to 15 % slower than the copying one (`bookTicker` 9.7 to 10.9 µs against 9.2 to 10.0 µs, `markPriceUpdate`
+    10.8 to 14.1 µs against 9.4 to 12.7 µs) with 1 instead of 2 gen-0 collections per 200000 events and GC pauses
+    below 0.3 ms either way. Use it only if a workload shows a benefit, e.g. on an interpreter without reference
+    counting.
+
+    The free lists are `collections.deque` objects shared by all threads, `append()` and `pop()` are atomic. Records
+    can therefore be released by any thread, e.g. by a consumer thread while the converter runs in a
+    `ConverterWorker` or `ThreadedConverter`, and are reused by every converting thread.
+
+    :param max_size: Maximum amount of released records per record type that are kept for reuse.
+    :type max_size: int
+    """
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.free_lists: dict = {BookTickerRecord: deque(), MarkPriceRecord: deque(), MarkPriceArrayRecord: deque()}
+        self.unicorn_fied: dict = {}
+
+    def acquire(self, record_class: type) -> PooledRecord:
+        """
+        Get a record from the pool or create a new one if the pool is empty.
+
+        :param record_class: `BookTickerRecord`, `MarkPriceRecord` or `MarkPriceArrayRecord`
+        :type record_class: type
+
+        :return: PooledRecord
+        """
+        try:
+            return self.free_lists[record_class].pop()
+        except IndexError:
+            return record_class()
+
+    def get_size(self, record_class: Optional[type] = None) -> int:
+        """
+        Get the amount of records available for reuse.
+
+        :param record_class: Only count records of this type.
+        :type record_class: type
+
+        :return: int
+        """
+        if record_class is not None:
+            return len(self.free_lists[record_class])
+        return sum(len(free_list) for free_list in self.free_lists.values())
+
+    def get_unicorn_fied(self, exchange: str, version: str) -> list:
+        """
+        Get the shared `unicorn_fied` list of an exchange.
+
+        :param exchange: Exchange endpoint.
+        :type exchange: str
+
+        :param version: Version of UnicornFy.
+        :type version: str
+
+        :return: list
+        """
+        try:
+            return self.unicorn_fied[exchange]
+        except KeyError:
+            return self.unicorn_fied.setdefault(exchange, [exchange, version])
+
+    def release(self, record: PooledRecord) -> bool:
+        """
+        Give a record back to the pool, possible from any thread. The items of a `MarkPriceArrayRecord` are released
+        as well.
+
+        :param record: The record to release.
+        :type record: PooledRecord
+
+        :return: bool - False if the pool is full and the record got discarded.
+        """
+        if type(record) is MarkPriceArrayRecord:
+            for item in record.data:
+                self.release(item)
+            record.data.clear()
+        free_list = self.free_lists[record.__class__]
+        # Without a lock the size can exceed `max_size` by the amount of concurrently releasing threads
+        if len(free_list) >= self.max_size:
+            return False
+        record.clear()
+        free_list.append(record)
+        return True
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/record_serializer.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from operator import itemgetter
+from typing import Optional
+import ujson as json
+
+from .stream_name import parse_stream_name
+from .unicorn_fy import UnicornFy
+
+# Key maps of the serializer templates: `(raw_key, unicorn_fied_key)` in the same order as the fields are created by
+# the converters, followed by the optional keys. The output has the same keys as the converter output, raw keys that
+# are not listed are not part of it. Futures depth updates get `depth_level` from the stream name, they are not
+# serialized with a template.
+SERIALIZER_KEY_MAPS: dict = {
+    'binance_websocket': {
+        'aggTrade': ((('e', 'event_type'), ('E', 'event_time'), ('s', 'symbol'), ('a', 'aggregate_trade_id'),
+                      ('p', 'price'), ('q', 'quantity'), ('f', 'first_trade_id'), ('l', 'last_trade_id'),
+                      ('T', 'trade_time'), ('m', 'is_market_maker'), ('M', 'ignore')), ()),
+        'trade': ((('e', 'event_type'), ('E', 'event_time'), ('s', 'symbol'), ('t', 'trade_id'), ('p', 'price'),
+                   ('q', 'quantity'), ('b', 'buyer_order_id'), ('a', 'seller_order_id'), ('T', 'trade_time'),
+                   ('m', 'is_market_maker'), ('M', 'ignore')), ()),
+        'bookTicker': ((('u', 'order_book_update_id'), ('s', 'symbol'), ('b', 'best_bid_price'),
+                        ('B', 'best_bid_quantity'), ('a', 'best_ask_price'), ('A', 'best_ask_quantity'),
+                        ('e', 'event_type')), ()),
+        'depthUpdate': ((('e', 'event_type'), ('E', 'event_time'), ('s', 'symbol'), ('U', 'first_update_id_in_event'),
+                         ('u', 'final_update_id_in_event'), ('b', 'bids'), ('a', 'asks')), ()),
+    },
+    'binance_futures_websocket': {
+        'aggTrade': ((('e', 'event_type'), ('E', 'event_time'), ('s', 'symbol'), ('a', 'aggregate_trade_id'),
+                      ('p', 'price'), ('q', 'quantity'), ('f', 'first_trade_id'), ('l', 'last_trade_id'),
+                      ('T', 'trade_time'), ('m', 'is_market_maker')), ()),
+        'bookTicker': ((('u', 'order_book_update_id'), ('s', 'symbol'), ('b', 'best_bid_price'),
+                        ('B', 'best_bid_quantity'), ('a', 'best_ask_price'), ('A', 'best_ask_quantity'),
+                        ('e', 'event_type')), (('ps', 'pair'),)),
+    },
+}
+
+# converter: (exchange, section of `SERIALIZER_KEY_MAPS`)
+SERIALIZER_CONVERTERS: dict = {
+    'binance_com_websocket': ("binance.com", 'binance_websocket'),
+    'binance_com_margin_websocket': ("binance.com-margin", 'binance_websocket'),
+    'binance_com_isolated_margin_websocket': ("binance.com-isolated_margin", 'binance_websocket'),
+    'binance_com_futures_websocket': ("binance.com-futures", 'binance_futures_websocket'),
+    'binance_com_coin_futures_websocket': ("binance.com-coin_futures", 'binance_futures_websocket'),
+    'binance_us_websocket': ("binance.us", 'binance_websocket'),
+    'trbinance_com_websocket': ("trbinance.com", 'binance_websocket'),
+}
+
+
+class RecordSerializer(object):
+    """
+    Serialize received websocket payloads to JSON or msgpack bytes in the unicorn_fied shape.
+
+    `aggTrade`, `trade`, `bookTicker` and (spot) `depthUpdate` events of combined streams are serialized with
+    templates compiled from `SERIALIZER_KEY_MAPS`: the raw values are picked with one `itemgetter` call, zipped with
+    the prepared keys into a dict and encoded with one call of the C encoder, without running the converter. All
+    other payloads are converted with the converter and encoded afterwards. Both paths return the same keys as the
+    converter, including the `ignore` fields.
+
+    The short-lived dict of the template path is deliberate: encoding the values one by one behind prepared JSON
+    keys took 5.2 to 9.3 µs for an `aggTrade` event against 4.4 to 5.2 µs with the dict and one encoder call.
+
+    `to_msgpack()` needs the optional `msgpack` package.
+
+    :param converter: Name of the converter method of `UnicornFy`, e.g. `binance_com_futures_websocket`
+    :type converter: str
+    """
+    def __init__(self, converter: str = "binance_com_websocket"):
+        self.converter = getattr(UnicornFy, converter)
+        self.exchange, section = SERIALIZER_CONVERTERS[converter]
+        self.unicorn_fied: list = [self.exchange, UnicornFy.get_version()]
+        self.templates: dict = {}
+        for event_type, (key_map, optional_key_map) in SERIALIZER_KEY_MAPS[section].items():
+            self.templates[event_type] = (('stream_type',) + tuple(key for _, key in key_map) + ('unicorn_fied',),
+                                          itemgetter(*(raw_key for raw_key, _ in key_map)),
+                                          frozenset(raw_key for raw_key, _ in optional_key_map),
+                                          'bookTicker' if section == 'binance_futures_websocket' and
+                                          event_type == 'bookTicker' else None)
+        self.msgpack_packb = None
+
+    def _get_values(self, stream_data_json) -> Optional[tuple]:
+        try:
+            stream_data = json.loads(stream_data_json)
+            data = stream_data['data']
+            stream = stream_data['stream']
+        except (ValueError, TypeError, KeyError):
+            return None
+        try:
+            event_type = data.get('e')
+        except AttributeError:
+            return None
+        try:
+            stream_name = parse_stream_name(stream)
+        except AttributeError:
+            return None
+        if stream_name.depth_level:
+            # Partial book depth, the converter returns it as `depth` event
+            return None
+        if event_type is None and stream_name.channel == 'bookTicker' and stream_name.symbol is not None:
+            data['e'] = event_type = "bookTicker"
+        template = self.templates.get(event_type)
+        if template is None:
+            return None
+        keys, get_values, optional_keys, stream_type = template
+        if optional_keys and not optional_keys.isdisjoint(data):
+            return None
+        try:
+            values = get_values(data)
+        except KeyError:
+            return None
+        return keys, (stream_type or stream,) + values + (self.unicorn_fied,)
+
+    def to_json_bytes(self, stream_data_json) -> bytes:
+        """
+        Serialize a received payload to JSON.
+
+        :param stream_data_json: The received raw stream data from the Binance websocket
+        :type stream_data_json: str
+
+        :return: bytes
+        """
+        template = self._get_values(stream_data_json)
+        if template is None:
+            return json.dumps(self.converter(stream_data_json)).encode()
+        keys, values = template
+        return json.dumps(dict(zip(keys, values))).encode()
+
+    def to_json_bytes_batch(self, stream_data_jsons) -> bytes:
+        """
+        Serialize received payloads to newline-delimited JSON.
+
+        :param stream_data_jsons: The received raw stream data.
+        :type stream_data_jsons: list
+
+        :return: bytes
+        """
+        return b"".join([self.to_json_bytes(stream_data_json) + b"\n" for stream_data_json in stream_data_jsons])
+
+    def to_msgpack(self, stream_data_json) -> bytes:
+        """
+        Serialize a received payload to msgpack.
+
+        :param stream_data_json: The received raw stream data from the Binance websocket
+        :type stream_data_json: str
+
+        :return: bytes
+        """
+        if self.msgpack_packb is None:
+            try:
+                import msgpack
+            except ImportError:
+                raise ImportError("`RecordSerializer.to_msgpack()` needs the `msgpack` package: "
+                                  "`pip install msgpack`") from None
+            self.msgpack_packb = msgpack.packb
+        template = self._get_values(stream_data_json)
+        if template is None:
+            return self.msgpack_packb(self.converter(stream_data_json))
+        keys, values = template
+        return self.msgpack_packb(dict(zip(keys, values)))
+
+    def to_msgpack_batch(self, stream_data_jsons) -> bytes:
+        """
+        Serialize received payloads to a msgpack stream, the objects are concatenated and can be read with
+        `msgpack.Unpacker`.
+
+        :param stream_data_jsons: The received raw stream data.
+        :type stream_data_jsons: list
+
+        :return: bytes
+        """
+        return b"".join([self.to_msgpack(stream_data_json) for stream_data_json in stream_data_jsons])
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/record_view.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from collections.abc import Mapping
+from typing import Optional
+
+
+class RecordView(Mapping):
+    """
+    Read-only view of a decoded event with the keys of the unicorn_fied dict, used by the view conversion mode.
+
+    The unicorn_fied keys are translated to the raw keys on access with a static key map: the value of a key is the
+    path of raw keys (`('o', 'p')` for `data['o']['p']`) or a nested key map for a nested dict (e.g. `kline`), which
+    is returned as a `RecordView` of the same event. Keys without raw value are missing, unless `defaults` has a value
+    for them. `head` and `tail` hold constant keys before and after the translated keys (e.g. `stream_type` and
+    `unicorn_fied`).
+
+    Use `to_dict()` to materialize a real dict. The view reads the decoded event, so it must not be changed.
+    """
+    __slots__ = ('data', 'key_map', 'defaults', 'head', 'tail')
+
+    def __init__(self, data: dict, key_map: dict, defaults: Optional[dict] = None, head: Optional[dict] = None,
+                 tail: Optional[dict] = None):
+        self.data = data
+        self.key_map = key_map
+        self.defaults = defaults
+        self.head = head
+        self.tail = tail
+
+    def __getitem__(self, key):
+        path = self.key_map.get(key)
+        if path is None:
+            if self.head is not None and key in self.head:
+                return self.head[key]
+            if self.tail is not None and key in self.tail:
+                return self.tail[key]
+            raise KeyError(key)
+        if type(path) is dict:
+            return RecordView(self.data, path, self.defaults)
+        value = self.data
+        try:
+            for raw_key in path:
+                value = value[raw_key]
+        except KeyError:
+            if self.defaults is not None and key in self.defaults:
+                return self.defaults[key]
+            raise KeyError(key) from None
+        return value
+
+    def __iter__(self):
+        if self.head is not None:
+            yield from self.head
+        for key in self.key_map:
+            try:
+                self[key]
+            except KeyError:
+                continue
+            yield key
+        if self.tail is not None:
+            yield from self.tail
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def to_dict(self) -> dict:
+        """
+        Materialize the view to the unicorn_fied dict
+
+        :return: dict
+        """
+        return {key: value.to_dict() if type(value) is RecordView else value for key, value in self.items()}
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/rest_converter.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from array import array
+from operator import itemgetter
+from typing import Optional
+import time
+import ujson as json
+
+from .unicorn_fy import UnicornFy
+
+# Columns of the REST kline arrays: `(position, unicorn_fied_key, array typecode)`, position 11 (`ignore`) is skipped
+REST_KLINE_COLUMNS: tuple = ((0, 'kline_start_time', 'q'), (1, 'open_price', 'd'), (2, 'high_price', 'd'),
+                             (3, 'low_price', 'd'), (4, 'close_price', 'd'), (5, 'base_volume', 'd'),
+                             (6, 'kline_close_time', 'q'), (7, 'quote', 'd'), (8, 'number_of_trades', 'q'),
+                             (9, 'taker_by_base_asset_volume', 'd'), (10, 'taker_by_quote_asset_volume', 'd'))
+# Columns of the REST aggTrade objects: `(raw_key, unicorn_fied_key, array typecode)`
+REST_AGG_TRADE_COLUMNS: tuple = (('a', 'aggregate_trade_id', 'q'), ('p', 'price', 'd'), ('q', 'quantity', 'd'),
+                                 ('f', 'first_trade_id', 'q'), ('l', 'last_trade_id', 'q'), ('T', 'trade_time', 'q'),
+                                 ('m', 'is_market_maker', 'b'))
+
+
+class RestConverter(object):
+    """
+    Convert REST responses of the Binance APIs to the unicorn_fied shape of the matching websocket events.
+
+    - `depth()`: `/api/v3/depth` and `/fapi/v1/depth` like partial book depth events (`event_type` `depth`)
+    - `klines()`: `/api/v3/klines` and `/fapi/v1/klines` like `kline` events
+    - `agg_trades()`: `/api/v3/aggTrades` and `/fapi/v1/aggTrades` like `aggTrade` events
+
+    The `stream_type` is the name of the websocket stream with the same events, e.g. `btcusdt@kline_1m`, except for
+    depth snapshots: they are named `<symbol>@depth_snapshot` to not be mistaken for events of the `<symbol>@depth`
+    diff stream. REST responses have no event time, `event_time` is None. Klines have no trade ids,
+    `first_trade_id` and `last_trade_id` are False like in the websocket converters. Like the websocket events, spot
+    klines and aggTrades have an `ignore` field and futures klines and aggTrades have none, for klines the market is
+    taken from `exchange`.
+
+    `klines_to_columns()` and `agg_trades_to_columns()` convert whole pages to `array` columns with the unicorn_fied
+    field names (prices as float) instead of a dict per row, pages can be appended to the columns of the last page.
+
+    The responses can be passed as JSON str or decoded.
+    """
+    @staticmethod
+    def _load(payload):
+        if isinstance(payload, (str, bytes)):
+            return json.loads(payload)
+        return payload
+
+    @staticmethod
+    def depth(payload, symbol: str, exchange: str = "binance.com") -> dict:
+        """
+        Convert an order book snapshot.
+
+        :param payload: The response of `/api/v3/depth` or `/fapi/v1/depth`
+        :type payload: str or dict
+
+        :param symbol: The symbol of the request, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :param exchange: The exchange, e.g. `binance.com-futures`
+        :type exchange: str
+
+        :return: dict
+        """
+        payload = RestConverter._load(payload)
+        unicorn_fied_data = {'stream_type': symbol.lower() + "@depth_snapshot",
+                             'event_type': "depth",
+                             'symbol': symbol.upper(),
+                             'last_update_id': payload['lastUpdateId'],
+                             'bids': payload['bids'],
+                             'asks': payload['asks']}
+        if 'E' in payload:
+            unicorn_fied_data['event_time'] = payload['E']
+            unicorn_fied_data['transaction_time'] = payload['T']
+        unicorn_fied_data['unicorn_fied'] = [exchange, UnicornFy.get_version()]
+        return unicorn_fied_data
+
+    @staticmethod
+    def klines(payload, symbol: str, interval: str, exchange: str = "binance.com",
+               now: Optional[int] = None) -> list:
+        """
+        Convert a page of klines.
+
+        :param payload: The response of `/api/v3/klines` or `/fapi/v1/klines`
+        :type payload: str or list
+
+        :param symbol: The symbol of the request, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :param interval: The interval of the request, e.g. `1m`
+        :type interval: str
+
+        :param exchange: The exchange, e.g. `binance.com-futures`
+        :type exchange: str
+
+        :param now: Klines with a close time before `now` (milliseconds since the epoch) are closed, default is the
+                    current time.
+        :type now: int
+
+        :return: list
+        """
+        symbol = symbol.upper()
+        stream_type = symbol.lower() + "@kline_" + interval
+        unicorn_fied = [exchange, UnicornFy.get_version()]
+        if now is None:
+            now = int(time.time() * 1000)
+        rows = RestConverter._load(payload)
+        unicorn_fied_data = [{'stream_type': stream_type,
+                              'event_type': "kline",
+                              'event_time': None,
+                              'symbol': symbol,
+                              'kline': {'kline_start_time': start_time,
+                                        'kline_close_time': close_time,
+                                        'symbol': symbol,
+                                        'interval': interval,
+                                        'first_trade_id': False,
+                                        'last_trade_id': False,
+                                        'open_price': open_price,
+                                        'close_price': close_price,
+                                        'high_price': high_price,
+                                        'low_price': low_price,
+                                        'base_volume': base_volume,
+                                        'number_of_trades': number_of_trades,
+                                        'is_closed': close_time < now,
+                                        'quote': quote,
+                                        'taker_by_base_asset_volume': taker_base_volume,
+                                        'taker_by_quote_asset_volume': taker_quote_volume},
+                              'unicorn_fied': unicorn_fied}
+                             for start_time, open_price, high_price, low_price, close_price, base_volume, close_time,
+                             quote, number_of_trades, taker_base_volume, taker_quote_volume, _ in rows]
+        if "futures" not in exchange:
+            # Spot klines have the `ignore` field of the websocket events
+            for item, row in zip(unicorn_fied_data, rows):
+                item['kline']['ignore'] = row[11]
+        return unicorn_fied_data
+
+    @staticmethod
+    def agg_trades(payload, symbol: str, exchange: str = "binance.com") -> list:
+        """
+        Convert a page of aggregated trades.
+
+        :param payload: The response of `/api/v3/aggTrades` or `/fapi/v1/aggTrades`
+        :type payload: str or list
+
+        :param symbol: The symbol of the request, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :param exchange: The exchange, e.g. `binance.com-futures`
+        :type exchange: str
+
+        :return: list
+        """
+        symbol = symbol.upper()
+        stream_type = symbol.lower() + "@aggTrade"
+        unicorn_fied = [exchange, UnicornFy.get_version()]
+        rows = RestConverter._load(payload)
+        unicorn_fied_data = [{'stream_type': stream_type,
+                              'event_type': "aggTrade",
+                              'event_time': None,
+                              'symbol': symbol,
+                              'aggregate_trade_id': row['a'],
+                              'price': row['p'],
+                              'quantity': row['q'],
+                              'first_trade_id': row['f'],
+                              'last_trade_id': row['l'],
+                              'trade_time': row['T'],
+                              'is_market_maker': row['m'],
+                              'unicorn_fied': unicorn_fied} for row in rows]
+        if rows and 'M' in rows[0]:
+            # Spot trades have the `ignore` field of the websocket events
+            for item, row in zip(unicorn_fied_data, rows):
+                item['ignore'] = row['M']
+        return unicorn_fied_data
+
+    @staticmethod
+    def _to_columns(rows: list, column_definitions: tuple, columns: Optional[dict]) -> dict:
+        if columns is None:
+            columns = {key: array(typecode) for _, key, typecode in column_definitions}
+        for position, key, typecode in column_definitions:
+            values = map(itemgetter(position), rows)
+            columns[key].extend(map(float, values) if typecode == 'd' else values)
+        return columns
+
+    @staticmethod
+    def klines_to_columns(payload, columns: Optional[dict] = None, now: Optional[int] = None) -> dict:
+        """
+        Convert a page of klines to columns.
+
+        :param payload: The response of `/api/v3/klines` or `/fapi/v1/klines`
+        :type payload: str or list
+
+        :param columns: The columns of the previous pages, the page gets appended.
+        :type columns: dict
+
+        :param now: Klines with a close time before `now` (milliseconds since the epoch) are closed, default is the
+                    current time.
+        :type now: int
+
+        :return: dict - `array` per unicorn_fied field name
+        """
+        rows = RestConverter._load(payload)
+        columns = RestConverter._to_columns(rows, REST_KLINE_COLUMNS, columns)
+        if 'is_closed' not in columns:
+            columns['is_closed'] = array('b')
+        if now is None:
+            now = int(time.time() * 1000)
+        columns['is_closed'].extend(close_time < now for close_time in map(itemgetter(6), rows))
+        return columns
+
+    @staticmethod
+    def agg_trades_to_columns(payload, columns: Optional[dict] = None) -> dict:
+        """
+        Convert a page of aggregated trades to columns.
+
+        :param payload: The response of `/api/v3/aggTrades` or `/fapi/v1/aggTrades`
+        :type payload: str or list
+
+        :param columns: The columns of the previous pages, the page gets appended.
+        :type columns: dict
+
+        :return: dict - `array` per unicorn_fied field name
+        """
+        return RestConverter._to_columns(RestConverter._load(payload), REST_AGG_TRADE_COLUMNS, columns)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/ring_buffer.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+import threading
+import time
+
+
+class SpscRingBuffer(object):
+    """
+    Bounded single-producer/single-consumer ring buffer.
+
+    Exactly one thread may call `push()` and exactly one other thread may call `pop()` or `pop_batch()`. The data path
+    works without a lock, only a waiting consumer is woken up by an event. A waiting consumer first spins
+    `spin_count` times before it parks.
+
+    :param capacity: Maximum amount of items, rounded up to a power of two.
+    :type capacity: int
+
+    :param spin_count: How many times a waiting consumer checks for new items before it parks.
+    :type spin_count: int
+    """
+    def __init__(self, capacity: int = 65536, spin_count: int = 1000):
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self.capacity = size
+        self.mask = size - 1
+        self.spin_count = spin_count
+        self.slots: list = [None] * size
+        # `head` is only written by the consumer, `tail` only by the producer
+        self.head: int = 0
+        self.tail: int = 0
+        self.overflows: int = 0
+        self.consumer_parked: bool = False
+        self.not_empty = threading.Event()
+
+    def __len__(self):
+        return self.tail - self.head
+
+    def get_stats(self) -> dict:
+        """
+        Get the counters of the ring buffer.
+
+        :return: dict
+        """
+        return {'capacity': self.capacity,
+                'occupancy': self.tail - self.head,
+                'overflows': self.overflows,
+                'pushed': self.tail,
+                'popped': self.head}
+
+    def push(self, item) -> bool:
+        """
+        Add an item, must only be called by the producer thread.
+
+        :param item: The item to add.
+
+        :return: bool - False if the buffer is full and the item got dropped.
+        """
+        tail = self.tail
+        if tail - self.head >= self.capacity:
+            self.overflows += 1
+            return False
+        self.slots[tail & self.mask] = item
+        self.tail = tail + 1
+        if self.consumer_parked is True:
+            self.not_empty.set()
+        return True
+
+    def pop(self, timeout: float = 0.0):
+        """
+        Get the oldest item, must only be called by the consumer thread.
+
+        :param timeout: Wait up to `timeout` seconds for an item, `None` waits forever.
+        :type timeout: float
+
+        :return: item or None
+        """
+        items = self.pop_batch(max_items=1, timeout=timeout)
+        if items:
+            return items[0]
+        return None
+
+    def pop_batch(self, max_items: int = 1000, timeout: float = 0.0) -> list:
+        """
+        Get up to `max_items` of the oldest items, must only be called by the consumer thread.
+
+        :param max_items: Maximum amount of items to return.
+        :type max_items: int
+
+        :param timeout: Wait up to `timeout` seconds for at least one item, `None` waits forever.
+        :type timeout: float
+
+        :return: list
+        """
+        if self.tail == self.head and timeout != 0.0:
+            self.wait(timeout)
+        head = self.head
+        available = self.tail - head
+        if available <= 0:
+            return []
+        if available > max_items:
+            available = max_items
+        items = []
+        for position in range(head, head + available):
+            index = position & self.mask
+            items.append(self.slots[index])
+            self.slots[index] = None
+        self.head = head + available
+        return items
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait until the buffer is not empty, first by spinning and then by parking on an event.
+
+        :param timeout: Maximum time in seconds to wait, `None` waits forever.
+        :type timeout: float
+
+        :return: bool - False if the buffer is still empty (timeout or `wake_up()`).
+        """
+        for _ in range(self.spin_count):
+            if self.tail != self.head:
+                return True
+            # Give the producer a chance to get the GIL
+            time.sleep(0)
+        self.not_empty.clear()
+        self.consumer_parked = True
+        # Check again after announcing the park, otherwise a push in between would not wake us up
+        if self.tail == self.head:
+            self.not_empty.wait(timeout)
+        self.consumer_parked = False
+        return self.tail != self.head
+
+    def wake_up(self) -> None:
+        """
+        Wake up a parked consumer, e.g. to let it check a stop flag.
+
+        :return: None
+        """
+        self.not_empty.set()
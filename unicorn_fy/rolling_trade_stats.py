@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/rolling_trade_stats.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from array import array
+from typing import Optional
+
+# Bucket columns
+QUOTE_VOLUME: int = 0
+BUY_VOLUME: int = 1
+SELL_VOLUME: int = 2
+TRADE_COUNT: int = 3
+COLUMNS: int = 4
+
+
+class RollingTradeStats(object):
+    """
+    VWAP, volume, trade count and buy/sell imbalance over rolling windows per symbol, fed by unicorn_fied `trade`
+    and `aggTrade` events.
+
+    Trades are added to time buckets of `bucket_interval` milliseconds by their `trade_time`. The buckets of every
+    symbol are a ring in a flat array that covers the largest window, every window keeps running sums that are
+    updated when a bucket enters or leaves it, so a trade costs O(1) amortized. The window borders are aligned to the
+    buckets. The aggressor side is taken from `is_market_maker`: if the buyer is the maker, the trade is a sell.
+
+    Trades older than the largest window are dropped and counted in `dropped_trades`. Use one writing thread.
+
+    :param windows: Window lengths in seconds.
+    :type windows: tuple
+
+    :param bucket_interval: Bucket length in milliseconds.
+    :type bucket_interval: int
+    """
+    def __init__(self, windows: tuple = (1, 10, 60, 300), bucket_interval: int = 250):
+        self.windows: tuple = tuple(windows)
+        self.bucket_interval: int = bucket_interval
+        self.window_buckets: tuple = tuple(max(1, int(round(window * 1000 / bucket_interval))) for window in windows)
+        self.buckets: int = max(self.window_buckets)
+        self.symbol_ids: dict = {}
+        self.symbols: list = []
+        self.head_buckets = array('q')
+        self.bucket_values = array('d')
+        # window index: column: array indexed by symbol id
+        self.window_sums: list = [[array('d') for _ in range(COLUMNS)] for _ in self.windows]
+        self.dropped_trades: int = 0
+
+    def _add_symbol(self, symbol: str) -> int:
+        symbol_id = len(self.symbols)
+        self.head_buckets.append(-1)
+        self.bucket_values.extend(array('d', bytes(8 * self.buckets * COLUMNS)))
+        for sums in self.window_sums:
+            for column in sums:
+                column.append(0.0)
+        self.symbols.append(symbol)
+        self.symbol_ids[symbol] = symbol_id
+        return symbol_id
+
+    def _advance(self, symbol_id: int, bucket: int) -> None:
+        head_bucket = self.head_buckets[symbol_id]
+        if bucket <= head_bucket:
+            return
+        buckets = self.buckets
+        values = self.bucket_values
+        offset = symbol_id * buckets * COLUMNS
+        if head_bucket < 0 or bucket - head_bucket >= buckets:
+            for index in range(offset, offset + buckets * COLUMNS):
+                values[index] = 0.0
+            for sums in self.window_sums:
+                for column in sums:
+                    column[symbol_id] = 0.0
+        else:
+            for new_bucket in range(head_bucket + 1, bucket + 1):
+                for window_buckets, sums in zip(self.window_buckets, self.window_sums):
+                    leaving = offset + ((new_bucket - window_buckets) % buckets) * COLUMNS
+                    if values[leaving + TRADE_COUNT] == 0.0:
+                        continue
+                    if sums[TRADE_COUNT][symbol_id] == values[leaving + TRADE_COUNT]:
+                        # Last trades of the window, reset exactly instead of accumulating float errors
+                        for column in sums:
+                            column[symbol_id] = 0.0
+                    else:
+                        for column_id in range(COLUMNS):
+                            sums[column_id][symbol_id] -= values[leaving + column_id]
+                index = offset + (new_bucket % buckets) * COLUMNS
+                for column_id in range(COLUMNS):
+                    values[index + column_id] = 0.0
+        self.head_buckets[symbol_id] = bucket
+
+    def add(self, symbol: str, price: float, quantity: float, trade_time: int, is_market_maker: bool) -> bool:
+        """
+        Add a trade.
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :param price: Price of the trade.
+        :type price: float
+
+        :param quantity: Quantity of the trade.
+        :type quantity: float
+
+        :param trade_time: Trade time in milliseconds.
+        :type trade_time: int
+
+        :param is_market_maker: True if the buyer is the maker.
+        :type is_market_maker: bool
+
+        :return: bool - False if the trade was dropped
+        """
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._add_symbol(symbol)
+        bucket = trade_time // self.bucket_interval
+        self._advance(symbol_id, bucket)
+        head_bucket = self.head_buckets[symbol_id]
+        if head_bucket - bucket >= self.buckets:
+            self.dropped_trades += 1
+            return False
+        quote_volume = price * quantity
+        side = SELL_VOLUME if is_market_maker else BUY_VOLUME
+        index = symbol_id * self.buckets * COLUMNS + (bucket % self.buckets) * COLUMNS
+        values = self.bucket_values
+        values[index + QUOTE_VOLUME] += quote_volume
+        values[index + side] += quantity
+        values[index + TRADE_COUNT] += 1.0
+        for window_buckets, sums in zip(self.window_buckets, self.window_sums):
+            if head_bucket - bucket < window_buckets:
+                sums[QUOTE_VOLUME][symbol_id] += quote_volume
+                sums[side][symbol_id] += quantity
+                sums[TRADE_COUNT][symbol_id] += 1.0
+        return True
+
+    def apply(self, unicorn_fied_data: dict) -> bool:
+        """
+        Add a unicorn_fied `trade` or `aggTrade` event, other events are ignored.
+
+        :param unicorn_fied_data: The unicorn_fied event.
+        :type unicorn_fied_data: dict
+
+        :return: bool
+        """
+        event_type = unicorn_fied_data.get('event_type')
+        if event_type != 'trade' and event_type != 'aggTrade':
+            return False
+        return self.add(unicorn_fied_data['symbol'],
+                        float(unicorn_fied_data['price']),
+                        float(unicorn_fied_data['quantity']),
+                        unicorn_fied_data['trade_time'],
+                        unicorn_fied_data['is_market_maker'])
+
+    def get_stats(self, symbol: str, window: float, time: Optional[int] = None) -> Optional[dict]:
+        """
+        Get the stats of a symbol.
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :param window: One of the configured windows in seconds.
+        :type window: float
+
+        :param time: Move the window to this time in milliseconds, by default the window ends with the newest trade.
+        :type time: int
+
+        :return: dict or None
+        """
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            return None
+        if time is not None:
+            self._advance(symbol_id, time // self.bucket_interval)
+        sums = self.window_sums[self.windows.index(window)]
+        buy_volume = sums[BUY_VOLUME][symbol_id]
+        sell_volume = sums[SELL_VOLUME][symbol_id]
+        volume = buy_volume + sell_volume
+        return {'symbol': symbol,
+                'window': window,
+                'vwap': sums[QUOTE_VOLUME][symbol_id] / volume if volume else 0.0,
+                'volume': volume,
+                'quote_volume': sums[QUOTE_VOLUME][symbol_id],
+                'buy_volume': buy_volume,
+                'sell_volume': sell_volume,
+                'trade_count': int(sums[TRADE_COUNT][symbol_id]),
+                'imbalance': (buy_volume - sell_volume) / volume if volume else 0.0}
+
+    def get_all_stats(self, window: float, time: Optional[int] = None) -> dict:
+        """
+        Get the stats of all symbols as columns, the index of a symbol in `symbols` is its index in all arrays.
+
+        :param window: One of the configured windows in seconds.
+        :type window: float
+
+        :param time: Move the windows to this time in milliseconds, by default every window ends with the newest
+                     trade of its symbol.
+        :type time: int
+
+        :return: dict
+        """
+        if time is not None:
+            bucket = time // self.bucket_interval
+            for symbol_id in range(len(self.symbols)):
+                self._advance(symbol_id, bucket)
+        sums = self.window_sums[self.windows.index(window)]
+        volumes = array('d', map(float.__add__, sums[BUY_VOLUME], sums[SELL_VOLUME]))
+        return {'symbols': list(self.symbols),
+                'window': window,
+                'vwap': array('d', [quote_volume / volume if volume else 0.0
+                                    for quote_volume, volume in zip(sums[QUOTE_VOLUME], volumes)]),
+                'volume': volumes,
+                'quote_volume': array('d', sums[QUOTE_VOLUME]),
+                'buy_volume': array('d', sums[BUY_VOLUME]),
+                'sell_volume': array('d', sums[SELL_VOLUME]),
+                'trade_count': array('q', map(int, sums[TRADE_COUNT])),
+                'imbalance': array('d', [(buy_volume - sell_volume) / volume if volume else 0.0
+                                         for buy_volume, sell_volume, volume in
+                                         zip(sums[BUY_VOLUME], sums[SELL_VOLUME], volumes)])}
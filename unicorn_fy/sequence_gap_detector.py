@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/sequence_gap_detector.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from array import array
+from typing import Callable, Optional
+
+
+class SequenceGapDetector(object):
+    """
+    Continuity check of the ids of unicorn_fied `aggTrade`, `trade` and `depthUpdate` events per
+    `(stream_type, symbol)`.
+
+    - `aggTrade`: `aggregate_trade_id` must be the last one + 1
+    - `trade`: `trade_id` must be the last one + 1
+    - `depthUpdate` (spot): `first_update_id_in_event` must be at most the last `final_update_id_in_event` + 1
+    - `depthUpdate` (futures): `final_update_id_in_previous_event` must be the last `final_update_id_in_event`,
+      partial book depth streams are ignored
+
+    Events with an id that is not newer than the last one are duplicates, they do not move the last id back. The last
+    ids and counters are stored in arrays indexed by a stream id. Pass an instance to the `gap_detector` parameter of
+    the websocket converters or call `check()`. Call `reset()` after a resync of a stream.
+
+    :param on_gap: Called with the unicorn_fied event and the number of missing ids (0 if unknown, e.g. for futures
+                   depth updates) of each gap.
+    :type on_gap: function
+
+    :param on_duplicate: Called with the unicorn_fied event of each duplicate.
+    :type on_duplicate: function
+    """
+    def __init__(self, on_gap: Optional[Callable] = None, on_duplicate: Optional[Callable] = None):
+        self.on_gap = on_gap
+        self.on_duplicate = on_duplicate
+        self.stream_ids: dict = {}
+        self.streams: list = []
+        self.last_ids = array('q')
+        self.gap_counts = array('q')
+        self.duplicate_counts = array('q')
+        self.gaps: int = 0
+        self.duplicates: int = 0
+        self.missing_ids: int = 0
+
+    def _get_stream_id(self, stream_type: str, symbol: str) -> int:
+        key = (stream_type, symbol)
+        stream_id = self.stream_ids.get(key)
+        if stream_id is None:
+            stream_id = len(self.streams)
+            self.last_ids.append(-1)
+            self.gap_counts.append(0)
+            self.duplicate_counts.append(0)
+            self.streams.append(key)
+            self.stream_ids[key] = stream_id
+        return stream_id
+
+    def _gap(self, stream_id: int, unicorn_fied_data, missing_ids: int) -> bool:
+        self.gaps += 1
+        self.gap_counts[stream_id] += 1
+        self.missing_ids += missing_ids
+        if self.on_gap is not None:
+            self.on_gap(unicorn_fied_data, missing_ids)
+        return False
+
+    def _duplicate(self, stream_id: int, unicorn_fied_data) -> bool:
+        self.duplicates += 1
+        self.duplicate_counts[stream_id] += 1
+        if self.on_duplicate is not None:
+            self.on_duplicate(unicorn_fied_data)
+        return False
+
+    def check(self, unicorn_fied_data) -> bool:
+        """
+        Check a unicorn_fied event, events without sequence ids are ignored.
+
+        :param unicorn_fied_data: The unicorn_fied event.
+        :type unicorn_fied_data: dict
+
+        :return: bool - False if the event is a gap or duplicate
+        """
+        event_type = unicorn_fied_data.get('event_type')
+        if event_type == 'aggTrade':
+            first_id = final_id = unicorn_fied_data['aggregate_trade_id']
+        elif event_type == 'trade':
+            first_id = final_id = unicorn_fied_data['trade_id']
+        elif event_type == 'depthUpdate':
+            if unicorn_fied_data.get('depth_level'):
+                # Partial book depth streams are snapshots without continuity
+                return True
+            first_id = unicorn_fied_data['first_update_id_in_event']
+            final_id = unicorn_fied_data['final_update_id_in_event']
+        else:
+            return True
+        stream_id = self._get_stream_id(unicorn_fied_data['stream_type'], unicorn_fied_data['symbol'])
+        last_id = self.last_ids[stream_id]
+        if last_id < 0:
+            self.last_ids[stream_id] = final_id
+            return True
+        if final_id <= last_id:
+            return self._duplicate(stream_id, unicorn_fied_data)
+        self.last_ids[stream_id] = final_id
+        previous_id = unicorn_fied_data.get('final_update_id_in_previous_event')
+        if previous_id is not None:
+            if previous_id != last_id:
+                return self._gap(stream_id, unicorn_fied_data, 0)
+        elif first_id > last_id + 1:
+            return self._gap(stream_id, unicorn_fied_data, first_id - last_id - 1)
+        return True
+
+    def get_stats(self, stream_type: Optional[str] = None, symbol: Optional[str] = None) -> dict:
+        """
+        Get the counters of all streams or of one stream.
+
+        :param stream_type: The `stream_type` of the events, e.g. `btcusdt@aggTrade`
+        :type stream_type: str
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: dict
+        """
+        if stream_type is None:
+            return {'streams': len(self.streams),
+                    'gaps': self.gaps,
+                    'duplicates': self.duplicates,
+                    'missing_ids': self.missing_ids}
+        stream_id = self.stream_ids.get((stream_type, symbol))
+        if stream_id is None:
+            return {'last_id': None, 'gaps': 0, 'duplicates': 0}
+        return {'last_id': self.last_ids[stream_id],
+                'gaps': self.gap_counts[stream_id],
+                'duplicates': self.duplicate_counts[stream_id]}
+
+    def reset(self, stream_type: Optional[str] = None, symbol: Optional[str] = None) -> bool:
+        """
+        Forget the last id of one or all streams, the next event starts a new sequence.
+
+        :param stream_type: The `stream_type` of the events, e.g. `btcusdt@aggTrade`
+        :type stream_type: str
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: bool
+        """
+        if stream_type is None:
+            for stream_id in range(len(self.streams)):
+                self.last_ids[stream_id] = -1
+            return True
+        stream_id = self.stream_ids.get((stream_type, symbol))
+        if stream_id is None:
+            return False
+        self.last_ids[stream_id] = -1
+        return True
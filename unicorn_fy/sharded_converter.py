@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/sharded_converter.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from .unicorn_fy import UnicornFy
+from .stream_name import parse_stream_name
+from typing import Optional
+import logging
+import os
+import queue
+import zlib
+
+logger = logging.getLogger("unicorn_fy")
+
+# Converter arguments with state, a worker process would only update its own copy
+SHARDED_STATEFUL_KWARGS: tuple = ('top_of_book', 'gap_detector', 'latency_monitor', 'record_pool')
+
+
+def shard_worker(converter: str, converter_kwargs: dict, input_queue, output_queue) -> None:
+    """
+    Main function of a shard process: convert the batches of `input_queue` in order and put the results as batches
+    into `output_queue` until `None` is received.
+
+    :param converter: Name of the converter method of `UnicornFy`, e.g. `binance_com_websocket`
+    :type converter: str
+
+    :param converter_kwargs: Keyword arguments for the converter.
+    :type converter_kwargs: dict
+
+    :return: None
+    """
+    convert = getattr(UnicornFy, converter)
+    while True:
+        batch = input_queue.get()
+        if batch is None:
+            output_queue.put(None)
+            return
+        unicorn_fied_batch = []
+        for stream_data_json in batch:
+            try:
+                unicorn_fied_batch.append(convert(stream_data_json, **converter_kwargs))
+            except Exception as error_msg:
+                logger.error(f"shard_worker() - Can not convert {stream_data_json} - error: {error_msg}")
+        output_queue.put(unicorn_fied_batch)
+
+
+class ShardedConverter(object):
+    """
+    Convert raw frames in `shards` worker processes, the order of all frames of a symbol is preserved.
+
+    Frames are routed by a CRC32 hash of their symbol, which is taken from the `stream` field of combined streams
+    (`btcusdt@depth@100ms` -> `btcusdt`) or from the `s` field of raw streams by a substring search, without decoding
+    the frame. All streams of a symbol end up in the same shard and each shard converts its frames in order.
+
+    Frames are sent to the workers in batches of `batch_size` (call `flush()` to send incomplete batches). The results
+    can be consumed merged from one queue with `get_batch()` or, with `merge_output=False`, by one consumer per shard
+    with `get_batch(shard_id=...)`.
+
+    The hooks `top_of_book`, `gap_detector`, `latency_monitor` and `record_pool` are rejected in `converter_kwargs`:
+    they would be pickled into every worker process and only the copies would be updated. Feed the hooks with the
+    converted results in the consuming process instead, e.g. `top_of_book.update()`, `gap_detector.check()` and
+    `latency_monitor.record()`.
+
+    :param shards: Amount of worker processes.
+    :type shards: int
+
+    :param converter: Name of the converter method of `UnicornFy`, e.g. `binance_com_futures_websocket`
+    :type converter: str
+
+    :param converter_kwargs: Keyword arguments for the converter, e.g. `{'as_view': True}`
+    :type converter_kwargs: dict
+
+    :param batch_size: Amount of frames per batch sent to a worker.
+    :type batch_size: int
+
+    :param merge_output: Put the results of all shards into one queue.
+    :type merge_output: bool
+    """
+    def __init__(self,
+                 shards: Optional[int] = None,
+                 converter: str = "binance_com_websocket",
+                 converter_kwargs: Optional[dict] = None,
+                 batch_size: int = 100,
+                 merge_output: bool = True):
+        for key in SHARDED_STATEFUL_KWARGS:
+            if converter_kwargs is not None and converter_kwargs.get(key) is not None:
+                raise ValueError(f"ShardedConverter() - `{key}` can not be used in the worker processes, call it "
+                                 f"with the converted results in the consuming process")
+        self.shards = shards if shards is not None else (os.cpu_count() or 1)
+        self.batch_size = batch_size
+        self.merge_output = merge_output
+        self.batches: list = [[] for _ in range(self.shards)]
+        # Imported on demand to keep `import unicorn_fy` fast
+        import multiprocessing
+        self.input_queues: list = [multiprocessing.Queue() for _ in range(self.shards)]
+        if merge_output is True:
+            self.output_queues: list = [multiprocessing.Queue()] * self.shards
+        else:
+            self.output_queues: list = [multiprocessing.Queue() for _ in range(self.shards)]
+        self.received_stop_markers: int = 0
+        self.processes: list = []
+        for shard_id in range(self.shards):
+            process = multiprocessing.Process(target=shard_worker,
+                                              args=(converter,
+                                                    converter_kwargs if converter_kwargs is not None else {},
+                                                    self.input_queues[shard_id],
+                                                    self.output_queues[shard_id]),
+                                              name=f"UnicornFy-Shard-{shard_id}",
+                                              daemon=True)
+            process.start()
+            self.processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, error_traceback):
+        self.stop()
+
+    @staticmethod
+    def get_routing_key(stream_data_json: str) -> str:
+        """
+        Get the symbol of a raw frame without decoding it.
+
+        :param stream_data_json: The received raw stream data
+        :type stream_data_json: str
+
+        :return: str
+        """
+        if stream_data_json.startswith('{"stream":"'):
+            stream_name = parse_stream_name(stream_data_json[11:stream_data_json.find('"', 11)])
+            if stream_name.symbol is not None:
+                return stream_name.symbol.lower()
+            return stream_name.stream.partition('@')[0].lower()
+        start = stream_data_json.find('"s":"')
+        if start == -1:
+            return ""
+        start += 5
+        return stream_data_json[start:stream_data_json.find('"', start)].lower()
+
+    def get_shard_id(self, stream_data_json: str) -> int:
+        """
+        Get the id of the shard that converts a raw frame.
+
+        :param stream_data_json: The received raw stream data
+        :type stream_data_json: str
+
+        :return: int
+        """
+        return zlib.crc32(self.get_routing_key(stream_data_json).encode()) % self.shards
+
+    def add(self, stream_data_json: str) -> int:
+        """
+        Add a raw frame, it is sent to its shard as soon as the batch is full.
+
+        :param stream_data_json: The received raw stream data
+        :type stream_data_json: str
+
+        :return: int - The shard id
+        """
+        shard_id = self.get_shard_id(stream_data_json)
+        batch = self.batches[shard_id]
+        batch.append(stream_data_json)
+        if len(batch) >= self.batch_size:
+            self.input_queues[shard_id].put(batch)
+            self.batches[shard_id] = []
+        return shard_id
+
+    def flush(self) -> None:
+        """
+        Send all incomplete batches to the workers.
+
+        :return: None
+        """
+        for shard_id, batch in enumerate(self.batches):
+            if batch:
+                self.input_queues[shard_id].put(batch)
+                self.batches[shard_id] = []
+
+    def get_batch(self, shard_id: int = 0, timeout: Optional[float] = None) -> Optional[list]:
+        """
+        Get the next batch of converted frames.
+
+        :param shard_id: The shard to read from, ignored if the output is merged.
+        :type shard_id: int
+
+        :param timeout: Maximum time in seconds to wait, `None` waits forever.
+        :type timeout: float
+
+        :return: list or None if there is nothing to get (timeout or the shard(s) stopped).
+        """
+        output_queue = self.output_queues[shard_id]
+        while True:
+            try:
+                batch = output_queue.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            if batch is not None:
+                return batch
+            if self.merge_output is False:
+                return None
+            # Merged output: every shard sends its own stop marker
+            self.received_stop_markers += 1
+            if self.received_stop_markers >= self.shards:
+                return None
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for the worker processes after `stop()`. A worker only exits after its results have been read, so call
+        `get_batch()` until it returns `None` first.
+
+        :param timeout: Maximum time in seconds to wait for each worker.
+        :type timeout: float
+
+        :return: None
+        """
+        for process in self.processes:
+            process.join(timeout)
+
+    def stop(self) -> None:
+        """
+        Send the remaining frames and ask all worker processes to stop after converting them.
+
+        The results can be read with `get_batch()` until it returns `None`.
+
+        :return: None
+        """
+        self.flush()
+        for input_queue in self.input_queues:
+            input_queue.put(None)
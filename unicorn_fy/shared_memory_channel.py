@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/shared_memory_channel.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from typing import Optional
+import struct
+import sys
+
+# Slot: sequence number (uint64), record type (uint8) and the record
+SLOT_HEADER = struct.Struct('<QB')
+# Channel: write sequence, amount of slots, slot size
+CHANNEL_HEADER = struct.Struct('<QQQ')
+SLOT_SIZE: int = 128
+# Symbols are stored as `16s`, longer symbols are rejected
+SYMBOL_SIZE: int = 16
+# Names of the channels created by this process
+CREATED_CHANNELS: set = set()
+
+# Record type id: (event_type, struct of the record, field names in the order of the struct)
+RECORD_LAYOUTS: dict = {
+    1: ('trade', struct.Struct('<16sqqddqqq?'),
+        ('symbol', 'event_time', 'trade_id', 'price', 'quantity', 'buyer_order_id', 'seller_order_id',
+         'trade_time', 'is_market_maker')),
+    2: ('aggTrade', struct.Struct('<16sqqddqqq?'),
+        ('symbol', 'event_time', 'aggregate_trade_id', 'price', 'quantity', 'first_trade_id', 'last_trade_id',
+         'trade_time', 'is_market_maker')),
+    3: ('bookTicker', struct.Struct('<16sqdddd'),
+        ('symbol', 'order_book_update_id', 'best_bid_price', 'best_bid_quantity', 'best_ask_price',
+         'best_ask_quantity')),
+    4: ('markPriceUpdate', struct.Struct('<16sqddddq'),
+        ('symbol', 'event_time', 'mark_price', 'index_price', 'estimated_settle_price', 'funding_rate',
+         'next_funding_time')),
+}
+RECORD_TYPE_IDS: dict = {event_type: record_type_id
+                         for record_type_id, (event_type, _, _) in RECORD_LAYOUTS.items()}
+PRICE_FIELDS: frozenset = frozenset(('price', 'quantity', 'best_bid_price', 'best_bid_quantity', 'best_ask_price',
+                                     'best_ask_quantity', 'mark_price', 'index_price', 'estimated_settle_price',
+                                     'funding_rate'))
+
+
+class SharedMemoryChannel(object):
+    """
+    Output channel in `multiprocessing.shared_memory` for unicorn_fied `trade`, `aggTrade`, `bookTicker` and
+    `markPriceUpdate` events.
+
+    One process creates the channel and writes the converted events into a ring of fixed-size slots, any amount of
+    other processes attach to it by `name` and read the records from the shared memory. Nothing is pickled or sent
+    through pipes.
+
+    Reading copies: `read()` unpacks each slot into a dict or, with `as_dict=False`, a tuple of the struct values.
+    A slot can be overwritten by the writer at any time, so a record is only valid after it was copied and its
+    sequence number was checked again - views into the slots are not handed out.
+
+    Each slot carries the sequence number of its record. A reader that falls behind more than `slots` records
+    detects the overwritten slots by their sequence number, counts them in `overruns` and continues with the oldest
+    record that is still available. Prices and quantities are stored as float64, `index_price` is NaN if the event
+    does not contain it. Symbols are stored with up to `SYMBOL_SIZE` (16) bytes, `write()` raises a `ValueError` for
+    longer symbols instead of truncating them. Arrays of `markPriceUpdate` events are checked as a whole before the
+    first item is written, an invalid item leaves nothing of the array in the channel.
+
+    :param name: Name of the shared memory block, required to attach as reader.
+    :type name: str
+
+    :param create: Create the channel (writer) or attach to an existing one (reader).
+    :type create: bool
+
+    :param slots: Amount of records the ring can hold, only used by the writer.
+    :type slots: int
+
+    :param read_from_oldest: Start reading with the oldest record in the ring instead of the next new one.
+    :type read_from_oldest: bool
+    """
+    def __init__(self, name: Optional[str] = None, create: bool = True, slots: int = 65536,
+                 read_from_oldest: bool = False):
+        # Imported on demand to keep `import unicorn_fy` fast
+        from multiprocessing import shared_memory
+        if create is True:
+            self.shared_memory = shared_memory.SharedMemory(name=name, create=True,
+                                                            size=CHANNEL_HEADER.size + slots * SLOT_SIZE)
+            CHANNEL_HEADER.pack_into(self.shared_memory.buf, 0, 0, slots, SLOT_SIZE)
+            CREATED_CHANNELS.add(self.shared_memory.name)
+        elif sys.version_info >= (3, 13):
+            self.shared_memory = shared_memory.SharedMemory(name=name, create=False, track=False)
+        else:
+            self.shared_memory = shared_memory.SharedMemory(name=name, create=False)
+            if self.shared_memory.name not in CREATED_CHANNELS:
+                # Readers must not remove the block when they exit (https://github.com/python/cpython/issues/82300)
+                try:
+                    from multiprocessing import resource_tracker
+                    resource_tracker.unregister(self.shared_memory._name, "shared_memory")
+                except Exception:
+                    pass
+        self.name = self.shared_memory.name
+        self.is_writer = create
+        self.buffer = self.shared_memory.buf
+        _, self.slots, self.slot_size = CHANNEL_HEADER.unpack_from(self.buffer, 0)
+        self.write_sequence: int = CHANNEL_HEADER.unpack_from(self.buffer, 0)[0]
+        self.read_sequence: int = self.write_sequence
+        if read_from_oldest is True:
+            self.read_sequence = max(0, self.write_sequence - self.slots)
+        self.overruns: int = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, error_traceback):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory, the writer also removes it.
+
+        :return: None
+        """
+        self.buffer = None
+        self.shared_memory.close()
+        if self.is_writer is True:
+            self.shared_memory.unlink()
+            CREATED_CHANNELS.discard(self.name)
+
+    def get_available(self) -> int:
+        """
+        Get the amount of records this reader has not read yet.
+
+        :return: int
+        """
+        return CHANNEL_HEADER.unpack_from(self.buffer, 0)[0] - self.read_sequence
+
+    def write(self, unicorn_fied_data) -> int:
+        """
+        Write a unicorn_fied `trade`, `aggTrade`, `bookTicker` or `markPriceUpdate` event into the channel, other
+        events are ignored.
+
+        :param unicorn_fied_data: The unicorn_fied event (dict or pooled record).
+        :type unicorn_fied_data: dict
+
+        :return: int - Amount of written records.
+        """
+        event_type = unicorn_fied_data['event_type']
+        if event_type == 'markPriceUpdate':
+            # Convert and check all items first, an invalid item must not leave the items before it published
+            records = [(item['symbol'].encode(), item['event_time'], float(item['mark_price']),
+                        float(item['index_price']) if 'index_price' in item else float('nan'),
+                        float(item['estimated_settle_price']), float(item['funding_rate']), item['next_funding_time'])
+                       for item in unicorn_fied_data['data']]
+            for values in records:
+                if len(values[0]) > SYMBOL_SIZE:
+                    raise ValueError(f"SharedMemoryChannel.write() - the symbol {values[0]!r} is longer than "
+                                     f"{SYMBOL_SIZE} bytes")
+            for values in records:
+                self.write_record(RECORD_TYPE_IDS['markPriceUpdate'], values)
+            return len(records)
+        record_type_id = RECORD_TYPE_IDS.get(event_type)
+        if record_type_id is None:
+            return 0
+        _, _, field_names = RECORD_LAYOUTS[record_type_id]
+        values = []
+        for field_name in field_names:
+            value = unicorn_fied_data[field_name]
+            if field_name == 'symbol':
+                value = value.encode()
+            elif field_name in PRICE_FIELDS:
+                value = float(value)
+            values.append(value)
+        self.write_record(record_type_id, values)
+        return 1
+
+    def write_record(self, record_type_id: int, values) -> None:
+        """
+        Write the values of a record in the order of its layout in `RECORD_LAYOUTS`.
+
+        :param record_type_id: The id of the record type.
+        :type record_type_id: int
+
+        :param values: The values, `symbol` as bytes.
+        :type values: tuple
+
+        :return: None
+        """
+        if len(values[0]) > SYMBOL_SIZE:
+            raise ValueError(f"SharedMemoryChannel.write_record() - the symbol {values[0]!r} is longer than "
+                             f"{SYMBOL_SIZE} bytes")
+        sequence = self.write_sequence
+        offset = CHANNEL_HEADER.size + (sequence % self.slots) * self.slot_size
+        # Invalidate the slot while it is written, readers detect this by the changed sequence number
+        SLOT_HEADER.pack_into(self.buffer, offset, 0, record_type_id)
+        RECORD_LAYOUTS[record_type_id][1].pack_into(self.buffer, offset + SLOT_HEADER.size, *values)
+        SLOT_HEADER.pack_into(self.buffer, offset, sequence + 1, record_type_id)
+        self.write_sequence = sequence + 1
+        struct.pack_into('<Q', self.buffer, 0, self.write_sequence)
+
+    def read(self, max_records: int = 1000, as_dict: bool = True) -> list:
+        """
+        Read the next records.
+
+        :param max_records: Maximum amount of records to return.
+        :type max_records: int
+
+        :param as_dict: Return dicts with unicorn_fied keys (`event_type`, `symbol`, ...) instead of tuples
+                        `(event_type, values)` with the unpacked struct values in the order of `RECORD_LAYOUTS`.
+        :type as_dict: bool
+
+        :return: list
+        """
+        records = []
+        write_sequence = CHANNEL_HEADER.unpack_from(self.buffer, 0)[0]
+        if write_sequence - self.read_sequence > self.slots:
+            self.overruns += write_sequence - self.read_sequence - self.slots
+            self.read_sequence = write_sequence - self.slots
+        while self.read_sequence < write_sequence and len(records) < max_records:
+            offset = CHANNEL_HEADER.size + (self.read_sequence % self.slots) * self.slot_size
+            sequence, record_type_id = SLOT_HEADER.unpack_from(self.buffer, offset)
+            if sequence != self.read_sequence + 1:
+                # The writer lapped us
+                self.overruns += 1
+                self.read_sequence += 1
+                continue
+            event_type, record_struct, field_names = RECORD_LAYOUTS[record_type_id]
+            values = record_struct.unpack_from(self.buffer, offset + SLOT_HEADER.size)
+            if SLOT_HEADER.unpack_from(self.buffer, offset)[0] != sequence:
+                # Overwritten while reading
+                self.overruns += 1
+                self.read_sequence += 1
+                continue
+            self.read_sequence += 1
+            if as_dict is True:
+                record = {'event_type': event_type}
+                for field_name, value in zip(field_names, values):
+                    record[field_name] = value
+                record['symbol'] = values[0].rstrip(b'\x00').decode()
+                records.append(record)
+            else:
+                records.append((event_type, values))
+        return records
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/spot_account_state.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from decimal import Decimal
+from typing import Optional
+
+
+class SpotAccountState(object):
+    """
+    Per-asset free and locked balances of a spot, margin or isolated margin account, built from the unicorn_fied
+    `outboundAccountInfo`, `outboundAccountPosition` and `balanceUpdate` events of the user data stream.
+
+    `outboundAccountPosition` sets the absolute balances of the assets it lists. A position that is older than the
+    last applied event of an asset (position or `balanceUpdate`) is skipped, it would drop the newer deltas. A
+    `balanceUpdate` adds its delta to `free`, unless a position with the same or a newer `event_time` already
+    contains it. A `balanceUpdate` of an asset without a known position can not be applied to an absolute balance:
+    the asset is kept as unknown with `free` and `locked` set to `None` until the next position. Amounts are kept as
+    `Decimal`, so deltas do not accumulate float errors.
+
+    Use one instance per (sub-)account.
+    """
+    def __init__(self):
+        # asset: [free, locked, position_time, event_time]
+        self.balances: dict = {}
+        self.last_event_time: int = 0
+
+    def apply(self, unicorn_fied_data: dict) -> bool:
+        """
+        Apply a unicorn_fied `outboundAccountInfo`, `outboundAccountPosition` or `balanceUpdate` event, other events
+        are ignored.
+
+        :param unicorn_fied_data: The unicorn_fied event.
+        :type unicorn_fied_data: dict
+
+        :return: bool - True if the state changed
+        """
+        event_type = unicorn_fied_data.get('event_type')
+        changed = False
+        if event_type == 'outboundAccountPosition' or event_type == 'outboundAccountInfo':
+            event_time = unicorn_fied_data['event_time']
+            for item in unicorn_fied_data['balances']:
+                balance = self.balances.get(item['asset'])
+                if balance is not None and event_time < balance[3]:
+                    continue
+                self.balances[item['asset']] = [Decimal(item['free']), Decimal(item['locked']), event_time,
+                                                event_time if balance is None else max(event_time, balance[3])]
+                changed = True
+        elif event_type == 'balanceUpdate':
+            event_time = unicorn_fied_data['event_time']
+            balance = self.balances.get(unicorn_fied_data['asset'])
+            if balance is None:
+                # Unknown until a position with the absolute balance arrives
+                self.balances[unicorn_fied_data['asset']] = [None, None, 0, event_time]
+                changed = True
+            elif balance[0] is None:
+                if event_time > balance[3]:
+                    balance[3] = event_time
+            elif event_time > balance[2]:
+                balance[0] += Decimal(unicorn_fied_data['balance_delta'])
+                if event_time > balance[3]:
+                    balance[3] = event_time
+                changed = True
+        else:
+            return False
+        if unicorn_fied_data['event_time'] > self.last_event_time:
+            self.last_event_time = unicorn_fied_data['event_time']
+        return changed
+
+    def get_balance(self, asset: str) -> Optional[dict]:
+        """
+        Get the balance of an asset, `free` and `locked` are `None` if the asset is unknown (only a `balanceUpdate`
+        without a position was received).
+
+        :param asset: The asset, e.g. `BTC`
+        :type asset: str
+
+        :return: dict or None
+        """
+        balance = self.balances.get(asset)
+        if balance is None:
+            return None
+        return {'asset': asset,
+                'free': balance[0],
+                'locked': balance[1],
+                'event_time': balance[3]}
+
+    def get_balances(self) -> dict:
+        """
+        Get the balances of all assets.
+
+        :return: dict
+        """
+        return {asset: self.get_balance(asset) for asset in self.balances}
+
+    def get_snapshot(self) -> dict:
+        """
+        Get a JSON serializable snapshot of the state for `restore()`.
+
+        :return: dict
+        """
+        return {'last_event_time': self.last_event_time,
+                'balances': {asset: [None if balance[0] is None else str(balance[0]),
+                                     None if balance[1] is None else str(balance[1]), balance[2], balance[3]]
+                             for asset, balance in self.balances.items()}}
+
+    def restore(self, snapshot: dict) -> bool:
+        """
+        Replace the state with a snapshot of `get_snapshot()`.
+
+        :param snapshot: The snapshot.
+        :type snapshot: dict
+
+        :return: bool
+        """
+        self.balances = {asset: [None if balance[0] is None else Decimal(balance[0]),
+                                 None if balance[1] is None else Decimal(balance[1]), balance[2], balance[3]]
+                         for asset, balance in snapshot['balances'].items()}
+        self.last_event_time = snapshot['last_event_time']
+        return True
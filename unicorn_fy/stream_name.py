@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/stream_name.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from collections import namedtuple
+from functools import lru_cache
+
+STREAM_NAME_CACHE_SIZE: int = 4096
+
+# Descriptor of a stream name:
+# - `stream`: the stream name, e.g. `btcusdt@depth20@100ms`
+# - `symbol`: the upper case symbol, e.g. `BTCUSDT`, or None for all market and user data streams
+# - `channel`: e.g. `depth`, `bookTicker`, `aggTrade`, `kline_1m` or `ticker` (for `!ticker@arr`)
+# - `depth_level`: 5, 10 or 20 for partial book depth streams, else False
+# - `update_speed`: the update speed in milliseconds, e.g. 100 for `@100ms` and 1000 for `@1s`, else None
+# - `is_array`: True for `@arr` streams
+StreamName = namedtuple('StreamName', ('stream', 'symbol', 'channel', 'depth_level', 'update_speed', 'is_array'))
+
+
+@lru_cache(maxsize=STREAM_NAME_CACHE_SIZE)
+def parse_stream_name(stream: str) -> StreamName:
+    """
+    Parse the name of a combined stream, the results of the last `STREAM_NAME_CACHE_SIZE` names are cached.
+
+    :param stream: The stream name, e.g. `btcusdt@depth20@100ms`
+    :type stream: str
+
+    :return: StreamName
+    """
+    parts = stream.split('@')
+    if parts[0].startswith('!'):
+        symbol = None
+        channel = parts[0][1:]
+        options = parts[1:]
+    elif len(parts) == 1:
+        # User data streams are named by their listen key
+        symbol = None
+        channel = stream
+        options = []
+    else:
+        symbol = parts[0].upper()
+        channel = parts[1]
+        options = parts[2:]
+    depth_level = False
+    if channel in ('depth5', 'depth10', 'depth20'):
+        depth_level = int(channel[5:])
+        channel = 'depth'
+    update_speed = None
+    is_array = False
+    for option in options:
+        if option == 'arr':
+            is_array = True
+        elif option.endswith('ms') and option[:-2].isdigit():
+            update_speed = int(option[:-2])
+        elif option.endswith('s') and option[:-1].isdigit():
+            update_speed = int(option[:-1]) * 1000
+    return StreamName(stream, symbol, channel, depth_level, update_speed, is_array)
@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/threaded_converter.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from .unicorn_fy import UnicornFy
+from .sharded_converter import ShardedConverter
+from typing import Optional
+import logging
+import os
+import queue
+import sys
+import threading
+import zlib
+
+logger = logging.getLogger("unicorn_fy")
+
+SYNCHRONIZED_HOOKS: tuple = ('top_of_book', 'gap_detector', 'latency_monitor')
+
+
+def is_gil_enabled() -> bool:
+    """
+    Is the GIL enabled in this interpreter?
+
+    On free-threaded builds (Python 3.13t and newer) the GIL is disabled unless an extension without free-threading
+    support or `PYTHON_GIL=1` enabled it again.
+
+    :return: bool
+    """
+    check = getattr(sys, '_is_gil_enabled', None)
+    if check is None:
+        return True
+    return check()
+
+
+class SynchronizedProxy(object):
+    """
+    Serialize all method calls of a converter hook (`TopOfBook`, `SequenceGapDetector`, `LatencyMonitor`, ...) with
+    one lock.
+
+    The hooks expect one writing thread, with a `ThreadedConverter` several threads write into the same hook. Reading
+    from the wrapped object itself is still possible, e.g. `top_of_book.get()` of the original instance.
+
+    :param hook: The object to wrap.
+    :type hook: object
+    """
+    def __init__(self, hook):
+        self.hook = hook
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.hook, name)
+        if not callable(attribute):
+            return attribute
+        lock = self.lock
+
+        def synchronized(*args, **kwargs):
+            with lock:
+                return attribute(*args, **kwargs)
+        return synchronized
+
+
+class ThreadedConverter(object):
+    """
+    Convert raw frames in `threads` worker threads of this process, the order of all frames of a symbol is preserved.
+
+    This is the thread based counterpart of `ShardedConverter`: frames are routed by a CRC32 hash of their symbol to
+    a thread and sent in batches of `batch_size` (call `flush()` to send incomplete batches). The results are read
+    with `get_batch()`. `convert_batch()` converts a list of frames in parallel and returns the results in the order
+    of the input.
+
+    The converters of `UnicornFy` keep no state of their own, the hooks `top_of_book`, `gap_detector` and
+    `latency_monitor` of `converter_kwargs` are wrapped into a `SynchronizedProxy` if more than one thread is used.
+    `record_pool` is passed as it is: its free lists are shared by all threads, records released by a consumer are
+    reused by every worker thread. A record must still only be released once, after its consumer is done with it.
+
+    Threads can only convert in parallel on free-threaded Python builds. With the GIL they add overhead, therefore
+    the default amount of threads is `os.cpu_count()` without the GIL and `1` with it - use `ShardedConverter` to
+    scale on a build with GIL. The scaling on a free-threaded build is not measured yet, run
+    `dev/benchmark_threaded_conversion.py` there before relying on it.
+
+    :param threads: Amount of worker threads.
+    :type threads: int
+
+    :param converter: Name of the converter method of `UnicornFy`, e.g. `binance_com_futures_websocket`
+    :type converter: str
+
+    :param converter_kwargs: Keyword arguments for the converter, e.g. `{'top_of_book': TopOfBook()}`
+    :type converter_kwargs: dict
+
+    :param batch_size: Amount of frames per batch sent to a thread.
+    :type batch_size: int
+    """
+    def __init__(self,
+                 threads: Optional[int] = None,
+                 converter: str = "binance_com_websocket",
+                 converter_kwargs: Optional[dict] = None,
+                 batch_size: int = 100):
+        if threads is None:
+            threads = (os.cpu_count() or 1) if is_gil_enabled() is False else 1
+        self.threads = threads
+        self.batch_size = batch_size
+        self.convert = getattr(UnicornFy, converter)
+        self.converter_kwargs = dict(converter_kwargs) if converter_kwargs is not None else {}
+        if self.threads > 1:
+            for hook_name in SYNCHRONIZED_HOOKS:
+                hook = self.converter_kwargs.get(hook_name)
+                if hook is not None and not isinstance(hook, SynchronizedProxy):
+                    self.converter_kwargs[hook_name] = SynchronizedProxy(hook)
+            if is_gil_enabled():
+                logger.info(f"ThreadedConverter() - the GIL is enabled, {self.threads} threads do not convert in "
+                            f"parallel")
+        self.batches: list = [[] for _ in range(self.threads)]
+        self.input_queues: list = [queue.SimpleQueue() for _ in range(self.threads)]
+        self.output_queue = queue.SimpleQueue()
+        self.received_stop_markers: int = 0
+        self.stopped: bool = False
+        self.workers: list = []
+        for thread_id in range(self.threads):
+            worker = threading.Thread(target=self._worker,
+                                      args=(self.input_queues[thread_id],),
+                                      name=f"UnicornFy-Thread-{thread_id}",
+                                      daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, error_traceback):
+        self.stop()
+
+    def _worker(self, input_queue) -> None:
+        convert = self.convert
+        converter_kwargs = self.converter_kwargs
+        while True:
+            task = input_queue.get()
+            if task is None:
+                self.output_queue.put(None)
+                return
+            batch, positions, results, done_queue = task
+            if positions is None:
+                unicorn_fied_batch = []
+                for stream_data_json in batch:
+                    try:
+                        unicorn_fied_batch.append(convert(stream_data_json, **converter_kwargs))
+                    except Exception as error_msg:
+                        logger.error(f"ThreadedConverter._worker() - Can not convert {stream_data_json} - error: "
+                                     f"{error_msg}")
+                self.output_queue.put(unicorn_fied_batch)
+                continue
+            try:
+                for stream_data_json, position in zip(batch, positions):
+                    try:
+                        results[position] = convert(stream_data_json, **converter_kwargs)
+                    except Exception as error_msg:
+                        logger.error(f"ThreadedConverter._worker() - Can not convert {stream_data_json} - error: "
+                                     f"{error_msg}")
+            finally:
+                done_queue.put(True)
+
+    def get_thread_id(self, stream_data_json: str) -> int:
+        """
+        Get the id of the thread that converts a raw frame.
+
+        :param stream_data_json: The received raw stream data
+        :type stream_data_json: str
+
+        :return: int
+        """
+        return zlib.crc32(ShardedConverter.get_routing_key(stream_data_json).encode()) % self.threads
+
+    def add(self, stream_data_json: str) -> int:
+        """
+        Add a raw frame, it is sent to its thread as soon as the batch is full.
+
+        :param stream_data_json: The received raw stream data
+        :type stream_data_json: str
+
+        :return: int - The thread id
+        """
+        thread_id = self.get_thread_id(stream_data_json)
+        batch = self.batches[thread_id]
+        batch.append(stream_data_json)
+        if len(batch) >= self.batch_size:
+            self.input_queues[thread_id].put((batch, None, None, None))
+            self.batches[thread_id] = []
+        return thread_id
+
+    def convert_batch(self, frames: list) -> list:
+        """
+        Convert a list of raw frames in parallel and wait for the results.
+
+        :param frames: The received raw stream data
+        :type frames: list
+
+        :return: list - The converted frames in the order of `frames`, `None` for frames that can not be converted.
+        """
+        if self.stopped is True:
+            raise RuntimeError("ThreadedConverter.convert_batch() - the converter is stopped")
+        results = [None] * len(frames)
+        batches: list = [[] for _ in range(self.threads)]
+        positions: list = [[] for _ in range(self.threads)]
+        for position, stream_data_json in enumerate(frames):
+            thread_id = self.get_thread_id(stream_data_json)
+            batches[thread_id].append(stream_data_json)
+            positions[thread_id].append(position)
+        done_queue = queue.SimpleQueue()
+        tasks = 0
+        for thread_id in range(self.threads):
+            if batches[thread_id]:
+                self.input_queues[thread_id].put((batches[thread_id], positions[thread_id], results, done_queue))
+                tasks += 1
+        for _ in range(tasks):
+            done_queue.get()
+        return results
+
+    def flush(self) -> None:
+        """
+        Send all incomplete batches to the threads.
+
+        :return: None
+        """
+        for thread_id, batch in enumerate(self.batches):
+            if batch:
+                self.input_queues[thread_id].put((batch, None, None, None))
+                self.batches[thread_id] = []
+
+    def get_batch(self, timeout: Optional[float] = None) -> Optional[list]:
+        """
+        Get the next batch of converted frames.
+
+        :param timeout: Maximum time in seconds to wait, `None` waits forever.
+        :type timeout: float
+
+        :return: list or None if there is nothing to get (timeout or all threads stopped).
+        """
+        while True:
+            try:
+                batch = self.output_queue.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            if batch is not None:
+                return batch
+            # Every thread sends its own stop marker
+            self.received_stop_markers += 1
+            if self.received_stop_markers >= self.threads:
+                return None
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for the worker threads after `stop()`.
+
+        :param timeout: Maximum time in seconds to wait for each thread.
+        :type timeout: float
+
+        :return: None
+        """
+        for worker in self.workers:
+            worker.join(timeout)
+
+    def stop(self) -> None:
+        """
+        Send the remaining frames and ask all threads to stop after converting them.
+
+        The results can be read with `get_batch()` until it returns `None`.
+
+        :return: None
+        """
+        if self.stopped is True:
+            return None
+        self.stopped = True
+        self.flush()
+        for input_queue in self.input_queues:
+            input_queue.put(None)
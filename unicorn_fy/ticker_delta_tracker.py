@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/ticker_delta_tracker.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from typing import Optional
+
+
+class TickerDeltaTracker(object):
+    """
+    Keep the last state of each symbol of `24hrTicker` and `24hrMiniTicker` streams (`!ticker@arr`,
+    `!miniTicker@arr` or single symbol streams) and emit only the symbols and fields that changed.
+
+    Feed the unicorn_fied data of `UnicornFy.binance_com_websocket()` or `UnicornFy.binance_com_futures_websocket()`
+    into `update()`. Use one instance per stream, because ticker and mini ticker records have different fields.
+
+    :param ignore_keys: Fields that are stored, but a change of them alone does not make a symbol count as changed.
+    :type ignore_keys: tuple
+    """
+    ALWAYS_EMITTED_KEYS: tuple = ('stream_type', 'event_type', 'event_time', 'symbol')
+
+    def __init__(self, ignore_keys: tuple = ('event_time', 'statistics_open_time', 'statistics_close_time')):
+        self.ignore_keys = frozenset(ignore_keys).union(self.ALWAYS_EMITTED_KEYS)
+        self.states: dict = {}
+
+    def get_state(self, symbol: str) -> Optional[dict]:
+        """
+        Get the current full state of a symbol.
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: dict or None
+        """
+        return self.states.get(symbol)
+
+    def get_symbols(self) -> list:
+        """
+        Get all symbols with a known state.
+
+        :return: list
+        """
+        return list(self.states)
+
+    def remove_symbol(self, symbol: str) -> bool:
+        """
+        Forget the state of a symbol, its next update is emitted completely.
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: bool
+        """
+        return self.states.pop(symbol, None) is not None
+
+    def reset(self) -> None:
+        """
+        Forget all states.
+
+        :return: None
+        """
+        self.states = {}
+
+    def update(self, unicorn_fied_data: dict) -> dict:
+        """
+        Apply a unicorn_fied `24hrTicker` or `24hrMiniTicker` record and return its delta.
+
+        The delta has the same shape as the input, but `data` contains only symbols that changed and each of them
+        only the changed fields plus `stream_type`, `event_type`, `event_time` and `symbol`. Symbols seen for the
+        first time are emitted completely.
+
+        :param unicorn_fied_data: The unicorn_fied ticker data.
+        :type unicorn_fied_data: dict
+
+        :return: dict
+        """
+        delta = {'stream_type': unicorn_fied_data['stream_type'],
+                 'event_type': unicorn_fied_data['event_type'],
+                 'data': []}
+        for item in unicorn_fied_data['data']:
+            previous_state = self.states.get(item['symbol'])
+            self.states[item['symbol']] = item
+            if previous_state is None:
+                delta['data'].append(item)
+                continue
+            changed_fields = None
+            for key, value in item.items():
+                if key not in self.ignore_keys and previous_state.get(key) != value:
+                    if changed_fields is None:
+                        changed_fields = {key: item[key] for key in self.ALWAYS_EMITTED_KEYS if key in item}
+                    changed_fields[key] = value
+            if changed_fields is not None:
+                delta['data'].append(changed_fields)
+        if 'unicorn_fied' in unicorn_fied_data:
+            delta['unicorn_fied'] = unicorn_fied_data['unicorn_fied']
+        return delta
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# File: unicorn_fy/top_of_book.py
+#
+# Part of ‘UnicornFy’
+# Project website: https://github.com/oliver-zehentleitner/unicorn-fy
+# Github: https://github.com/oliver-zehentleitner/unicorn-fy
+# Documentation: https://oliver-zehentleitner.github.io/unicorn-fy
+# PyPI: https://pypi.org/project/unicorn-fy
+#
+# License: MIT
+# https://github.com/oliver-zehentleitner/unicorn-fy/blob/master/LICENSE
+#
+# Author: Oliver Zehentleitner
+#
+# Copyright (c) 2019-2025, Oliver Zehentleitner (https://about.me/oliver-zehentleitner)
+#
+# All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish, dis-
+# tribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the fol-
+# lowing conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+# OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABIL-
+# ITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT
+# SHALL THE AUTHOR BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+from array import array
+from typing import Optional
+import threading
+
+
+class TopOfBook(object):
+    """
+    Cache of the best bid and ask of all symbols, fed by unicorn_fied `bookTicker` events.
+
+    The values are stored in compact arrays indexed by a symbol id. Updates with an `order_book_update_id` that is not
+    newer than the stored one are discarded. Pass an instance to the `top_of_book` parameter of the websocket
+    converters to update it directly during the conversion of spot and futures `bookTicker` events.
+
+    Symbols are not unique across markets (e.g. `BTCUSDT` on spot and futures) and neither are the update ids, so use
+    one instance per market (exchange), otherwise the quotes of the markets overwrite or discard each other.
+
+    There must be only one writing thread at a time, reading is possible from any thread without a lock: every symbol
+    has a sequence number that is odd while an update is in progress, readers retry until they got a consistent read.
+    """
+    def __init__(self):
+        self.symbol_ids: dict = {}
+        self.symbols: list = []
+        self.sequences = array('q')
+        self.order_book_update_ids = array('q')
+        self.best_bid_prices = array('d')
+        self.best_bid_quantities = array('d')
+        self.best_ask_prices = array('d')
+        self.best_ask_quantities = array('d')
+        self.discarded_updates: int = 0
+        self.symbol_lock = threading.Lock()
+
+    def _add_symbol(self, symbol: str) -> int:
+        with self.symbol_lock:
+            symbol_id = self.symbol_ids.get(symbol)
+            if symbol_id is not None:
+                return symbol_id
+            symbol_id = len(self.symbols)
+            self.sequences.append(0)
+            self.order_book_update_ids.append(-1)
+            self.best_bid_prices.append(0.0)
+            self.best_bid_quantities.append(0.0)
+            self.best_ask_prices.append(0.0)
+            self.best_ask_quantities.append(0.0)
+            self.symbols.append(symbol)
+            # Publish the symbol after the arrays are ready for it
+            self.symbol_ids[symbol] = symbol_id
+            return symbol_id
+
+    def get(self, symbol: str) -> Optional[dict]:
+        """
+        Get the best bid and ask of a symbol.
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: dict or None
+        """
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            return None
+        while True:
+            sequence = self.sequences[symbol_id]
+            if sequence & 1:
+                continue
+            top_of_book = {'symbol': symbol,
+                           'order_book_update_id': self.order_book_update_ids[symbol_id],
+                           'best_bid_price': self.best_bid_prices[symbol_id],
+                           'best_bid_quantity': self.best_bid_quantities[symbol_id],
+                           'best_ask_price': self.best_ask_prices[symbol_id],
+                           'best_ask_quantity': self.best_ask_quantities[symbol_id]}
+            if self.sequences[symbol_id] == sequence:
+                return top_of_book
+
+    def get_symbol_id(self, symbol: str) -> Optional[int]:
+        """
+        Get the id of a symbol, it is the index of the symbol in the arrays of `get_snapshot()`.
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: int or None
+        """
+        return self.symbol_ids.get(symbol)
+
+    def get_snapshot(self) -> dict:
+        """
+        Get a copy of the arrays of all symbols. The values of a symbol are at the index of its symbol id in each
+        array (`array.array`, can be wrapped without copy by `numpy.frombuffer()`).
+
+        The snapshot is taken without blocking the writer, the values of different symbols can therefore be from
+        slightly different moments.
+
+        :return: dict
+        """
+        return {'symbols': list(self.symbols),
+                'order_book_update_ids': array('q', self.order_book_update_ids),
+                'best_bid_prices': array('d', self.best_bid_prices),
+                'best_bid_quantities': array('d', self.best_bid_quantities),
+                'best_ask_prices': array('d', self.best_ask_prices),
+                'best_ask_quantities': array('d', self.best_ask_quantities)}
+
+    def get_spread(self, symbol: str) -> Optional[float]:
+        """
+        Get the difference between best ask and best bid price of a symbol.
+
+        :param symbol: The symbol, e.g. `BTCUSDT`
+        :type symbol: str
+
+        :return: float or None
+        """
+        top_of_book = self.get(symbol)
+        if top_of_book is None:
+            return None
+        return top_of_book['best_ask_price'] - top_of_book['best_bid_price']
+
+    def update(self, unicorn_fied_data) -> bool:
+        """
+        Apply a unicorn_fied `bookTicker` event (dict or `BookTickerRecord`).
+
+        :param unicorn_fied_data: The unicorn_fied `bookTicker` event.
+        :type unicorn_fied_data: dict
+
+        :return: bool - False if the update was stale and got discarded.
+        """
+        return self.update_values(unicorn_fied_data['symbol'],
+                                  unicorn_fied_data['order_book_update_id'],
+                                  unicorn_fied_data['best_bid_price'],
+                                  unicorn_fied_data['best_bid_quantity'],
+                                  unicorn_fied_data['best_ask_price'],
+                                  unicorn_fied_data['best_ask_quantity'])
+
+    def update_values(self, symbol: str, order_book_update_id: int, best_bid_price, best_bid_quantity,
+                      best_ask_price, best_ask_quantity) -> bool:
+        """
+        Apply the values of a `bookTicker` event, prices and quantities can be str or float.
+
+        :return: bool - False if the update was stale and got discarded.
+        """
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._add_symbol(symbol)
+        if order_book_update_id <= self.order_book_update_ids[symbol_id]:
+            self.discarded_updates += 1
+            return False
+        best_bid_price = float(best_bid_price)
+        best_bid_quantity = float(best_bid_quantity)
+        best_ask_price = float(best_ask_price)
+        best_ask_quantity = float(best_ask_quantity)
+        self.sequences[symbol_id] += 1
+        self.order_book_update_ids[symbol_id] = order_book_update_id
+        self.best_bid_prices[symbol_id] = best_bid_price
+        self.best_bid_quantities[symbol_id] = best_bid_quantity
+        self.best_ask_prices[symbol_id] = best_ask_price
+        self.best_ask_quantities[symbol_id] = best_ask_quantity
+        self.sequences[symbol_id] += 1
+        return True
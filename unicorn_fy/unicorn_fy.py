@@ -38,18 +38,125 @@
 # IN THE SOFTWARE.
 
 from typing import Optional
-import cython
 import logging
-import platform
-import requests
+import os
+import sys
+import threading
 import time
 import ujson as json
 
+from .record_pool import BookTickerRecord, MarkPriceArrayRecord, MarkPriceRecord, PooledRecord
+from .record_view import RecordView
+from .stream_name import parse_stream_name
+
 __app_name__: str = "unicorn-fy"
 __version__: str = "0.16.1.dev"
 __logger__: logging.getLogger = logging.getLogger("unicorn_fy")
 logger = __logger__
 
+RELEASE_CHECK_URL: str = "https://api.github.com/repos/oliver-zehentleitner/unicorn-fy/releases/latest"
+RELEASE_CHECK_CACHE_TIME: int = 60 * 60
+# A failed release check is retried after this many seconds, the wait doubles with every further failure up to
+# `RELEASE_CHECK_CACHE_TIME`
+RELEASE_CHECK_RETRY_TIME: int = 60
+
+# Key maps used by the in-place conversion mode: `(renamed_keys, optional_keys, dropped_keys)` per event type. Only
+# the listed keys are touched, `renamed_keys` and the present `optional_keys` get their unicorn_fied name,
+# `dropped_keys` are raw fields the copying path does not return.
+IN_PLACE_TRADE_KEYS: tuple = (('e', 'event_type'), ('E', 'event_time'), ('s', 'symbol'), ('p', 'price'),
+                              ('q', 'quantity'), ('T', 'trade_time'), ('m', 'is_market_maker'))
+IN_PLACE_BOOK_TICKER_KEYS: tuple = (('e', 'event_type'), ('u', 'order_book_update_id'), ('s', 'symbol'),
+                                    ('b', 'best_bid_price'), ('B', 'best_bid_quantity'), ('a', 'best_ask_price'),
+                                    ('A', 'best_ask_quantity'))
+IN_PLACE_KEY_MAPS: dict = {
+    'binance_websocket': {
+        'aggTrade': (IN_PLACE_TRADE_KEYS + (('a', 'aggregate_trade_id'), ('f', 'first_trade_id'),
+                                            ('l', 'last_trade_id'), ('M', 'ignore')), (), ()),
+        'trade': (IN_PLACE_TRADE_KEYS + (('t', 'trade_id'), ('b', 'buyer_order_id'), ('a', 'seller_order_id'),
+                                         ('M', 'ignore')), (), ()),
+        'bookTicker': (IN_PLACE_BOOK_TICKER_KEYS, (), ()),
+        'depthUpdate': ((('e', 'event_type'), ('E', 'event_time'), ('s', 'symbol'), ('U', 'first_update_id_in_event'),
+                         ('u', 'final_update_id_in_event'), ('b', 'bids'), ('a', 'asks')), (), ()),
+    },
+    'binance_futures_websocket': {
+        'aggTrade': (IN_PLACE_TRADE_KEYS + (('a', 'aggregate_trade_id'), ('f', 'first_trade_id'),
+                                            ('l', 'last_trade_id')), (), ('M',)),
+        'bookTicker': (IN_PLACE_BOOK_TICKER_KEYS, (('ps', 'pair'),), ('E', 'T')),
+        'depthUpdate': ((('e', 'event_type'), ('E', 'event_time'), ('T', 'transaction_time'), ('s', 'symbol'),
+                         ('U', 'first_update_id_in_event'), ('u', 'final_update_id_in_event'),
+                         ('pu', 'final_update_id_in_previous_event'), ('a', 'asks'), ('b', 'bids')),
+                        (('ps', 'pair'),), ()),
+    },
+}
+
+# Key maps used by the view conversion mode: `(stream_type, key_map, defaults, data_list)` per event type. The key map
+# holds `unicorn_fied_key: raw_key_path` or a nested key map, `stream_type` is None if the stream name is used.
+# `data_list` events are wrapped in `{'stream_type': ..., 'event_type': ..., 'data': [view]}` like in the copying
+# path.
+VIEW_KLINE_DEFAULTS: dict = {'first_trade_id': False, 'last_trade_id': False}
+VIEW_KEY_MAPS: dict = {
+    'binance_websocket': {
+        'executionReport': ('!userData@arr', {
+            'event_type': ('e',), 'event_time': ('E',), 'symbol': ('s',), 'client_order_id': ('c',),
+            'side': ('S',), 'order_type': ('o',), 'time_in_force': ('f',), 'order_quantity': ('q',),
+            'order_price': ('p',), 'stop_price': ('P',), 'iceberg_quantity': ('F',), 'ignore_g': ('g',),
+            'original_client_order_id': ('C',), 'current_execution_type': ('x',), 'current_order_status': ('X',),
+            'order_reject_reason': ('r',), 'order_id': ('i',), 'last_executed_quantity': ('l',),
+            'cumulative_filled_quantity': ('z',), 'last_executed_price': ('L',), 'commission_amount': ('n',),
+            'commission_asset': ('N',), 'transaction_time': ('T',), 'trade_id': ('t',), 'ignore_I': ('I',),
+            'is_order_working': ('w',), 'is_trade_maker_side': ('m',), 'ignore_M': ('M',),
+            'order_creation_time': ('O',), 'cumulative_quote_asset_transacted_quantity': ('Z',),
+            'last_quote_asset_transacted_quantity': ('Y',)}, None, False),
+        'kline': (None, {
+            'event_type': ('e',), 'event_time': ('E',), 'symbol': ('s',), 'kline': {
+                'kline_start_time': ('k', 't'), 'kline_close_time': ('k', 'T'), 'symbol': ('k', 's'),
+                'interval': ('k', 'i'), 'first_trade_id': ('f',), 'last_trade_id': ('L',), 'open_price': ('k', 'o'),
+                'close_price': ('k', 'c'), 'high_price': ('k', 'h'), 'low_price': ('k', 'l'),
+                'base_volume': ('k', 'v'), 'number_of_trades': ('k', 'n'), 'is_closed': ('k', 'x'),
+                'quote': ('k', 'q'), 'taker_by_base_asset_volume': ('k', 'V'),
+                'taker_by_quote_asset_volume': ('k', 'Q'), 'ignore': ('k', 'B')}}, VIEW_KLINE_DEFAULTS, False),
+        '24hrTicker': (None, {
+            'event_type': ('e',), 'event_time': ('E',), 'symbol': ('s',), 'price_change': ('p',),
+            'price_change_percent': ('P',), 'weighted_average_price': ('w',), 'trade_before_24h_window': ('x',),
+            'last_price': ('c',), 'last_quantity': ('Q',), 'best_bid_price': ('b',), 'best_bid_quantity': ('B',),
+            'best_ask_price': ('a',), 'best_ask_quantity': ('A',), 'open_price': ('o',), 'high_price': ('h',),
+            'low_price': ('l',), 'total_traded_base_asset_volume': ('v',), 'total_traded_quote_asset_volume': ('q',),
+            'statistics_open_time': ('O',), 'statistics_close_time': ('C',), 'first_trade_id': ('F',),
+            'last_trade_id': ('L',), 'total_nr_of_trades': ('n',)}, None, True),
+    },
+    'binance_futures_websocket': {
+        'ORDER_TRADE_UPDATE': ('ORDER_TRADE_UPDATE', {
+            'event_type': ('e',), 'event_time': ('E',), 'symbol': ('o', 's'), 'client_order_id': ('o', 'c'),
+            'side': ('o', 'S'), 'order_type': ('o', 'o'), 'time_in_force': ('o', 'f'),
+            'order_quantity': ('o', 'q'), 'order_price': ('o', 'p'), 'order_avg_price': ('o', 'ap'),
+            'order_stop_price': ('o', 'sp'), 'current_execution_type': ('o', 'x'),
+            'current_order_status': ('o', 'X'), 'order_id': ('o', 'i'), 'last_executed_quantity': ('o', 'l'),
+            'cumulative_filled_quantity': ('o', 'z'), 'last_executed_price': ('o', 'L'),
+            'transaction_time': ('o', 'T'), 'trade_id': ('o', 't'), 'net_pay': ('o', 'b'),
+            'net_selling_order_value': ('o', 'a'), 'is_trade_maker_side': ('o', 'm'), 'reduce_only': ('o', 'R'),
+            'trigger_price_type': ('o', 'wt'), 'order_price_type': ('o', 'ot'), 'position_side': ('o', 'ps'),
+            'order_realized_profit': ('o', 'rp'), 'account_alias': ('i',), 'margin_asset': ('o', 'ma'),
+            'commission_asset': ('o', 'N'), 'commission': ('o', 'n'), 'close_all': ('o', 'cp'),
+            'activation_price': ('o', 'AP'), 'callback_rate': ('o', 'cr')}, None, False),
+        'kline': (None, {
+            'event_type': ('e',), 'event_time': ('E',), 'kline': {
+                'kline_start_time': ('k', 't'), 'kline_close_time': ('k', 'T'), 'interval': ('k', 'i'),
+                'first_trade_id': ('f',), 'last_trade_id': ('L',), 'open_price': ('k', 'o'),
+                'close_price': ('k', 'c'), 'high_price': ('k', 'h'), 'low_price': ('k', 'l'),
+                'base_volume': ('k', 'v'), 'number_of_trades': ('k', 'n'), 'is_closed': ('k', 'x'),
+                'quote': ('k', 'q'), 'taker_by_base_asset_volume': ('k', 'V'),
+                'taker_by_quote_asset_volume': ('k', 'Q'), 'symbol': ('k', 's')}, 'symbol': ('s',)},
+                  VIEW_KLINE_DEFAULTS, False),
+        '24hrTicker': (None, {
+            'event_type': ('e',), 'event_time': ('E',), 'symbol': ('s',), 'price_change': ('p',),
+            'price_change_percent': ('P',), 'weighted_average_price': ('w',), 'last_price': ('c',),
+            'last_quantity': ('Q',), 'open_price': ('o',), 'high_price': ('h',), 'low_price': ('l',),
+            'total_traded_base_asset_volume': ('v',), 'total_traded_quote_asset_volume': ('q',),
+            'statistics_open_time': ('O',), 'statistics_close_time': ('C',), 'first_trade_id': ('F',),
+            'last_trade_id': ('L',), 'total_nr_of_trades': ('n',), 'pair': ('ps',)}, None, True),
+    },
+}
+
 
 class UnicornFy(object):
     """
@@ -64,15 +171,66 @@ class UnicornFy(object):
         - Binance.us
         - trBinance.com
         - Binance.org
+
+    Optional hooks of the websocket converters (keyword arguments, `None`/`False` by default):
+        - `record_pool`: Fill pooled records of `unicorn_fy.RecordPool` instead of creating dicts for `bookTicker`
+          and `markPriceUpdate` events. The records must be released with `record_pool.release()` after use.
+        - `top_of_book`: Update this `unicorn_fy.TopOfBook` cache with converted `bookTicker` events, use one cache
+          per market.
+        - `gap_detector`: Check the continuity of the ids of converted `aggTrade`, `trade` and `depthUpdate` events
+          with this `unicorn_fy.SequenceGapDetector`.
+        - `latency_monitor`: Record the latency of converted events against `event_time` and `transaction_time` in
+          this `unicorn_fy.LatencyMonitor`.
+        - `as_view`: Return a read-only `unicorn_fy.RecordView` of the decoded event for `executionReport`,
+          `ORDER_TRADE_UPDATE`, `kline` and `24hrTicker` events that translates the keys on access instead of
+          copying all fields into a new dict.
+        - `in_place`: Rename the keys of the decoded dict of `aggTrade`, `trade`, `bookTicker` and `depthUpdate`
+          events instead of copying the fields into a new dict (see `unicorn_fy_in_place()`). The result is equal to
+          the copying path, only the order of the keys differs. `record_pool` takes precedence for `bookTicker`.
     """
 
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, disable_release_check=False, release_check_timeout=5.0,
+                 release_check_cache_file=None, release_check_url=RELEASE_CHECK_URL):
+        """
+        :param debug: Log the start of the instance.
+        :type debug: bool
+
+        :param disable_release_check: Never request the latest release, `get_latest_version()` returns "unknown".
+        :type disable_release_check: bool
+
+        :param release_check_timeout: Timeout in seconds of the release check request.
+        :type release_check_timeout: float
+
+        :param release_check_cache_file: File to cache the result of the release check for one hour, by default
+                                         `release_check.json` in the cache directory of the user (see
+                                         `get_cache_dir()`). The result is only kept in memory if the user has no
+                                         cache directory.
+        :type release_check_cache_file: str
+
+        :param release_check_url: URL of the release check.
+        :type release_check_url: str
+        """
         self.last_update_check_github = {'timestamp': time.time(),
                                          'status': {'tag_name': None}}
         self.name = __app_name__
         self.version = __version__
+        self.disable_release_check = disable_release_check
+        self.release_check_timeout = release_check_timeout
+        if release_check_cache_file is None:
+            cache_dir = self.get_cache_dir()
+            if cache_dir is not None:
+                release_check_cache_file = os.path.join(cache_dir, "release_check.json")
+        self.release_check_cache_file: Optional[str] = release_check_cache_file
+        self.release_check_url = release_check_url
+        self.release_check_thread: Optional[threading.Thread] = None
+        self.release_check_lock = threading.Lock()
+        self.release_check_failures: int = 0
+        self.release_check_retry_time: float = 0.0
 
         if debug is True:
+            # Imported on demand to keep `import unicorn_fy` fast
+            import cython
+            import platform
             logger.info(f"New instance of {__app_name__}_{__version__}-{'compiled' if cython.compiled else 'source'} "
                         f"on {str(platform.system())} {str(platform.release())} started ...")
 
@@ -99,35 +257,53 @@ class UnicornFy(object):
         return stream_data_json
 
     @staticmethod
-    def binance_com_websocket(stream_data_json):
+    def binance_com_websocket(stream_data_json, record_pool=None, top_of_book=None, gap_detector=None,
+                              latency_monitor=None, as_view=False, in_place=False):
         """
         unicorn_fy binance.com raw_stream_data
 
+        The hooks `record_pool`, `top_of_book`, `gap_detector`, `latency_monitor`, `as_view` and `in_place` are
+        described in the docstring of `UnicornFy`.
+
         :param stream_data_json: The received raw stream data from the Binance websocket
         :type stream_data_json: json
 
         :return: dict
         """
-        return UnicornFy.binance_websocket(stream_data_json, exchange="binance.com", show_deprecated_warning=False)
+        return UnicornFy.binance_websocket(stream_data_json, exchange="binance.com", show_deprecated_warning=False,
+                                           record_pool=record_pool, top_of_book=top_of_book,
+                                           gap_detector=gap_detector, latency_monitor=latency_monitor,
+                                           as_view=as_view, in_place=in_place)
 
     @staticmethod
-    def binance_com_margin_websocket(stream_data_json):
+    def binance_com_margin_websocket(stream_data_json, record_pool=None, top_of_book=None,
+                                     gap_detector=None, latency_monitor=None, as_view=False, in_place=False):
         """
         unicorn_fy binance.com-margin raw_stream_data
 
+        The hooks `record_pool`, `top_of_book`, `gap_detector`, `latency_monitor`, `as_view` and `in_place` are
+        described in the docstring of `UnicornFy`.
+
         :param stream_data_json: The received raw stream data from the Binance websocket
         :type stream_data_json: json
 
         :return: dict
         """
         return UnicornFy.binance_websocket(stream_data_json, exchange="binance.com-margin",
-                                           show_deprecated_warning=False)
+                                           show_deprecated_warning=False,
+                                           record_pool=record_pool, top_of_book=top_of_book,
+                                           gap_detector=gap_detector, latency_monitor=latency_monitor,
+                                           as_view=as_view, in_place=in_place)
 
     @staticmethod
-    def binance_com_isolated_margin_websocket(stream_data_json):
+    def binance_com_isolated_margin_websocket(stream_data_json, record_pool=None, top_of_book=None,
+                                              gap_detector=None, latency_monitor=None, as_view=False, in_place=False):
         """
         unicorn_fy binance.com-isolated_margin raw_stream_data
 
+        The hooks `record_pool`, `top_of_book`, `gap_detector`, `latency_monitor`, `as_view` and `in_place` are
+        described in the docstring of `UnicornFy`.
+
         :param stream_data_json: The received raw stream data from the Binance websocket
         :type stream_data_json: json
 
@@ -135,13 +311,20 @@ class UnicornFy(object):
         """
         return UnicornFy.binance_websocket(stream_data_json,
                                            exchange="binance.com-isolated_margin",
-                                           show_deprecated_warning=False)
+                                           show_deprecated_warning=False,
+                                           record_pool=record_pool, top_of_book=top_of_book,
+                                           gap_detector=gap_detector, latency_monitor=latency_monitor,
+                                           as_view=as_view, in_place=in_place)
 
     @staticmethod
-    def binance_com_futures_websocket(stream_data_json):
+    def binance_com_futures_websocket(stream_data_json, record_pool=None, top_of_book=None,
+                                      gap_detector=None, latency_monitor=None, as_view=False, in_place=False):
         """
         unicorn_fy binance.com-futures raw_stream_data
 
+        The hooks `record_pool`, `top_of_book`, `gap_detector`, `latency_monitor`, `as_view` and `in_place` are
+        described in the docstring of `UnicornFy`.
+
         :param stream_data_json: The received raw stream data from the Binance websocket
         :type stream_data_json: json
 
@@ -149,13 +332,20 @@ class UnicornFy(object):
         """
         return UnicornFy.binance_futures_websocket(stream_data_json,
                                                    exchange="binance.com-futures",
-                                                   show_deprecated_warning=False)
+                                                   show_deprecated_warning=False,
+                                                   record_pool=record_pool, top_of_book=top_of_book,
+                                                   gap_detector=gap_detector, latency_monitor=latency_monitor,
+                                                   as_view=as_view, in_place=in_place)
 
     @staticmethod
-    def binance_com_coin_futures_websocket(stream_data_json):
+    def binance_com_coin_futures_websocket(stream_data_json, record_pool=None, top_of_book=None,
+                                           gap_detector=None, latency_monitor=None, as_view=False, in_place=False):
         """
         unicorn_fy binance.com-coin_futures raw_stream_data
 
+        The hooks `record_pool`, `top_of_book`, `gap_detector`, `latency_monitor`, `as_view` and `in_place` are
+        described in the docstring of `UnicornFy`.
+
         :param stream_data_json: The received raw stream data from the Binance websocket
         :type stream_data_json: json
 
@@ -163,37 +353,59 @@ class UnicornFy(object):
         """
         return UnicornFy.binance_futures_websocket(stream_data_json,
                                                    exchange="binance.com-coin_futures",
-                                                   show_deprecated_warning=False)
+                                                   show_deprecated_warning=False,
+                                                   record_pool=record_pool, top_of_book=top_of_book,
+                                                   gap_detector=gap_detector, latency_monitor=latency_monitor,
+                                                   as_view=as_view, in_place=in_place)
 
     @staticmethod
-    def binance_us_websocket(stream_data_json):
+    def binance_us_websocket(stream_data_json, record_pool=None, top_of_book=None, gap_detector=None,
+                             latency_monitor=None, as_view=False, in_place=False):
         """
         unicorn_fy binance.us (US) raw_stream_data
 
+        The hooks `record_pool`, `top_of_book`, `gap_detector`, `latency_monitor`, `as_view` and `in_place` are
+        described in the docstring of `UnicornFy`.
+
         :param stream_data_json: The received raw stream data from the Binance websocket
         :type stream_data_json: json
 
         :return: dict
         """
-        return UnicornFy.binance_websocket(stream_data_json, exchange="binance.us", show_deprecated_warning=False)
+        return UnicornFy.binance_websocket(stream_data_json, exchange="binance.us", show_deprecated_warning=False,
+                                           record_pool=record_pool, top_of_book=top_of_book,
+                                           gap_detector=gap_detector, latency_monitor=latency_monitor,
+                                           as_view=as_view, in_place=in_place)
 
     @staticmethod
-    def trbinance_com_websocket(stream_data_json):
+    def trbinance_com_websocket(stream_data_json, record_pool=None, top_of_book=None,
+                                gap_detector=None, latency_monitor=None, as_view=False, in_place=False):
         """
         unicorn_fy trbinance.com (TR) raw_stream_data
 
+        The hooks `record_pool`, `top_of_book`, `gap_detector`, `latency_monitor`, `as_view` and `in_place` are
+        described in the docstring of `UnicornFy`.
+
         :param stream_data_json: The received raw stream data from the Binance websocket
         :type stream_data_json: json
 
         :return: dict
         """
-        return UnicornFy.binance_websocket(stream_data_json, exchange="trbinance.com", show_deprecated_warning=False)
+        return UnicornFy.binance_websocket(stream_data_json, exchange="trbinance.com", show_deprecated_warning=False,
+                                           record_pool=record_pool, top_of_book=top_of_book,
+                                           gap_detector=gap_detector, latency_monitor=latency_monitor,
+                                           as_view=as_view, in_place=in_place)
 
     @staticmethod
-    def binance_websocket(stream_data_json, exchange="binance", show_deprecated_warning=True):
+    def binance_websocket(stream_data_json, exchange="binance", show_deprecated_warning=True,
+                          record_pool=None, top_of_book=None, gap_detector=None, latency_monitor=None,
+                          as_view=False, in_place=False):
         """
         unicorn_fy binance.com raw_stream_data
 
+        The hooks `record_pool`, `top_of_book`, `gap_detector`, `latency_monitor`, `as_view` and `in_place` are
+        described in the docstring of `UnicornFy`.
+
         :param stream_data_json: The received raw stream data from the Binance websocket
         :type stream_data_json: json
 
@@ -228,14 +440,16 @@ class UnicornFy(object):
             pass
 
         try:
-            if "!ticker@arr" in stream_data['stream']:
+            stream_name = parse_stream_name(stream_data['stream'])
+        except KeyError:
+            stream_name = None
+        if stream_name is not None and stream_name.is_array is True and stream_name.symbol is None:
+            if stream_name.channel == 'ticker':
                 stream_data = {'data': {'e': "24hrTicker"},
                                'items': stream_data['data']}
-            elif "!miniTicker@arr" in stream_data['stream']:
+            elif stream_name.channel == 'miniTicker':
                 stream_data = {'data': {'e': "24hrMiniTicker"},
                                'items': stream_data['data']}
-        except KeyError:
-            pass
 
         try:
             if stream_data['e'] == 'outboundAccountInfo':
@@ -251,16 +465,12 @@ class UnicornFy(object):
         except KeyError:
             pass
         try:
-            if stream_data['stream'].find('@depth5') != -1:
-                stream_data['data']['e'] = "depth"
-                stream_data['data']['depth_level'] = 5
-            elif stream_data['stream'].find('@depth10') != -1:
+            if 'stream' not in stream_data:
+                pass
+            elif stream_name.depth_level:
                 stream_data['data']['e'] = "depth"
-                stream_data['data']['depth_level'] = 10
-            elif stream_data['stream'].find('@depth20') != -1:
-                stream_data['data']['e'] = "depth"
-                stream_data['data']['depth_level'] = 20
-            elif "@bookTicker" in stream_data['stream']:
+                stream_data['data']['depth_level'] = stream_name.depth_level
+            elif stream_name.channel == 'bookTicker' and stream_name.symbol is not None:
                 stream_data['data']['e'] = "bookTicker"
         except KeyError:
             pass
@@ -295,7 +505,17 @@ class UnicornFy(object):
         except KeyError:
             pass
 
-        if stream_data['data']['e'] == 'aggTrade':
+        if as_view is True and stream_data['data']['e'] in VIEW_KEY_MAPS['binance_websocket'] and \
+                'items' not in stream_data:
+            unicorn_fied_data = UnicornFy.unicorn_fy_view(stream_data,
+                                                          key_maps=VIEW_KEY_MAPS['binance_websocket'],
+                                                          exchange=exchange)
+        elif in_place is True and stream_data['data']['e'] in IN_PLACE_KEY_MAPS['binance_websocket'] and \
+                (record_pool is None or stream_data['data']['e'] != 'bookTicker'):
+            unicorn_fied_data = UnicornFy.unicorn_fy_in_place(stream_data['data'],
+                                                              stream_type=stream_data['stream'],
+                                                              key_maps=IN_PLACE_KEY_MAPS['binance_websocket'])
+        elif stream_data['data']['e'] == 'aggTrade':
             unicorn_fied_data = {'stream_type': stream_data['stream'],
                                  'event_type': stream_data['data']['e'],
                                  'event_time': stream_data['data']['E'],
@@ -339,6 +559,16 @@ class UnicornFy(object):
                                  'trade_time': stream_data['data']['T'],
                                  'is_market_maker': stream_data['data']['m'],
                                  'ignore': stream_data['data']['M']}
+        elif stream_data['data']['e'] == 'bookTicker' and record_pool is not None:
+            unicorn_fied_data = record_pool.acquire(BookTickerRecord)
+            unicorn_fied_data.stream_type = stream_data['stream']
+            unicorn_fied_data.order_book_update_id = stream_data['data']['u']
+            unicorn_fied_data.symbol = stream_data['data']['s']
+            unicorn_fied_data.best_bid_price = stream_data['data']['b']
+            unicorn_fied_data.best_bid_quantity = stream_data['data']['B']
+            unicorn_fied_data.best_ask_price = stream_data['data']['a']
+            unicorn_fied_data.best_ask_quantity = stream_data['data']['A']
+            unicorn_fied_data.event_type = stream_data['data']['e']
         elif stream_data['data']['e'] == 'bookTicker':
             unicorn_fied_data = {'stream_type': stream_data['stream'],
                                  'order_book_update_id': stream_data['data']['u'],
@@ -477,7 +707,7 @@ class UnicornFy(object):
         elif stream_data['data']['e'] == 'depth':
             unicorn_fied_data = {'stream_type': stream_data['stream'],
                                  'event_type': stream_data['data']['e'],
-                                 'symbol': stream_data['stream'][:stream_data['stream'].find('@')].upper(),
+                                 'symbol': parse_stream_name(stream_data['stream']).symbol,
                                  'last_update_id': stream_data['data']['lastUpdateId'],
                                  'bids': stream_data['data']['bids'],
                                  'asks': stream_data['data']['asks']}
@@ -559,16 +789,33 @@ class UnicornFy(object):
                                  'order_creation_time': stream_data['data']['O'],
                                  'cumulative_quote_asset_transacted_quantity': stream_data['data']['Z'],
                                  'last_quote_asset_transacted_quantity': stream_data['data']['Y']}
-        unicorn_fied_version = [exchange, UnicornFy.get_version()]
-        unicorn_fied_data['unicorn_fied'] = unicorn_fied_version
-        logger.debug("UnicornFy->binance_com_futures_websocket(" + str(unicorn_fied_data) + ")")
+        try:
+            if isinstance(unicorn_fied_data, PooledRecord):
+                unicorn_fied_data.unicorn_fied = record_pool.get_unicorn_fied(exchange, UnicornFy.get_version())
+            elif type(unicorn_fied_data) is not RecordView:
+                unicorn_fied_data['unicorn_fied'] = [exchange, UnicornFy.get_version()]
+        except TypeError as error_msg:
+            logger.critical(f"UnicornFy->binance_websocket({str(unicorn_fied_data)}) - "
+                            f"error: {str(error_msg)} - Variable: {stream_data['data']}")
+        if top_of_book is not None and unicorn_fied_data and unicorn_fied_data['event_type'] == 'bookTicker':
+            top_of_book.update(unicorn_fied_data)
+        if gap_detector is not None and unicorn_fied_data:
+            gap_detector.check(unicorn_fied_data)
+        if latency_monitor is not None and unicorn_fied_data:
+            latency_monitor.record(unicorn_fied_data)
+        logger.debug("UnicornFy->binance_com_futures_websocket(%s)", unicorn_fied_data)
         return unicorn_fied_data
 
     @staticmethod
-    def binance_futures_websocket(stream_data_json, exchange="binance.com-futures", show_deprecated_warning=False):
+    def binance_futures_websocket(stream_data_json, exchange="binance.com-futures", show_deprecated_warning=False,
+                                  record_pool=None, top_of_book=None, gap_detector=None,
+                                  latency_monitor=None, as_view=False, in_place=False):
         """
         unicorn_fy binance.com-futures raw_stream_data
 
+        The hooks `record_pool`, `top_of_book`, `gap_detector`, `latency_monitor`, `as_view` and `in_place` are
+        described in the docstring of `UnicornFy`.
+
         :param stream_data_json: The received raw stream data from the Binance websocket
         :type stream_data_json: json
 
@@ -601,17 +848,19 @@ class UnicornFy(object):
             pass
 
         try:
-            if "!ticker@arr" in stream_data['stream']:
+            stream_name = parse_stream_name(stream_data['stream'])
+        except KeyError:
+            stream_name = None
+        if stream_name is not None and stream_name.is_array is True and stream_name.symbol is None:
+            if stream_name.channel == 'ticker':
                 stream_data = {'data': {'e': "24hrTicker"},
                                'items': stream_data['data']}
-            elif "!miniTicker@arr" in stream_data['stream']:
+            elif stream_name.channel == 'miniTicker':
                 stream_data = {'data': {'e': "24hrMiniTicker"},
                                'items': stream_data['data']}
-            elif "!markPriceUpdate@arr" in stream_data['stream']:
+            elif stream_name.channel == 'markPriceUpdate':
                 stream_data = {'data': {'e': "markPriceUpdate"},
                                'items': stream_data['data']}
-        except KeyError:
-            pass
 
         try:
             if stream_data['e'] in ['bookTicker',
@@ -625,13 +874,11 @@ class UnicornFy(object):
         except KeyError:
             pass
         try:
-            if stream_data['stream'].find('@depth5') != -1:
-                stream_data['data']['depth_level'] = 5
-            elif stream_data['stream'].find('@depth10') != -1:
-                stream_data['data']['depth_level'] = 10
-            elif stream_data['stream'].find('@depth20') != -1:
-                stream_data['data']['depth_level'] = 20
-            elif "@bookTicker" in stream_data['stream']:
+            if 'stream' not in stream_data:
+                pass
+            elif stream_name.depth_level:
+                stream_data['data']['depth_level'] = stream_name.depth_level
+            elif stream_name.channel == 'bookTicker' and stream_name.symbol is not None:
                 stream_data['data']['e'] = "bookTicker"
         except KeyError:
             pass
@@ -667,7 +914,22 @@ class UnicornFy(object):
             pass
 
         try:
-            if stream_data['data']['e'] == 'aggTrade':
+            if as_view is True and stream_data['data']['e'] in VIEW_KEY_MAPS['binance_futures_websocket'] and \
+                    'items' not in stream_data:
+                unicorn_fied_data = UnicornFy.unicorn_fy_view(stream_data,
+                                                              key_maps=VIEW_KEY_MAPS['binance_futures_websocket'],
+                                                              exchange=exchange)
+            elif in_place is True and stream_data['data']['e'] in IN_PLACE_KEY_MAPS['binance_futures_websocket'] and \
+                    (record_pool is None or stream_data['data']['e'] != 'bookTicker'):
+                if stream_data['data']['e'] == 'bookTicker':
+                    stream_type = 'bookTicker'
+                else:
+                    stream_type = stream_data['stream']
+                if stream_data['data']['e'] == 'depthUpdate':
+                    stream_data['data'] = UnicornFy.set_to_false_if_not_exist(stream_data['data'], 'depth_level')
+                unicorn_fied_data = UnicornFy.unicorn_fy_in_place(stream_data['data'], stream_type,
+                                                                  IN_PLACE_KEY_MAPS['binance_futures_websocket'])
+            elif stream_data['data']['e'] == 'aggTrade':
                 unicorn_fied_data = {'stream_type': stream_data['stream'],
                                      'event_type': stream_data['data']['e'],
                                      'event_time': stream_data['data']['E'],
@@ -723,6 +985,18 @@ class UnicornFy(object):
 
                 if stream_data['data']['e'] == 'markPrice_kline':
                     unicorn_fied_data['kline']['symbol'] = stream_data['data']['k']['s']
+            elif stream_data['data']['e'] == 'bookTicker' and record_pool is not None:
+                unicorn_fied_data = record_pool.acquire(BookTickerRecord)
+                unicorn_fied_data.stream_type = 'bookTicker'
+                unicorn_fied_data.order_book_update_id = stream_data['data']['u']
+                unicorn_fied_data.symbol = stream_data['data']['s']
+                unicorn_fied_data.best_bid_price = stream_data['data']['b']
+                unicorn_fied_data.best_bid_quantity = stream_data['data']['B']
+                unicorn_fied_data.best_ask_price = stream_data['data']['a']
+                unicorn_fied_data.best_ask_quantity = stream_data['data']['A']
+                unicorn_fied_data.event_type = stream_data['data']['e']
+                if 'ps' in stream_data['data']:
+                    unicorn_fied_data.pair = stream_data['data']['ps']
             elif stream_data['data']['e'] == 'bookTicker':
                 unicorn_fied_data = {'stream_type': 'bookTicker',
                                      'order_book_update_id': stream_data['data']['u'],
@@ -764,35 +1038,56 @@ class UnicornFy(object):
                         pass
                 except KeyError:
                     stream_data['stream'] = '!markPrice@arr'
-                unicorn_fied_data = {'stream_type': stream_data['stream'],
-                                     'event_type': stream_data['data']['e'],
-                                     'data': []}
-
-                try:
-                    for item in stream_data['items']:
-                        data = {'stream_type': stream_data['stream'],
-                                'event_type': item['e'],
-                                'event_time': item['E'],
-                                'symbol': item['s'],
-                                'mark_price': item['p'],
-                                'estimated_settle_price': item['P'],
-                                'funding_rate': item['r'],
-                                'next_funding_time': item['T']}
+                if record_pool is not None:
+                    unicorn_fied_data = record_pool.acquire(MarkPriceArrayRecord)
+                    unicorn_fied_data.stream_type = stream_data['stream']
+                    unicorn_fied_data.event_type = stream_data['data']['e']
+                    try:
+                        items = stream_data['items']
+                    except KeyError:
+                        items = (stream_data['data'],)
+                    for item in items:
+                        data = record_pool.acquire(MarkPriceRecord)
+                        data.stream_type = stream_data['stream']
+                        data.event_type = item['e']
+                        data.event_time = item['E']
+                        data.symbol = item['s']
+                        data.mark_price = item['p']
+                        data.estimated_settle_price = item['P']
+                        data.funding_rate = item['r']
+                        data.next_funding_time = item['T']
                         if 'i' in item:
-                            data['index_price'] = item['i']
+                            data.index_price = item['i']
+                        unicorn_fied_data.data.append(data)
+                else:
+                    unicorn_fied_data = {'stream_type': stream_data['stream'],
+                                         'event_type': stream_data['data']['e'],
+                                         'data': []}
+                    try:
+                        for item in stream_data['items']:
+                            data = {'stream_type': stream_data['stream'],
+                                    'event_type': item['e'],
+                                    'event_time': item['E'],
+                                    'symbol': item['s'],
+                                    'mark_price': item['p'],
+                                    'estimated_settle_price': item['P'],
+                                    'funding_rate': item['r'],
+                                    'next_funding_time': item['T']}
+                            if 'i' in item:
+                                data['index_price'] = item['i']
+                            unicorn_fied_data['data'].append(data)
+                    except KeyError:
+                        data = {'stream_type': stream_data['stream'],
+                                'event_type': stream_data['data']['e'],
+                                'event_time': stream_data['data']['E'],
+                                'symbol': stream_data['data']['s'],
+                                'mark_price': stream_data['data']['p'],
+                                'estimated_settle_price': stream_data['data']['P'],
+                                'funding_rate': stream_data['data']['r'],
+                                'next_funding_time': stream_data['data']['T']}
+                        if 'i' in stream_data['data']:
+                            data['index_price'] = stream_data['data']['i']
                         unicorn_fied_data['data'].append(data)
-                except KeyError:
-                    data = {'stream_type': stream_data['stream'],
-                            'event_type': stream_data['data']['e'],
-                            'event_time': stream_data['data']['E'],
-                            'symbol': stream_data['data']['s'],
-                            'mark_price': stream_data['data']['p'],
-                            'estimated_settle_price': stream_data['data']['P'],
-                            'funding_rate': stream_data['data']['r'],
-                            'next_funding_time': stream_data['data']['T']}
-                    if 'i' in stream_data['data']:
-                        data['index_price'] = stream_data['data']['i']
-                    unicorn_fied_data['data'].append(data)
             elif stream_data['data']['e'] == 'forceOrder':
                 '''
                     url: https://binance-docs.github.io/apidocs/futures/en/#liquidation-order-streams
@@ -1244,45 +1539,147 @@ class UnicornFy(object):
         except KeyError as error_msg:
             logger.critical(f"UnicornFy->binance_futures_websocket({str(unicorn_fied_data)}) - "
                             f"error: {str(error_msg)} - Variable: {stream_data['data']}")
-        unicorn_fied_version = [exchange, UnicornFy.get_version()]
         try:
-            unicorn_fied_data['unicorn_fied'] = unicorn_fied_version
+            if isinstance(unicorn_fied_data, PooledRecord):
+                unicorn_fied_data.unicorn_fied = record_pool.get_unicorn_fied(exchange, UnicornFy.get_version())
+            elif type(unicorn_fied_data) is not RecordView:
+                unicorn_fied_data['unicorn_fied'] = [exchange, UnicornFy.get_version()]
         except TypeError as error_msg:
             logger.critical(f"UnicornFy->binance_futures_websocket({str(unicorn_fied_data)}) - "
                             f"error: {str(error_msg)} - Variable: {stream_data['data']}")
-        logger.debug("UnicornFy->binance_futures_websocket(" + str(unicorn_fied_data) + ")")
+        if top_of_book is not None and unicorn_fied_data and unicorn_fied_data['event_type'] == 'bookTicker':
+            top_of_book.update(unicorn_fied_data)
+        if gap_detector is not None and unicorn_fied_data:
+            gap_detector.check(unicorn_fied_data)
+        if latency_monitor is not None and unicorn_fied_data:
+            latency_monitor.record(unicorn_fied_data)
+        logger.debug("UnicornFy->binance_futures_websocket(%s)", unicorn_fied_data)
         return unicorn_fied_data
 
     @staticmethod
-    def get_latest_release_info():
+    def get_latest_release_info(url=RELEASE_CHECK_URL, timeout=5.0):
         """
         Get infos about the latest available release
 
+        :param url: URL of the GitHub API endpoint of the latest release.
+        :type url: str
+
+        :param timeout: Timeout of the request in seconds.
+        :type timeout: float
+
         :return: dict or False
         """
         try:
-            respond = requests.get('https://api.github.com/repos/oliver-zehentleitner/unicorn-fy/releases/latest')
+            # Imported on demand to keep `import unicorn_fy` fast
+            import requests
+            respond = requests.get(url, timeout=timeout)
             return respond.json()
         except Exception:
             return False
 
-    def get_latest_version(self) -> Optional[str]:
+    def _release_check(self) -> None:
+        status = self.get_latest_release_info(url=self.release_check_url, timeout=self.release_check_timeout)
+        if not status or not status.get('tag_name'):
+            # Remember the failure, `get_latest_version()` does not start a new request before the retry time
+            self.release_check_failures += 1
+            self.release_check_retry_time = time.time() + min(RELEASE_CHECK_RETRY_TIME *
+                                                              2 ** (self.release_check_failures - 1),
+                                                              RELEASE_CHECK_CACHE_TIME)
+            logger.debug(f"UnicornFy->_release_check() - no release info from {self.release_check_url}, retry in "
+                         f"{self.release_check_retry_time - time.time():.0f} seconds")
+            return None
+        self.release_check_failures = 0
+        self.release_check_retry_time = 0.0
+        # Build the result first and publish it with one assignment, readers never see a half updated check
+        last_update_check_github = {'timestamp': time.time(),
+                                    'status': status}
+        self.last_update_check_github = last_update_check_github
+        if self.release_check_cache_file is None:
+            return None
+        try:
+            cache_dir = os.path.dirname(self.release_check_cache_file)
+            if cache_dir:
+                os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            temp_file = f"{self.release_check_cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_file, "w") as file:
+                file.write(json.dumps({'timestamp': last_update_check_github['timestamp'],
+                                       'tag_name': status['tag_name']}))
+            os.replace(temp_file, self.release_check_cache_file)
+        except OSError as error_msg:
+            logger.debug(f"UnicornFy->_release_check() - can not write {self.release_check_cache_file}: "
+                         f"{error_msg}")
+
+    def _load_release_check_cache(self) -> bool:
+        if self.release_check_cache_file is None:
+            return False
+        try:
+            with open(self.release_check_cache_file, "r") as file:
+                cache = json.loads(file.read())
+            if cache['timestamp'] + RELEASE_CHECK_CACHE_TIME < time.time() or not cache['tag_name']:
+                return False
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        self.last_update_check_github = {'timestamp': cache['timestamp'],
+                                         'status': {'tag_name': cache['tag_name']}}
+        return True
+
+    @staticmethod
+    def get_cache_dir() -> Optional[str]:
+        """
+        Get the cache directory of the current user
+
+        `%LOCALAPPDATA%\\unicorn_fy` on Windows, `~/Library/Caches/unicorn_fy` on macOS and
+        `$XDG_CACHE_HOME/unicorn_fy` or `~/.cache/unicorn_fy` on other systems. The directory is not created.
+
+        :return: str or None if the user has no home directory
+        """
+        if sys.platform == "win32":
+            base_dir = os.environ.get("LOCALAPPDATA") or os.path.expanduser(os.path.join("~", "AppData", "Local"))
+        elif sys.platform == "darwin":
+            base_dir = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+        else:
+            base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache"))
+        if base_dir.startswith("~") or not os.path.isabs(base_dir):
+            return None
+        return os.path.join(base_dir, "unicorn_fy")
+
+    def get_latest_version(self, timeout: Optional[float] = None) -> Optional[str]:
         """
         Get the version of the latest available release (cache time 1 hour)
 
-        :return: str or False
+        The release is requested in a background thread and the result is cached in `release_check_cache_file`.
+        Until the result is available "unknown" is returned. After a failed request no new request is started for
+        `RELEASE_CHECK_RETRY_TIME` seconds, the wait doubles with every further failure up to one hour.
+
+        :param timeout: Seconds to wait for a running release check, by default it does not wait.
+        :type timeout: float
+
+        :return: str
         """
-        # Do a fresh request if status is None or last timestamp is older 1 hour
-        if self.last_update_check_github['status']['tag_name'] is None or \
-                (self.last_update_check_github['timestamp'] + (60 * 60) < time.time()):
-            self.last_update_check_github['status'] = self.get_latest_release_info()
-        if self.last_update_check_github['status']:
-            try:
-                return self.last_update_check_github['status']['tag_name']
-            except KeyError:
-                return "unknown"
-        else:
+        if self.disable_release_check is True:
             return "unknown"
+        # Read the check once, status and timestamp must belong to the same result
+        last_update_check_github = self.last_update_check_github
+        status = last_update_check_github['status']
+        if status and status.get('tag_name') is not None and \
+                last_update_check_github['timestamp'] + RELEASE_CHECK_CACHE_TIME >= time.time():
+            return status['tag_name']
+        if self._load_release_check_cache():
+            return self.last_update_check_github['status']['tag_name']
+        with self.release_check_lock:
+            if (self.release_check_thread is None or not self.release_check_thread.is_alive()) and \
+                    self.release_check_retry_time <= time.time():
+                self.release_check_thread = threading.Thread(target=self._release_check,
+                                                             name="unicorn_fy_release_check",
+                                                             daemon=True)
+                self.release_check_thread.start()
+            release_check_thread = self.release_check_thread
+        if timeout and release_check_thread is not None:
+            release_check_thread.join(timeout)
+        status = self.last_update_check_github['status']
+        if status and status.get('tag_name') is not None:
+            return status['tag_name']
+        return "unknown"
 
     @staticmethod
     def get_version():
@@ -1312,14 +1709,17 @@ class UnicornFy(object):
             return False
         return True
 
-    def is_update_available(self):
+    def is_update_available(self, timeout: Optional[float] = None):
         """
         Is a new release of this package available?
 
+        :param timeout: Seconds to wait for a running release check, by default it does not wait.
+        :type timeout: float
+
         :return: bool
         """
         installed_version = self.get_version()
-        latest_version = self.get_latest_version()
+        latest_version = self.get_latest_version(timeout=timeout)
         if ".dev" in installed_version:
             installed_version = installed_version[:-4]
         if latest_version == installed_version:
@@ -1329,6 +1729,65 @@ class UnicornFy(object):
         else:
             return True
 
+    @staticmethod
+    def unicorn_fy_in_place(data, stream_type, key_maps):
+        """
+        Turn a decoded event dict into the unicorn_fied shape by renaming its keys, no second dict is created.
+
+        The result is equal to the one of the copying path but `stream_type` comes last, the caller adds
+        `unicorn_fied`. Raw fields that are not listed in the key map are kept under their raw name.
+
+        Renaming a key is a delete and an insert in the same dict, on CPython this is not measurably faster than the
+        copying path and the copy is freed by reference counting anyway (see `dev/benchmark_conversion.py`).
+
+        :param data: The decoded event (the `data` part of a combined stream payload)
+        :type data: dict
+
+        :param stream_type: The value for the `stream_type` field
+        :type stream_type: str
+
+        :param key_maps: Key maps per event type, see `IN_PLACE_KEY_MAPS`
+        :type key_maps: dict
+
+        :return: dict
+        """
+        renamed_keys, optional_keys, dropped_keys = key_maps[data['e']]
+        for raw_key, unicorn_fied_key in renamed_keys:
+            data[unicorn_fied_key] = data.pop(raw_key)
+        for raw_key, unicorn_fied_key in optional_keys:
+            if raw_key in data:
+                data[unicorn_fied_key] = data.pop(raw_key)
+        for raw_key in dropped_keys:
+            data.pop(raw_key, None)
+        data['stream_type'] = stream_type
+        return data
+
+    @staticmethod
+    def unicorn_fy_view(stream_data, key_maps, exchange):
+        """
+        Create a `RecordView` of a decoded event with the unicorn_fied keys.
+
+        :param stream_data: The decoded payload with the event in `data`
+        :type stream_data: dict
+
+        :param key_maps: Key maps per event type, see `VIEW_KEY_MAPS`
+        :type key_maps: dict
+
+        :param exchange: Exchange endpoint.
+        :type exchange: str
+
+        :return: RecordView or dict
+        """
+        stream_type, key_map, defaults, data_list = key_maps[stream_data['data']['e']]
+        if stream_type is None:
+            stream_type = stream_data['stream']
+        if data_list is True:
+            return {'stream_type': stream_type,
+                    'event_type': stream_data['data']['e'],
+                    'data': [RecordView(stream_data['data'], key_map, defaults, head={'stream_type': stream_type})]}
+        return RecordView(stream_data['data'], key_map, defaults, head={'stream_type': stream_type},
+                          tail={'unicorn_fied': [exchange, UnicornFy.get_version()]})
+
     @staticmethod
     def set_to_false_if_not_exist(value, key):
         """
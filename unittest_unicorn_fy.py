@@ -38,12 +38,45 @@
 
 import unicorn_binance_websocket_api
 import unicorn_binance_rest_api
+from unicorn_fy.binary_codec import BinaryCodec
+from unicorn_fy.conflator import Conflator
+from unicorn_fy.converter_worker import ConverterWorker
+from unicorn_fy.deduplicator import Deduplicator
+from unicorn_fy.depth_diff_tracker import DepthDiffTracker
+from unicorn_fy.file_sink import FileSink
+from unicorn_fy.frame_builder import FrameBuilder
+from unicorn_fy.futures_account_state import FuturesAccountState
+from unicorn_fy.latency_monitor import LatencyMonitor, get_histogram_bucket, get_histogram_bucket_limit
+from unicorn_fy.order_tracker import OrderTracker
+from unicorn_fy.record_pool import BookTickerRecord, MarkPriceArrayRecord, MarkPriceRecord, RecordPool
+from unicorn_fy.record_serializer import RecordSerializer
+from unicorn_fy.record_view import RecordView
+from unicorn_fy.rest_converter import RestConverter
+from unicorn_fy.ring_buffer import SpscRingBuffer
+from unicorn_fy.rolling_trade_stats import RollingTradeStats
+from unicorn_fy.sequence_gap_detector import SequenceGapDetector
+from unicorn_fy.sharded_converter import ShardedConverter
+from unicorn_fy.spot_account_state import SpotAccountState
+from unicorn_fy.stream_name import StreamName, parse_stream_name
+from unicorn_fy.shared_memory_channel import SharedMemoryChannel
+from unicorn_fy.threaded_converter import SynchronizedProxy, ThreadedConverter, is_gil_enabled
+from unicorn_fy.ticker_delta_tracker import TickerDeltaTracker
+from unicorn_fy.top_of_book import TopOfBook
 from unicorn_fy.unicorn_fy import UnicornFy
+import copy
+import http.server
+import importlib.util
+import json
 import logging
 import unittest
 import os
+import random
+import subprocess
+import sys
+import tempfile
 import time
 import threading
+from decimal import Decimal
 
 
 # Todo: Add stream_everything with rest
@@ -489,6 +522,1444 @@ class TestBinanceOrgWebsocket(unittest.TestCase):
         del self.unicorn_fy
 
 
+class TestUnicornFyInPlace(unittest.TestCase):
+    def setUp(self):
+        self.unicorn_fy = UnicornFy()
+
+    def assert_in_place(self, converter, data):
+        in_place = converter(data, in_place=True)
+        self.assertEqual(in_place, converter(data))
+        self.assertEqual(list(in_place)[-2:], ['stream_type', 'unicorn_fied'])
+        return in_place
+
+    def test_aggTrade(self):
+        data = '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1592584651517,"s":"BTCUSDT","a":315753210,"p":"9319.00000000","q":"0.01864900","f":343675554,"l":343675554,"T":1592584651516,"m":true,"M":true}}'
+        self.assertIs(self.assert_in_place(self.unicorn_fy.binance_com_websocket, data)['ignore'], True)
+        data = '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1592584651517,"a":315753210,"s":"BTCUSDT","p":"9319.00","q":"0.018","f":343675554,"l":343675554,"T":1592584651516,"m":true}}'
+        self.assert_in_place(self.unicorn_fy.binance_com_futures_websocket, data)
+
+    def test_trade(self):
+        data = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1,"s":"BTCUSDT","t":1,"p":"1.0","q":"1.0","b":1,"a":2,"T":1,"m":false,"M":true}}'
+        self.assert_in_place(self.unicorn_fy.binance_us_websocket, data)
+
+    def test_bookTicker(self):
+        data = '{"stream":"bnbusdt@bookTicker","data":{"u":400900217,"s":"BNBUSDT","b":"25.35190000","B":"31.21000000","a":"25.36520000","A":"40.66000000"}}'
+        self.assert_in_place(self.unicorn_fy.binance_com_websocket, data)
+        data = '{"stream":"btcusd_perp@bookTicker","data":{"u":473188030574,"e":"bookTicker","s":"BTCUSD_PERP","ps":"BTCUSD","b":"30008.5","B":"6771","a":"30008.6","A":"4265","T":1654861398836,"E":1654861398843}}'
+        self.assertNotIn('event_time', self.assert_in_place(self.unicorn_fy.binance_com_coin_futures_websocket, data))
+        self.assertIsInstance(self.unicorn_fy.binance_com_coin_futures_websocket(data, record_pool=RecordPool(),
+                                                                                 in_place=True), BookTickerRecord)
+
+    def test_depthUpdate(self):
+        data = '{"stream":"bnbbtc@depth","data":{"e":"depthUpdate","E":123456789,"s":"BNBBTC","U":157,"u":160,"b":[["0.0024","10"]],"a":[["0.0026","100"]]}}'
+        self.assert_in_place(self.unicorn_fy.binance_com_websocket, data)
+        data = '{"stream":"btcusdt@depth5","data":{"e":"depthUpdate","E":1654853780525,"T":1654853780513,"s":"BTCUSDT","U":1594316854355,"u":1594316863126,"pu":1594316854277,"b":[["29965.00","5.041"]],"a":[["29965.10","3.336"]]}}'
+        self.assert_in_place(self.unicorn_fy.binance_com_futures_websocket, data)
+
+    def test_hooks(self):
+        gap_detector = SequenceGapDetector()
+        for aggregate_trade_id in (1, 3):
+            self.unicorn_fy.binance_com_websocket(TestSequenceGapDetector.agg_trade(aggregate_trade_id),
+                                                  gap_detector=gap_detector, in_place=True)
+        self.assertEqual(gap_detector.get_stats()['gaps'], 1)
+
+    def test_fallback_to_copy(self):
+        data = '{"e":"balanceUpdate","E":1615926131286,"a":"USDT","d":"1.00000000","T":1615926131285}'
+        self.assertEqual(self.unicorn_fy.binance_com_websocket(data, in_place=True),
+                         self.unicorn_fy.binance_com_websocket(data))
+
+    def tearDown(self):
+        del self.unicorn_fy
+
+
+class TestRecordPool(unittest.TestCase):
+    def setUp(self):
+        self.unicorn_fy = UnicornFy()
+        self.record_pool = RecordPool(max_size=1)
+
+    def test_bookTicker_futures(self):
+        data = '{"stream":"btcusd_perp@bookTicker","data":{"u":473188030574,"e":"bookTicker","s":"BTCUSD_PERP","ps":"BTCUSD","b":"30008.5","B":"6771","a":"30008.6","A":"4265","T":1654861398836,"E":1654861398843}}'
+        record = self.unicorn_fy.binance_com_coin_futures_websocket(data, record_pool=self.record_pool)
+        self.assertIsInstance(record, BookTickerRecord)
+        self.assertEqual(record['best_bid_price'], '30008.5')
+        self.assertEqual(record.to_dict(), self.unicorn_fy.binance_com_coin_futures_websocket(data))
+
+    def test_markPrice_arr(self):
+        data = '[{"e":"markPriceUpdate","E":1562305380000,"s":"BTCUSDT","p":"11794.15000000","i":"11784.62659091","P":"11784.25641265","r":"0.00038167","T":1562306400000},{"e":"markPriceUpdate","E":1562305380000,"s":"ETHUSDT","p":"1794.15000000","P":"1784.25641265","r":"0.00038167","T":1562306400000}]'
+        pooled = self.unicorn_fy.binance_com_futures_websocket(data, record_pool=self.record_pool)
+        self.assertIsInstance(pooled, MarkPriceArrayRecord)
+        self.assertEqual(pooled.to_dict(), self.unicorn_fy.binance_com_futures_websocket(data))
+        items = list(pooled['data'])
+        self.assertTrue(self.record_pool.release(pooled))
+        self.assertEqual(pooled.data, [])
+        self.assertEqual(self.record_pool.get_size(MarkPriceRecord), 1)
+        self.assertIsNone(items[0].symbol)
+
+    def test_release_from_other_thread(self):
+        data = '{"stream":"btcusdt@markPrice","data":{"e":"markPriceUpdate","E":1562305380000,"s":"BTCUSDT","p":"11794.15000000","i":"11784.62659091","P":"11784.25641265","r":"0.00038167","T":1562306400000}}'
+        pooled = self.unicorn_fy.binance_com_futures_websocket(data, record_pool=self.record_pool)
+        item = pooled['data'][0]
+        consumer = threading.Thread(target=self.record_pool.release, args=(pooled,))
+        consumer.start()
+        consumer.join()
+        reused = self.unicorn_fy.binance_com_futures_websocket(data, record_pool=self.record_pool)
+        self.assertIs(reused, pooled)
+        self.assertIs(reused['data'][0], item)
+        self.assertIs(reused['unicorn_fied'], self.record_pool.get_unicorn_fied("binance.com-futures",
+                                                                                 self.unicorn_fy.get_version()))
+
+    def test_gap_detector(self):
+        spot = '{"stream":"bnbusdt@bookTicker","data":{"u":400900217,"s":"BNBUSDT","b":"25.35190000","B":"31.21000000","a":"25.36520000","A":"40.66000000"}}'
+        futures = '{"stream":"btcusd_perp@bookTicker","data":{"u":473188030574,"e":"bookTicker","s":"BTCUSD_PERP","ps":"BTCUSD","b":"30008.5","B":"6771","a":"30008.6","A":"4265","T":1654861398836,"E":1654861398843}}'
+        gap_detector = SequenceGapDetector()
+        record = self.unicorn_fy.binance_com_websocket(spot, record_pool=self.record_pool, gap_detector=gap_detector)
+        self.assertEqual(record.get('event_type'), "bookTicker")
+        self.assertIsNone(record.get('pair'))
+        self.assertEqual(record.get('pair', "BNBUSDT"), "BNBUSDT")
+        self.assertNotIn('pair', record)
+        self.assertIn('symbol', record)
+        self.assertIsNone(record.get('no_such_field'))
+        self.assertTrue(self.record_pool.release(record))
+        record = self.unicorn_fy.binance_com_coin_futures_websocket(futures, record_pool=self.record_pool,
+                                                                    gap_detector=gap_detector)
+        self.assertEqual(record.get('pair'), "BTCUSD")
+        self.assertEqual(gap_detector.get_stats()['gaps'], 0)
+
+    def test_release_and_reuse(self):
+        data = '{"stream":"btcusdt@bookTicker","data":{"u":400900217,"s":"BNBUSDT","b":"25.35190000","B":"31.21000000","a":"25.36520000","A":"40.66000000"}}'
+        record = self.unicorn_fy.binance_com_websocket(data, record_pool=self.record_pool)
+        self.assertTrue(self.record_pool.release(record))
+        self.assertIsNone(record.symbol)
+        self.assertEqual(self.record_pool.get_size(BookTickerRecord), 1)
+        self.assertFalse(self.record_pool.release(BookTickerRecord()))
+        self.assertIs(self.unicorn_fy.binance_com_websocket(data, record_pool=self.record_pool), record)
+        self.assertEqual(self.record_pool.get_size(), 0)
+
+    def tearDown(self):
+        del self.unicorn_fy
+
+
+class TestTickerDeltaTracker(unittest.TestCase):
+    def setUp(self):
+        self.unicorn_fy = UnicornFy()
+        self.tracker = TickerDeltaTracker()
+
+    def test_delta(self):
+        data = '[{"e":"24hrMiniTicker","E":1592594715455,"s":"ETHBTC","c":"0.02456700","o":"0.02459800","h":"0.02470900","l":"0.02438100","v":"163116.18600000","q":"4006.04936991"},{"e":"24hrMiniTicker","E":1592594715775,"s":"BTCUSDT","c":"9342.70000000","o":"9411.83000000","h":"9442.98000000","l":"9292.00000000","v":"46447.72385000","q":"433942519.03236542"}]'
+        delta = self.tracker.update(self.unicorn_fy.binance_com_websocket(data))
+        self.assertEqual(len(delta['data']), 2)
+        data = '[{"e":"24hrMiniTicker","E":1592594716455,"s":"ETHBTC","c":"0.02456700","o":"0.02459800","h":"0.02470900","l":"0.02438100","v":"163116.18600000","q":"4006.04936991"},{"e":"24hrMiniTicker","E":1592594716775,"s":"BTCUSDT","c":"9343.70000000","o":"9411.83000000","h":"9442.98000000","l":"9292.00000000","v":"46447.72385000","q":"433942519.03236542"}]'
+        delta = self.tracker.update(self.unicorn_fy.binance_com_websocket(data))
+        self.assertEqual(delta['data'], [{'stream_type': '!miniTicker@arr', 'event_type': '24hrMiniTicker',
+                                          'event_time': 1592594716775, 'symbol': 'BTCUSDT',
+                                          'close_price': '9343.70000000'}])
+        self.assertEqual(self.tracker.get_state('ETHBTC')['event_time'], 1592594716455)
+        self.assertEqual(self.tracker.get_state('BTCUSDT')['close_price'], '9343.70000000')
+        self.assertIsNone(self.tracker.get_state('BNBBTC'))
+
+    def test_remove_symbol(self):
+        data = '{"stream":"btcusdt@miniTicker","data":{"e":"24hrMiniTicker","E":1601628771865,"s":"BTCUSDT","c":"10456.56000000","o":"10884.90000000","h":"10912.83000000","l":"10385.02000000","v":"64483.09756200","q":"685180788.34970800"}}'
+        self.tracker.update(self.unicorn_fy.binance_com_websocket(data))
+        self.assertEqual(self.tracker.update(self.unicorn_fy.binance_com_websocket(data))['data'], [])
+        self.assertTrue(self.tracker.remove_symbol('BTCUSDT'))
+        self.assertEqual(len(self.tracker.update(self.unicorn_fy.binance_com_websocket(data))['data']), 1)
+        self.assertEqual(self.tracker.get_symbols(), ['BTCUSDT'])
+
+    def tearDown(self):
+        del self.unicorn_fy
+
+
+class TestTopOfBook(unittest.TestCase):
+    def setUp(self):
+        self.unicorn_fy = UnicornFy()
+        self.top_of_book = TopOfBook()
+
+    def test_update_from_converter(self):
+        data = '{"stream":"btcusdt@bookTicker","data":{"u":400900217,"s":"BNBUSDT","b":"25.35190000","B":"31.21000000","a":"25.36520000","A":"40.66000000"}}'
+        self.unicorn_fy.binance_com_websocket(data, top_of_book=self.top_of_book)
+        data = '{"stream":"btcusd_perp@bookTicker","data":{"u":473188030574,"e":"bookTicker","s":"BTCUSD_PERP","ps":"BTCUSD","b":"30008.5","B":"6771","a":"30008.6","A":"4265","T":1654861398836,"E":1654861398843}}'
+        self.unicorn_fy.binance_com_coin_futures_websocket(data, top_of_book=self.top_of_book)
+        self.assertEqual(self.top_of_book.get('BNBUSDT'), {'symbol': 'BNBUSDT', 'order_book_update_id': 400900217,
+                                                           'best_bid_price': 25.3519, 'best_bid_quantity': 31.21,
+                                                           'best_ask_price': 25.3652, 'best_ask_quantity': 40.66})
+        self.assertEqual(self.top_of_book.get('BTCUSD_PERP')['best_ask_quantity'], 4265.0)
+        self.assertIsNone(self.top_of_book.get('ETHUSDT'))
+
+    def test_discard_stale_update(self):
+        self.assertTrue(self.top_of_book.update_values('BTCUSDT', 10, "100.0", "1.0", "101.0", "2.0"))
+        self.assertFalse(self.top_of_book.update_values('BTCUSDT', 9, "99.0", "1.0", "100.0", "2.0"))
+        self.assertEqual(self.top_of_book.discarded_updates, 1)
+        self.assertEqual(self.top_of_book.get_spread('BTCUSDT'), 1.0)
+
+    def test_snapshot(self):
+        self.top_of_book.update_values('BTCUSDT', 10, "100.0", "1.0", "101.0", "2.0")
+        self.top_of_book.update_values('ETHUSDT', 11, "10.0", "1.0", "11.0", "2.0")
+        snapshot = self.top_of_book.get_snapshot()
+        symbol_id = self.top_of_book.get_symbol_id('ETHUSDT')
+        self.assertEqual(snapshot['symbols'][symbol_id], 'ETHUSDT')
+        self.assertEqual(snapshot['best_ask_prices'][symbol_id], 11.0)
+        self.assertEqual(list(snapshot['order_book_update_ids']), [10, 11])
+
+    def tearDown(self):
+        del self.unicorn_fy
+
+
+class TestConflator(unittest.TestCase):
+    def setUp(self):
+        self.conflator = Conflator(flush_interval=60)
+
+    def test_conflation(self):
+        self.conflator.add('{"stream":"btcusdt@bookTicker","data":{"u":1,"s":"BTCUSDT","b":"1.0","B":"1.0","a":"2.0","A":"1.0"}}')
+        self.conflator.add('{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1592584651517,"s":"BTCUSDT","a":315753210,"p":"9319.00000000","q":"0.01864900","f":343675554,"l":343675554,"T":1592584651516,"m":true,"M":true}}')
+        self.conflator.add('{"stream":"btcusdt@bookTicker","data":{"u":2,"s":"BTCUSDT","b":"1.1","B":"1.0","a":"2.0","A":"1.0"}}')
+        self.conflator.add('{"stream":"ethusdt@bookTicker","data":{"u":3,"s":"ETHUSDT","b":"1.1","B":"1.0","a":"2.0","A":"1.0"}}')
+        self.conflator.add('{"e":"bookTicker","u":4,"s":"GALAUSDT","b":"0.07661","B":"40088","a":"0.07662","A":"929","T":1654792470066,"E":1654792470073}')
+        self.conflator.add('{"e":"bookTicker","u":5,"s":"GALAUSDT","b":"0.07661","B":"40088","a":"0.07662","A":"929","T":1654792470066,"E":1654792470073}')
+        self.assertEqual(len(self.conflator.get_frames()), 1)
+        frames = self.conflator.get_frames(force=True)
+        self.assertEqual([UnicornFy.binance_com_futures_websocket(frame)['order_book_update_id'] for frame in frames],
+                         [2, 3, 5])
+        stats = self.conflator.get_stats()
+        self.assertEqual(stats['received_frames'], 6)
+        self.assertEqual(stats['dropped_frames'], 2)
+        self.assertEqual(stats['dropped_frames_per_event_type'], {'bookTicker': 2})
+        self.assertEqual(stats['pending_frames'], 0)
+
+    def test_closed_kline_is_kept(self):
+        closed = '{"stream":"btcusdt@kline_1m","data":{"e":"kline","E":1,"s":"BTCUSDT","k":{"t":1,"T":2,"s":"BTCUSDT","i":"1m","x":true}}}'
+        self.conflator.add(closed)
+        self.conflator.add('{"stream":"btcusdt@kline_1m","data":{"e":"kline","E":2,"s":"BTCUSDT","k":{"t":3,"T":4,"s":"BTCUSDT","i":"1m","x":false}}}')
+        self.assertEqual(self.conflator.get_frames(), [closed])
+        self.assertEqual(self.conflator.get_stats()['dropped_frames'], 0)
+
+    def test_get_key(self):
+        self.assertEqual(self.conflator.get_key('{"stream":"btcusdt@markPriceKline_1m","data":{}}'),
+                         ('btcusdt@markPriceKline_1m', 'markPrice_kline'))
+        self.assertEqual(self.conflator.get_key('{"stream":"!bookTicker","data":{"u":1,"s":"BNBUSDT"}}'),
+                         (('!bookTicker', 'BNBUSDT'), 'bookTicker'))
+        self.assertIsNone(self.conflator.get_key('{"stream":"btcusdt@depth5","data":{}}'))
+        self.assertEqual(self.conflator.get_key('{"stream":"!markPrice@arr","data":[]}'),
+                         ('!markPrice@arr', 'markPriceUpdate'))
+        self.assertEqual(self.conflator.get_key('{"stream":"!markPrice@arr@1s","data":[]}'),
+                         ('!markPrice@arr@1s', 'markPriceUpdate'))
+        self.assertEqual(self.conflator.get_key('{"e":"kline","E":1,"s":"BTCUSDT","k":{"i":"1m","x":false}}'),
+                         (('kline', 'BTCUSDT', None, None, '1m'), 'kline'))
+        self.assertEqual(self.conflator.get_key('{"e":"indexPriceUpdate","E":1,"i":"BTCUSD","p":"1.0"}'),
+                         (('indexPriceUpdate', 'BTCUSD'), 'indexPriceUpdate'))
+
+    def test_raw_markPriceUpdate(self):
+        for index_price in ("11784.62659091", "11784.70000000", "11785.10000000"):
+            self.conflator.add('{"e":"markPriceUpdate","E":1562305380000,"s":"BTCUSDT","p":"11794.15000000","i":"' +
+                               index_price + '","P":"11784.25641265","r":"0.00038167","T":1562306400000}')
+        frames = self.conflator.get_frames(force=True)
+        self.assertEqual(len(frames), 1)
+        self.assertIn('"i":"11785.10000000"', frames[0])
+        self.assertEqual(self.conflator.get_stats()['dropped_frames'], 2)
+
+    def test_markPrice_arr(self):
+        for event_time in (1, 2):
+            self.conflator.add('{"stream":"!markPrice@arr@1s","data":[{"e":"markPriceUpdate","E":' + str(event_time) +
+                               ',"s":"BTCUSDT","p":"1.0","i":"1.0","P":"1.0","r":"0.0","T":1}]}')
+        self.assertEqual(len(self.conflator.get_frames(force=True)), 1)
+        self.assertEqual(self.conflator.get_stats()['dropped_frames'], 1)
+
+
+class TestSpscRingBuffer(unittest.TestCase):
+    def setUp(self):
+        self.ring_buffer = SpscRingBuffer(capacity=3, spin_count=10)
+
+    def test_push_and_pop(self):
+        self.assertEqual(self.ring_buffer.capacity, 4)
+        for item in range(5):
+            self.ring_buffer.push(item)
+        self.assertEqual(self.ring_buffer.get_stats(), {'capacity': 4, 'occupancy': 4, 'overflows': 1,
+                                                        'pushed': 4, 'popped': 0})
+        self.assertEqual(self.ring_buffer.pop(), 0)
+        self.assertEqual(self.ring_buffer.pop_batch(max_items=2), [1, 2])
+        self.assertTrue(self.ring_buffer.push(4))
+        self.assertEqual(self.ring_buffer.pop_batch(), [3, 4])
+        self.assertIsNone(self.ring_buffer.pop(timeout=0.01))
+
+    def test_wait_for_producer(self):
+        producer = threading.Timer(0.05, self.ring_buffer.push, args=("frame",))
+        producer.start()
+        self.assertEqual(self.ring_buffer.pop(timeout=5), "frame")
+        producer.join()
+
+
+class TestConverterWorker(unittest.TestCase):
+    def test_convert(self):
+        unicorn_fied_data = []
+        data = '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1592584651517,"s":"BTCUSDT","a":315753210,"p":"9319.00000000","q":"0.01864900","f":343675554,"l":343675554,"T":1592584651516,"m":true,"M":true}}'
+        with ConverterWorker(process_unicorn_fied_data=unicorn_fied_data.append,
+                             converter_kwargs={'gap_detector': SequenceGapDetector()}) as converter_worker:
+            for _ in range(10):
+                converter_worker.add(data)
+        self.assertFalse(converter_worker.is_alive())
+        self.assertEqual(len(unicorn_fied_data), 10)
+        self.assertEqual(unicorn_fied_data[0]['aggregate_trade_id'], 315753210)
+        self.assertEqual(converter_worker.get_stats()['converted_frames'], 10)
+
+    def test_errors(self):
+        unicorn_fied_data = []
+
+        def process_unicorn_fied_data(data):
+            if data['aggregate_trade_id'] == 1:
+                raise ValueError("test")
+            unicorn_fied_data.append(data)
+
+        with ConverterWorker(process_unicorn_fied_data=process_unicorn_fied_data) as converter_worker:
+            for trade_id in range(3):
+                converter_worker.add('{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1,"s":"BTCUSDT",'
+                                     '"a":' + str(trade_id) + ',"p":"1.0","q":"1.0","f":1,"l":1,"T":1,"m":true,'
+                                     '"M":true}}')
+                converter_worker.add('{"stream":"btcusdt@aggTrade","data":{}}')
+        self.assertEqual([data['aggregate_trade_id'] for data in unicorn_fied_data], [0, 2])
+        stats = converter_worker.get_stats()
+        self.assertEqual((stats['converted_frames'], stats['failed_frames'], stats['failed_callbacks']), (3, 3, 1))
+
+
+class TestShardedConverter(unittest.TestCase):
+    def test_routing_key(self):
+        self.assertEqual(ShardedConverter.get_routing_key('{"stream":"btcusdt@depth@100ms","data":{}}'), "btcusdt")
+        self.assertEqual(ShardedConverter.get_routing_key('{"e":"bookTicker","u":1,"s":"GALAUSDT"}'), "galausdt")
+        self.assertEqual(ShardedConverter.get_routing_key('{"stream":"!miniTicker@arr","data":[]}'), "!miniticker")
+
+    def test_order_per_symbol(self):
+        sharded_converter = ShardedConverter(shards=2, batch_size=7, merge_output=False)
+        for trade_id in range(20):
+            for symbol in ("btcusdt", "ethusdt", "bnbusdt"):
+                sharded_converter.add('{"stream":"' + symbol + '@aggTrade","data":{"e":"aggTrade","E":1592584651517,"s":"' + symbol.upper() + '","a":' + str(trade_id) + ',"p":"9319.00000000","q":"0.01864900","f":343675554,"l":343675554,"T":1592584651516,"m":true,"M":true}}')
+        sharded_converter.stop()
+        trade_ids = {}
+        for shard_id in range(2):
+            while True:
+                batch = sharded_converter.get_batch(shard_id=shard_id, timeout=30)
+                if batch is None:
+                    break
+                for unicorn_fied_data in batch:
+                    trade_ids.setdefault(unicorn_fied_data['symbol'], []).append(
+                        unicorn_fied_data['aggregate_trade_id'])
+        sharded_converter.join()
+        self.assertEqual(trade_ids, {symbol: list(range(20)) for symbol in ("BTCUSDT", "ETHUSDT", "BNBUSDT")})
+
+    def test_reject_stateful_hooks(self):
+        self.assertRaises(ValueError, ShardedConverter, shards=1, converter_kwargs={'top_of_book': TopOfBook()})
+        self.assertRaises(ValueError, ShardedConverter, shards=1,
+                          converter_kwargs={'gap_detector': SequenceGapDetector()})
+        self.assertRaises(ValueError, ShardedConverter, shards=1, converter_kwargs={'record_pool': RecordPool()})
+
+
+class TestSharedMemoryChannel(unittest.TestCase):
+    def setUp(self):
+        self.unicorn_fy = UnicornFy()
+        self.writer = SharedMemoryChannel(slots=4)
+        self.reader = SharedMemoryChannel(name=self.writer.name, create=False)
+
+    def test_write_and_read(self):
+        data = '{"stream":"btcusdt@trade","data":{"e":"trade","E":1592591955766,"s":"BTCUSDT","t":343719861,"p":"9302.00000000","q":"0.00101900","b":2517144287,"a":2517144235,"T":1592591955765,"m":false,"M":true}}'
+        self.writer.write(self.unicorn_fy.binance_com_websocket(data))
+        data = '{"stream":"btcusd_perp@bookTicker","data":{"u":473188030574,"e":"bookTicker","s":"BTCUSD_PERP","ps":"BTCUSD","b":"30008.5","B":"6771","a":"30008.6","A":"4265","T":1654861398836,"E":1654861398843}}'
+        self.writer.write(self.unicorn_fy.binance_com_coin_futures_websocket(data))
+        self.assertEqual(self.writer.write({'event_type': 'depthUpdate'}), 0)
+        records = self.reader.read()
+        self.assertEqual(records[0], {'event_type': 'trade', 'symbol': 'BTCUSDT', 'event_time': 1592591955766,
+                                      'trade_id': 343719861, 'price': 9302.0, 'quantity': 0.001019,
+                                      'buyer_order_id': 2517144287, 'seller_order_id': 2517144235,
+                                      'trade_time': 1592591955765, 'is_market_maker': False})
+        self.assertEqual(records[1]['best_ask_quantity'], 4265.0)
+        self.assertEqual(self.reader.read(), [])
+
+    def test_overrun(self):
+        data = '[{"e":"markPriceUpdate","E":1562305380000,"s":"BTCUSDT","p":"11794.15000000","i":"11784.62659091","P":"11784.25641265","r":"0.00038167","T":1562306400000},{"e":"markPriceUpdate","E":1562305380000,"s":"ETHUSDT","p":"1794.15000000","P":"1784.25641265","r":"0.00038167","T":1562306400000}]'
+        for _ in range(3):
+            self.writer.write(self.unicorn_fy.binance_com_futures_websocket(data))
+        self.assertEqual(self.reader.get_available(), 6)
+        records = self.reader.read(as_dict=False)
+        self.assertEqual(len(records), 4)
+        self.assertEqual(self.reader.overruns, 2)
+        self.assertEqual(records[-1][0], 'markPriceUpdate')
+
+    def test_long_symbol(self):
+        record = {'event_type': 'bookTicker', 'symbol': "1000000BABYDOGEUSDT", 'order_book_update_id': 1,
+                  'best_bid_price': "1.0", 'best_bid_quantity': "1.0", 'best_ask_price': "2.0",
+                  'best_ask_quantity': "1.0"}
+        self.assertRaises(ValueError, self.writer.write, record)
+        self.assertEqual(self.reader.get_available(), 0)
+
+    def test_invalid_array_item(self):
+        data = '[{"e":"markPriceUpdate","E":1562305380000,"s":"BTCUSDT","p":"11794.15000000","P":"11784.25641265",' \
+               '"r":"0.00038167","T":1562306400000},{"e":"markPriceUpdate","E":1562305380000,' \
+               '"s":"1000000BABYDOGEUSDT","p":"1.0","P":"1.0","r":"0.00038167","T":1562306400000}]'
+        self.assertRaises(ValueError, self.writer.write, self.unicorn_fy.binance_com_futures_websocket(data))
+        data = self.unicorn_fy.binance_com_futures_websocket(data.replace('"s":"1000000BABYDOGEUSDT"', '"s":"X"'))
+        data['data'][1]['mark_price'] = "invalid"
+        self.assertRaises(ValueError, self.writer.write, data)
+        self.assertEqual(self.reader.get_available(), 0)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+        del self.unicorn_fy
+
+
+class TestFuturesAccountState(unittest.TestCase):
+    def setUp(self):
+        self.changes = []
+        self.state = FuturesAccountState(on_change=self.changes.append)
+        self.account_update = UnicornFy.binance_com_futures_websocket(
+            '{"e":"ACCOUNT_UPDATE","T":1617859763506,"E":1617859763511,"a":{"B":[{"a":"USDT","wb":"1790.86605837",'
+            '"cw":"1790.86605837"}],"P":[{"s":"CHZUSDT","pa":"0","ep":"0.00000","cr":"0","up":"0","mt":"cross",'
+            '"iw":"0","ps":"BOTH","ma":"USDT"},{"s":"CHZUSDT","pa":"2684","ep":"0.45855","cr":"79.89127995",'
+            '"up":"2.03986684","mt":"cross","iw":"0","ps":"LONG","ma":"USDT"}],"m":"ORDER"}}')
+
+    def test_account_update(self):
+        changes = self.state.apply(self.account_update)
+        self.assertEqual(len(changes), 3)
+        self.assertEqual(self.changes, changes)
+        self.assertEqual(self.state.get_balance("USDT")['wallet_balance'], "1790.86605837")
+        self.assertEqual(self.state.get_position("CHZUSDT", "LONG")['entry_price'], "0.45855")
+        self.assertEqual(list(self.state.get_open_positions().keys()), [("CHZUSDT", "LONG")])
+        self.assertEqual(self.state.apply(self.account_update), [])
+
+    def test_changed_fields_only(self):
+        self.state.apply(self.account_update)
+        update = copy.deepcopy(self.account_update)
+        update['event_time'] += 1
+        update['positions'][1]['upnl'] = "3.0"
+        changes = self.state.apply(update)
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]['key'], ("CHZUSDT", "LONG"))
+        self.assertEqual(changes[0]['changed_fields'], {'upnl': ("2.03986684", "3.0")})
+
+    def test_stale_event(self):
+        self.state.apply(self.account_update)
+        update = copy.deepcopy(self.account_update)
+        update['event_time'] -= 1
+        update['balances'][0]['wallet_balance'] = "1.0"
+        self.assertEqual(self.state.apply(update), [])
+        self.assertEqual(self.state.get_balance("USDT")['wallet_balance'], "1790.86605837")
+
+    def test_margin_call(self):
+        self.state.apply(self.account_update)
+        margin_call = UnicornFy.binance_com_futures_websocket(
+            '{"e":"MARGIN_CALL","E":1617859763600,"cw":"3.16812045","p":[{"s":"CHZUSDT","ps":"LONG","pa":"2684",'
+            '"mt":"CROSSED","iw":"0","mp":"0.4",'
+            '"up":"-1.166074","mm":"1.614445"}]}')
+        changes = self.state.apply(margin_call)
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(set(changes[0]['changed_fields']), {'mark_price', 'upnl', 'maintenance_margin'})
+        self.assertEqual(self.state.get_position("CHZUSDT", "LONG")['margin_type'], "cross")
+        self.assertEqual(self.state.cross_wallet_balance, "3.16812045")
+        self.assertEqual(self.state.last_event_time, 1617859763600)
+
+    def test_balance_change(self):
+        self.state.apply(self.account_update)
+        update = copy.deepcopy(self.account_update)
+        update['event_time'] += 1
+        update['balances'][0]['wallet_balance'] = "1800.86605837"
+        update['balances'][0]['balance_change'] = "10"
+        changes = self.state.apply(update)
+        self.assertEqual(changes[0]['balance_change'], "10")
+        self.assertEqual(changes[0]['changed_fields'], {'wallet_balance': ("1790.86605837", "1800.86605837")})
+        self.assertNotIn('balance_change', self.state.get_balance("USDT"))
+
+    def test_ignore_other_events(self):
+        self.assertEqual(self.state.apply({'event_type': 'trade', 'event_time': 1}), [])
+        self.assertEqual(self.state.get_balances(), {})
+
+
+class TestSpotAccountState(unittest.TestCase):
+    def setUp(self):
+        self.state = SpotAccountState()
+        self.position = UnicornFy.binance_com_websocket(
+            '{"e":"outboundAccountPosition","E":1564034571105,"u":1564034571073,"B":[{"a":"ETH","f":"10.00000000",'
+            '"l":"1.00000000"},{"a":"BTC","f":"0.50000000","l":"0.00000000"}]}')
+        self.balance_update = UnicornFy.binance_com_websocket(
+            '{"e":"balanceUpdate","E":1564034571200,"a":"ETH","d":"-2.50000000","T":1564034571199}')
+
+    def test_position_and_delta(self):
+        self.assertTrue(self.state.apply(self.position))
+        self.assertTrue(self.state.apply(self.balance_update))
+        self.assertEqual(self.state.get_balance("ETH")['free'], Decimal("7.5"))
+        self.assertEqual(self.state.get_balance("ETH")['locked'], Decimal("1"))
+        self.assertEqual(self.state.get_balance("BTC")['free'], Decimal("0.5"))
+        self.assertEqual(self.state.last_event_time, 1564034571200)
+
+    def test_ordering(self):
+        newer_position = copy.deepcopy(self.position)
+        newer_position['event_time'] = 1564034571300
+        newer_position['balances'][0]['free'] = "7.50000000"
+        self.assertTrue(self.state.apply(newer_position))
+        # Delta already included in the newer position
+        self.assertFalse(self.state.apply(self.balance_update))
+        # Older position
+        self.assertFalse(self.state.apply(self.position))
+        self.assertEqual(self.state.get_balance("ETH")['free'], Decimal("7.5"))
+
+    def test_late_position(self):
+        self.assertTrue(self.state.apply(self.position))
+        self.assertTrue(self.state.apply(self.balance_update))
+        late_position = copy.deepcopy(self.position)
+        late_position['event_time'] = 1564034571150
+        late_position['balances'][0]['free'] = "9.00000000"
+        late_position['balances'][1]['free'] = "0.60000000"
+        # ETH: older than the applied delta, it would drop the delta - BTC: newer than the last event
+        self.assertTrue(self.state.apply(late_position))
+        self.assertEqual(self.state.get_balance("ETH")['free'], Decimal("7.5"))
+        self.assertEqual(self.state.get_balance("BTC")['free'], Decimal("0.6"))
+
+    def test_delta_of_unknown_asset(self):
+        self.assertTrue(self.state.apply(self.balance_update))
+        self.assertEqual(self.state.get_balance("ETH"), {'asset': "ETH", 'free': None, 'locked': None,
+                                                         'event_time': 1564034571200})
+        restored_state = SpotAccountState()
+        restored_state.restore(json.loads(json.dumps(self.state.get_snapshot())))
+        self.assertIsNone(restored_state.get_balance("ETH")['free'])
+        newer_position = copy.deepcopy(self.position)
+        newer_position['event_time'] = 1564034571300
+        self.assertTrue(self.state.apply(newer_position))
+        self.assertEqual(self.state.get_balance("ETH")['free'], Decimal("10"))
+
+    def test_snapshot_restore(self):
+        self.state.apply(self.position)
+        self.state.apply(self.balance_update)
+        snapshot = json.loads(json.dumps(self.state.get_snapshot()))
+        restored_state = SpotAccountState()
+        self.assertTrue(restored_state.restore(snapshot))
+        self.assertEqual(restored_state.get_balances(), self.state.get_balances())
+        self.assertEqual(restored_state.last_event_time, self.state.last_event_time)
+
+    def test_ignore_other_events(self):
+        self.assertFalse(self.state.apply({'event_type': 'trade', 'event_time': 1}))
+        self.assertIsNone(self.state.get_balance("ETH"))
+
+
+class TestOrderTracker(unittest.TestCase):
+    @staticmethod
+    def execution_report(event_time, execution_type, status, last_quantity="0", cumulative_quantity="0",
+                         cumulative_quote_quantity="0", order_id=4293153, client_order_id="mUvoqJxFIILMdfAW5iGSOW",
+                         original_client_order_id=""):
+        return UnicornFy.binance_com_websocket(json.dumps(
+            {"e": "executionReport", "E": event_time, "s": "ETHBTC", "c": client_order_id, "S": "BUY", "o": "LIMIT",
+             "f": "GTC", "q": "2.00000000", "p": "0.10264410", "P": "0.00000000", "F": "0.00000000", "g": -1,
+             "C": original_client_order_id, "x": execution_type, "X": status, "r": "NONE", "i": order_id,
+             "l": last_quantity, "z": cumulative_quantity, "L": "0.10000000", "n": "0.00100000", "N": "BNB",
+             "T": event_time, "t": event_time if execution_type == "TRADE" else -1, "I": 8641984, "w": True, "m": False, "M": False, "O": 1499405658657,
+             "Z": cumulative_quote_quantity, "Y": "0.00000000", "Q": "0.00000000"}))
+
+    def test_spot_lifecycle(self):
+        tracker = OrderTracker()
+        tracker.apply(self.execution_report(1000, "NEW", "NEW"))
+        self.assertEqual(len(tracker.get_open_orders("ETHBTC")), 1)
+        tracker.apply(self.execution_report(1001, "TRADE", "PARTIALLY_FILLED", "1.00000000", "1.00000000",
+                                            "0.10000000"))
+        order = tracker.apply(self.execution_report(1002, "TRADE", "FILLED", "1.00000000", "2.00000000",
+                                                    "0.30000000"))
+        self.assertEqual(order['cumulative_filled_quantity'], Decimal("2"))
+        self.assertEqual(order['average_price'], Decimal("0.15"))
+        self.assertEqual(order['fills'], 2)
+        self.assertEqual(order['commission'], {'BNB': Decimal("0.002")})
+        self.assertEqual([status for _, status in order['status_history']], ['NEW', 'PARTIALLY_FILLED', 'FILLED'])
+        self.assertEqual(tracker.get_open_orders(), {})
+        self.assertEqual(tracker.get_open_orders("ETHBTC"), {})
+        self.assertIs(tracker.get_order("ETHBTC", 4293153), order)
+        self.assertIs(tracker.get_order_by_client_order_id("mUvoqJxFIILMdfAW5iGSOW"), order)
+
+    def test_cancel_client_order_id(self):
+        tracker = OrderTracker()
+        tracker.apply(self.execution_report(1000, "NEW", "NEW"))
+        order = tracker.apply(self.execution_report(1001, "CANCELED", "CANCELED", client_order_id="cancel_request",
+                                                    original_client_order_id="mUvoqJxFIILMdfAW5iGSOW"))
+        self.assertEqual(order['status'], 'CANCELED')
+        self.assertIs(tracker.get_order_by_client_order_id("mUvoqJxFIILMdfAW5iGSOW"), order)
+        self.assertIsNone(tracker.get_order_by_client_order_id("cancel_request"))
+
+    def test_out_of_order(self):
+        tracker = OrderTracker()
+        tracker.apply(self.execution_report(1000, "NEW", "NEW"))
+        tracker.apply(self.execution_report(1002, "TRADE", "PARTIALLY_FILLED", "1.00000000", "1.50000000",
+                                            "0.15000000"))
+        order = tracker.apply(self.execution_report(1001, "TRADE", "PARTIALLY_FILLED", "0.50000000",
+                                                    "0.50000000", "0.05000000"))
+        self.assertEqual(order['cumulative_filled_quantity'], Decimal("1.5"))
+        self.assertEqual(order['event_time'], 1002)
+
+    def test_late_trade(self):
+        tracker = OrderTracker()
+        tracker.apply(self.execution_report(1000, "NEW", "NEW"))
+        tracker.apply(self.execution_report(1002, "TRADE", "FILLED", "1.00000000", "2.00000000", "0.30000000"))
+        order = tracker.apply(self.execution_report(1001, "TRADE", "PARTIALLY_FILLED", "1.00000000", "1.00000000",
+                                                    "0.10000000"))
+        self.assertEqual(order['fills'], 2)
+        self.assertEqual(order['commission'], {'BNB': Decimal("0.002")})
+        self.assertEqual(order['status'], 'FILLED')
+        self.assertEqual(order['cumulative_filled_quantity'], Decimal("2"))
+        self.assertEqual(tracker.get_open_orders(), {})
+        self.assertIs(tracker.get_order("ETHBTC", 4293153), order)
+
+    def test_duplicate_trade(self):
+        tracker = OrderTracker()
+        tracker.apply(self.execution_report(1000, "NEW", "NEW"))
+        trade = self.execution_report(1001, "TRADE", "PARTIALLY_FILLED", "1.00000000", "1.00000000", "0.10000000")
+        tracker.apply(trade)
+        order = tracker.apply(trade)
+        self.assertEqual(order['fills'], 1)
+        self.assertEqual(order['commission'], {'BNB': Decimal("0.001")})
+        self.assertEqual(order['trade_ids'], {1001})
+
+    def test_archive_eviction(self):
+        tracker = OrderTracker(max_archive_size=2, archive_time=10)
+        for order_id in range(3):
+            tracker.apply(self.execution_report(1000 + order_id, "NEW", "NEW", order_id=order_id,
+                                                client_order_id=str(order_id)))
+            tracker.apply(self.execution_report(1000 + order_id, "CANCELED", "CANCELED", order_id=order_id,
+                                                client_order_id=str(order_id)))
+        self.assertIsNone(tracker.get_order("ETHBTC", 0))
+        self.assertIsNone(tracker.get_order_by_client_order_id("0"))
+        self.assertIsNotNone(tracker.get_order("ETHBTC", 2))
+        tracker.apply(self.execution_report(20000, "NEW", "NEW", order_id=3, client_order_id="3"))
+        self.assertIsNone(tracker.get_order("ETHBTC", 2))
+        self.assertEqual(len(tracker.archive), 0)
+
+    def test_futures(self):
+        tracker = OrderTracker()
+        data = UnicornFy.binance_com_futures_websocket(
+            '{"e":"ORDER_TRADE_UPDATE","T":1617859867769,"E":1617859867772,"o":{"s":"SANDUSDT","c":"electron_6Ly",'
+            '"S":"BUY","o":"LIMIT","f":"GTC","q":"1000","p":"0.63428","ap":"0.63","sp":"0","x":"TRADE",'
+            '"X":"PARTIALLY_FILLED","i":315803079,"l":"100","z":"100","L":"0.63","N":"USDT","n":"0.01",'
+            '"T":1617859867769,"t":1,"b":"0","a":"0","m":false,"R":false,"wt":"CONTRACT_PRICE","ot":"LIMIT",'
+            '"ps":"LONG","cp":false,"rp":"0","pP":false,"si":0,"ss":0}}')
+        order = tracker.apply(data)
+        self.assertEqual(order['average_price'], Decimal("0.63"))
+        self.assertEqual(order['cumulative_quote_quantity'], Decimal("63.00"))
+        self.assertEqual(order['commission'], {'USDT': Decimal("0.01")})
+        self.assertIs(tracker.get_open_orders("SANDUSDT")[315803079], order)
+        self.assertIsNone(tracker.apply({'event_type': 'trade'}))
+
+
+class TestRollingTradeStats(unittest.TestCase):
+    def test_trade_events(self):
+        stats = RollingTradeStats(windows=(1, 10))
+        trade = UnicornFy.binance_com_websocket('{"stream":"btcusdt@trade","data":{"e":"trade","E":1000,"s":"BTCUSDT",'
+                                                '"t":1,"p":"100.0","q":"2.0","b":1,"a":2,"T":1000,"m":false,"M":true}}')
+        self.assertTrue(stats.apply(trade))
+        agg_trade = UnicornFy.binance_com_websocket('{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1500,'
+                                                    '"s":"BTCUSDT","a":1,"p":"200.0","q":"1.0","f":1,"l":1,'
+                                                    '"T":1500,"m":true,"M":true}}')
+        self.assertTrue(stats.apply(agg_trade))
+        self.assertFalse(stats.apply({'event_type': 'bookTicker'}))
+        result = stats.get_stats("BTCUSDT", 10)
+        self.assertEqual(result['trade_count'], 2)
+        self.assertAlmostEqual(result['vwap'], 400.0 / 3.0)
+        self.assertEqual(result['buy_volume'], 2.0)
+        self.assertEqual(result['sell_volume'], 1.0)
+        self.assertAlmostEqual(result['imbalance'], 1.0 / 3.0)
+        self.assertEqual(stats.get_stats("BTCUSDT", 1, time=2200)['trade_count'], 1)
+        self.assertEqual(stats.get_stats("BTCUSDT", 10, time=20000)['trade_count'], 0)
+        self.assertIsNone(stats.get_stats("ETHUSDT", 1))
+
+    def test_brute_force(self):
+        rng = random.Random(7)
+        stats = RollingTradeStats(windows=(1, 5), bucket_interval=100)
+        trades = []
+        trade_time = 0
+        for _ in range(3000):
+            trade_time += rng.randint(0, 40)
+            symbol = rng.choice(("BTCUSDT", "ETHUSDT"))
+            # Late trades
+            time = trade_time - rng.randint(0, 300) if rng.random() < 0.1 else trade_time
+            trade = (symbol, rng.randint(1, 1000) / 10, rng.randint(1, 100) / 100, time, rng.random() < 0.5)
+            if stats.add(*trade):
+                trades.append(trade)
+            if rng.random() < 0.05:
+                for window in (1, 5):
+                    all_stats = stats.get_all_stats(window)
+                    for symbol_id, symbol in enumerate(all_stats['symbols']):
+                        head_bucket = stats.head_buckets[symbol_id]
+                        window_trades = [t for t in trades if t[0] == symbol and
+                                         head_bucket - t[3] // 100 < window * 10]
+                        self.assertEqual(all_stats['trade_count'][symbol_id], len(window_trades))
+                        self.assertAlmostEqual(all_stats['volume'][symbol_id], sum(t[2] for t in window_trades))
+                        self.assertAlmostEqual(all_stats['buy_volume'][symbol_id],
+                                               sum(t[2] for t in window_trades if not t[4]))
+        self.assertGreater(len(trades), 2500)
+
+
+class ReleaseHandler(http.server.BaseHTTPRequestHandler):
+    delay = 0.0
+    failing = False
+    requests = 0
+
+    def do_GET(self):
+        ReleaseHandler.requests += 1
+        time.sleep(self.delay)
+        body = b'{"message": "error"}' if self.failing else b'{"tag_name": "0.99.0"}'
+        self.send_response(500 if self.failing else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestReleaseCheck(unittest.TestCase):
+    def setUp(self):
+        ReleaseHandler.delay = 0.0
+        ReleaseHandler.failing = False
+        ReleaseHandler.requests = 0
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ReleaseHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/releases/latest"
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.temp_dir.name, "release_check.json")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def test_release_check(self):
+        unicorn_fy = UnicornFy(release_check_url=self.url, release_check_cache_file=self.cache_file)
+        self.assertEqual(unicorn_fy.get_latest_version(timeout=5), "0.99.0")
+        self.assertTrue(unicorn_fy.is_update_available())
+        self.assertEqual(ReleaseHandler.requests, 1)
+        self.assertTrue(os.path.isfile(self.cache_file))
+
+    def test_cache_file(self):
+        UnicornFy(release_check_url=self.url, release_check_cache_file=self.cache_file).get_latest_version(timeout=5)
+        unicorn_fy = UnicornFy(release_check_url="http://127.0.0.1:1/", release_check_cache_file=self.cache_file)
+        self.assertEqual(unicorn_fy.get_latest_version(), "0.99.0")
+        self.assertEqual(ReleaseHandler.requests, 1)
+
+    def test_timeout(self):
+        ReleaseHandler.delay = 1.0
+        unicorn_fy = UnicornFy(release_check_url=self.url, release_check_cache_file=self.cache_file,
+                               release_check_timeout=0.2)
+        start_time = time.perf_counter()
+        self.assertEqual(unicorn_fy.get_latest_version(), "unknown")
+        self.assertLess(time.perf_counter() - start_time, 0.1)
+        unicorn_fy.release_check_thread.join(5)
+        self.assertEqual(unicorn_fy.get_latest_version(), "unknown")
+        self.assertFalse(os.path.isfile(self.cache_file))
+
+    def test_failure_backoff(self):
+        ReleaseHandler.failing = True
+        unicorn_fy = UnicornFy(release_check_url=self.url, release_check_cache_file=self.cache_file)
+        for _ in range(5):
+            self.assertEqual(unicorn_fy.get_latest_version(timeout=5), "unknown")
+        self.assertEqual(ReleaseHandler.requests, 1)
+        self.assertEqual(unicorn_fy.release_check_failures, 1)
+        self.assertGreater(unicorn_fy.release_check_retry_time, time.time() + 50)
+        ReleaseHandler.failing = False
+        unicorn_fy.release_check_retry_time = 0.0
+        self.assertEqual(unicorn_fy.get_latest_version(timeout=5), "0.99.0")
+        self.assertEqual(ReleaseHandler.requests, 2)
+        self.assertEqual(unicorn_fy.release_check_failures, 0)
+
+    @unittest.skipIf(sys.platform in ("darwin", "win32"), "XDG_CACHE_HOME is only used on Linux and BSD")
+    def test_cache_dir(self):
+        xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+        os.environ["XDG_CACHE_HOME"] = self.temp_dir.name
+        try:
+            unicorn_fy = UnicornFy(release_check_url=self.url)
+        finally:
+            if xdg_cache_home is None:
+                del os.environ["XDG_CACHE_HOME"]
+            else:
+                os.environ["XDG_CACHE_HOME"] = xdg_cache_home
+        cache_dir = os.path.join(self.temp_dir.name, "unicorn_fy")
+        self.assertEqual(unicorn_fy.release_check_cache_file, os.path.join(cache_dir, "release_check.json"))
+        self.assertEqual(unicorn_fy.get_latest_version(timeout=5), "0.99.0")
+        self.assertTrue(os.path.isfile(os.path.join(cache_dir, "release_check.json")))
+        self.assertEqual(os.stat(cache_dir).st_mode & 0o777, 0o700)
+
+    def test_disable_release_check(self):
+        unicorn_fy = UnicornFy(disable_release_check=True, release_check_url=self.url,
+                               release_check_cache_file=self.cache_file)
+        self.assertEqual(unicorn_fy.get_latest_version(timeout=1), "unknown")
+        self.assertFalse(unicorn_fy.is_update_available())
+        self.assertIsNone(unicorn_fy.release_check_thread)
+        self.assertEqual(ReleaseHandler.requests, 0)
+
+
+class TestImport(unittest.TestCase):
+    def test_lazy_imports(self):
+        code = ("import sys, unicorn_fy; "
+                "print([name for name in ('requests', 'multiprocessing', 'multiprocessing.shared_memory') "
+                "if name in sys.modules])")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.stdout.strip(), "[]")
+
+
+class TestSequenceGapDetector(unittest.TestCase):
+    @staticmethod
+    def agg_trade(aggregate_trade_id, symbol="BTCUSDT"):
+        return ('{"stream":"' + symbol.lower() + '@aggTrade","data":{"e":"aggTrade","E":1,"s":"' + symbol + '","a":' +
+                str(aggregate_trade_id) + ',"p":"1.0","q":"1.0","f":1,"l":1,"T":1,"m":true,"M":true}}')
+
+    def test_agg_trade(self):
+        gaps = []
+        duplicates = []
+        gap_detector = SequenceGapDetector(on_gap=lambda data, missing_ids: gaps.append(missing_ids),
+                                           on_duplicate=duplicates.append)
+        for aggregate_trade_id in (10, 11, 14, 14, 12, 15):
+            UnicornFy.binance_com_websocket(self.agg_trade(aggregate_trade_id), gap_detector=gap_detector)
+        UnicornFy.binance_com_websocket(self.agg_trade(1, symbol="ETHUSDT"), gap_detector=gap_detector)
+        self.assertEqual(gaps, [2])
+        self.assertEqual(len(duplicates), 2)
+        self.assertEqual(gap_detector.get_stats(), {'streams': 2, 'gaps': 1, 'duplicates': 2, 'missing_ids': 2})
+        self.assertEqual(gap_detector.get_stats("btcusdt@aggTrade", "BTCUSDT"),
+                         {'last_id': 15, 'gaps': 1, 'duplicates': 2})
+        self.assertTrue(gap_detector.reset("btcusdt@aggTrade", "BTCUSDT"))
+        self.assertTrue(gap_detector.check(UnicornFy.binance_com_websocket(self.agg_trade(100))))
+
+    def test_spot_depth(self):
+        gap_detector = SequenceGapDetector()
+        depth_update = {'stream_type': 'btcusdt@depth', 'event_type': 'depthUpdate', 'symbol': 'BTCUSDT'}
+        for first_id, final_id, result in ((100, 110, True), (105, 115, True), (116, 120, True), (110, 120, False),
+                                           (125, 130, False)):
+            depth_update['first_update_id_in_event'] = first_id
+            depth_update['final_update_id_in_event'] = final_id
+            self.assertEqual(gap_detector.check(depth_update), result)
+        self.assertEqual(gap_detector.get_stats()['missing_ids'], 4)
+
+    def test_futures_depth(self):
+        gap_detector = SequenceGapDetector()
+        for first_id, final_id, previous_id in ((100, 110, 90), (111, 120, 110), (130, 140, 125)):
+            UnicornFy.binance_com_futures_websocket(
+                '{"stream":"btcusdt@depth","data":{"e":"depthUpdate","E":1,"T":1,"s":"BTCUSDT","U":' + str(first_id) +
+                ',"u":' + str(final_id) + ',"pu":' + str(previous_id) + ',"b":[],"a":[]}}', gap_detector=gap_detector)
+        self.assertEqual(gap_detector.get_stats(), {'streams': 1, 'gaps': 1, 'duplicates': 0, 'missing_ids': 0})
+        UnicornFy.binance_com_futures_websocket(
+            '{"stream":"btcusdt@depth5","data":{"e":"depthUpdate","E":1,"T":1,"s":"BTCUSDT","U":1,"u":2,"pu":0,'
+            '"b":[],"a":[]}}', gap_detector=gap_detector)
+        self.assertEqual(gap_detector.get_stats()['streams'], 1)
+
+
+class TestLatencyMonitor(unittest.TestCase):
+    def test_histogram_buckets(self):
+        for latency_us in list(range(0, 5000)) + [123456, 98765432]:
+            bucket = get_histogram_bucket(latency_us)
+            self.assertLess(latency_us, get_histogram_bucket_limit(bucket))
+            if bucket > 0:
+                self.assertGreaterEqual(latency_us, get_histogram_bucket_limit(bucket - 1))
+
+    def test_record(self):
+        latency_monitor = LatencyMonitor()
+        for latency in range(1, 101):
+            latency_monitor.record({'stream_type': 'btcusdt@aggTrade', 'event_type': 'aggTrade', 'symbol': 'BTCUSDT',
+                                    'event_time': 1000000}, receive_time=1000000 + latency)
+        latency_monitor.record({'stream_type': 'ethusdt@depth', 'event_type': 'depthUpdate', 'symbol': 'ETHUSDT',
+                                'event_time': 1000000, 'transaction_time': 999990}, receive_time=999998)
+        stats = latency_monitor.get_stats("btcusdt@aggTrade", "BTCUSDT")['event_time']
+        self.assertEqual(stats['samples'], 100)
+        self.assertEqual(stats['min'], 1)
+        self.assertEqual(stats['max'], 100)
+        self.assertAlmostEqual(stats['mean'], 50.5)
+        self.assertTrue(50 <= stats['p50'] <= 50 * 1.25)
+        self.assertTrue(99 <= stats['p99'] <= 100)
+        self.assertIsNone(latency_monitor.get_stats("btcusdt@aggTrade", "BTCUSDT")['transaction_time'])
+        self.assertEqual(latency_monitor.get_stats("ethusdt@depth", "ETHUSDT")['transaction_time']['max'], 8)
+        self.assertEqual(latency_monitor.get_clock_skew(), -2)
+        self.assertEqual([stats['symbol'] for stats in latency_monitor.get_all_stats()], ["BTCUSDT", "ETHUSDT"])
+        self.assertIsNone(latency_monitor.record({'result': None, 'id': 1}))
+
+    def test_negative_latency(self):
+        latency_monitor = LatencyMonitor()
+        for latency in (-20, -10, -1, 5):
+            latency_monitor.record({'stream_type': 'btcusdt@trade', 'symbol': 'BTCUSDT', 'event_time': 1000000},
+                                   receive_time=1000000 + latency)
+        stats = latency_monitor.get_stats("btcusdt@trade", "BTCUSDT")['event_time']
+        self.assertEqual(stats['negative'], 3)
+        self.assertEqual(stats['min'], -20)
+        self.assertTrue(-10 <= stats['p50'] <= -10 / 1.25)
+        self.assertEqual(stats['p99'], 5)
+        self.assertEqual(latency_monitor.get_clock_skew(), -20)
+
+    def test_array_events(self):
+        latency_monitor = LatencyMonitor()
+        data = UnicornFy.binance_com_futures_websocket(
+            '[{"e":"markPriceUpdate","E":1000000,"s":"BTCUSDT","p":"1.0","P":"1.0","r":"0.0001","T":1000001},'
+            '{"e":"markPriceUpdate","E":1000004,"s":"ETHUSDT","p":"1.0","P":"1.0","r":"0.0001","T":1000001}]')
+        self.assertEqual(latency_monitor.record(data, receive_time=1000010), 6)
+        self.assertEqual(latency_monitor.get_stats("!markPrice@arr", "BTCUSDT")['event_time']['max'], 10)
+        self.assertEqual(latency_monitor.get_stats("!markPrice@arr", "ETHUSDT")['event_time']['max'], 6)
+        self.assertIsNone(latency_monitor.record({'stream_type': 'btcusdt@depth5', 'bids': [], 'asks': []}))
+
+    def test_unknown_event(self):
+        latency_monitor = LatencyMonitor()
+        gap_detector = SequenceGapDetector()
+        top_of_book = TopOfBook()
+        data = UnicornFy.binance_com_websocket('{"stream":"btcusdt@foo","data":{"e":"unknownEvent","E":1,'
+                                               '"s":"BTCUSDT"}}', latency_monitor=latency_monitor,
+                                               gap_detector=gap_detector, top_of_book=top_of_book)
+        self.assertFalse(data)
+        self.assertEqual(latency_monitor.get_all_stats(), [])
+        self.assertEqual(gap_detector.get_stats()['streams'], 0)
+
+    def test_record_pool(self):
+        latency_monitor = LatencyMonitor(stamp_records=True)
+        record_pool = RecordPool()
+        event_time = int(time.time() * 1000)
+        record = UnicornFy.binance_com_futures_websocket(
+            '{"stream":"btcusdt@bookTicker","data":{"e":"bookTicker","u":1,"s":"BTCUSDT","b":"1.0","B":"1.0",'
+            '"a":"2.0","A":"1.0","T":' + str(event_time) + ',"E":' + str(event_time) + '}}',
+            record_pool=record_pool, latency_monitor=latency_monitor)
+        self.assertIsInstance(record, BookTickerRecord)
+        # Converted bookTicker events carry no `event_time`
+        self.assertIsNone(latency_monitor.get_stats("btcusdt@bookTicker", "BTCUSDT"))
+        pooled = UnicornFy.binance_com_futures_websocket(
+            '[{"e":"markPriceUpdate","E":' + str(event_time) + ',"s":"BTCUSDT","p":"1.0","P":"1.0","r":"0.0001",'
+            '"T":1}]', record_pool=record_pool, latency_monitor=latency_monitor)
+        self.assertIsInstance(pooled, MarkPriceArrayRecord)
+        self.assertEqual(latency_monitor.get_stats("!markPrice@arr", "BTCUSDT")['event_time']['samples'], 1)
+
+    def test_converter(self):
+        latency_monitor = LatencyMonitor(stamp_records=True)
+        event_time = int(time.time() * 1000)
+        data = UnicornFy.binance_com_websocket(
+            '{"stream":"btcusdt@trade","data":{"e":"trade","E":' + str(event_time) + ',"s":"BTCUSDT","t":1,'
+            '"p":"1.0","q":"1.0","b":1,"a":2,"T":1,"m":false,"M":true}}', latency_monitor=latency_monitor)
+        self.assertIn('convert_time', data)
+        self.assertTrue(0 <= data['latency'] < 10000)
+        self.assertEqual(latency_monitor.get_stats("btcusdt@trade", "BTCUSDT")['event_time']['samples'], 1)
+        data = UnicornFy.binance_com_websocket(
+            '{"stream":"btcusdt@trade","data":{"e":"trade","E":' + str(event_time) + ',"s":"BTCUSDT","t":2,'
+            '"p":"1.0","q":"1.0","b":1,"a":2,"T":1,"m":false,"M":true}}', latency_monitor=LatencyMonitor())
+        self.assertNotIn('latency', data)
+        self.assertNotIn('convert_time', data)
+
+
+class TestRecordView(unittest.TestCase):
+    def test_execution_report(self):
+        data = json.dumps({"e": "executionReport", "E": 1499405658658, "s": "ETHBTC", "c": "mUvoqJxFIILMdfAW5iGSOW",
+                           "S": "BUY", "o": "LIMIT", "f": "GTC", "q": "1.00000000", "p": "0.10264410",
+                           "P": "0.00000000", "F": "0.00000000", "g": -1, "C": "", "x": "NEW", "X": "NEW",
+                           "r": "NONE", "i": 4293153, "l": "0.00000000", "z": "0.00000000", "L": "0.00000000",
+                           "n": "0", "N": None, "T": 1499405658657, "t": -1, "I": 8641984, "w": True, "m": False,
+                           "M": False, "O": 1499405658657, "Z": "0.00000000", "Y": "0.00000000", "Q": "0.00000000"})
+        view = UnicornFy.binance_com_websocket(data, as_view=True)
+        self.assertIsInstance(view, RecordView)
+        self.assertEqual(view['order_price'], "0.10264410")
+        self.assertEqual(view['stream_type'], "!userData@arr")
+        self.assertNotIn('Q', view)
+        self.assertEqual(view, UnicornFy.binance_com_websocket(data))
+        self.assertEqual(str(view.to_dict()), str(UnicornFy.binance_com_websocket(data)))
+        with self.assertRaises(TypeError):
+            view['order_price'] = "1.0"
+
+    def test_kline(self):
+        data = ('{"stream":"btcusdt@kline_1m","data":{"e":"kline","E":123456789,"s":"BTCUSDT","k":{"t":123400000,'
+                '"T":123460000,"s":"BTCUSDT","i":"1m","f":100,"L":200,"o":"0.0010","c":"0.0020","h":"0.0025",'
+                '"l":"0.0015","v":"1000","n":100,"x":false,"q":"1.0000","V":"500","Q":"0.500","B":"123456"}}}')
+        for converter in (UnicornFy.binance_com_websocket, UnicornFy.binance_com_futures_websocket):
+            view = converter(data, as_view=True)
+            self.assertEqual(view['kline']['close_price'], "0.0020")
+            self.assertFalse(view['kline']['first_trade_id'])
+            self.assertEqual(str(view.to_dict()), str(converter(data)))
+
+    def test_order_trade_update(self):
+        data = ('{"e":"ORDER_TRADE_UPDATE","E":1591274595442,"T":1591274595453,"i":"SfsR","o":{"s":"BTCUSD_200925",'
+                '"c":"TEST","S":"SELL","o":"TRAILING_STOP_MARKET","f":"GTC","q":"2","p":"0","ap":"0","sp":"9103.1",'
+                '"x":"NEW","X":"NEW","i":8888888,"l":"0","z":"0","L":"0","ma": "BTC","N":"BTC","n":"0",'
+                '"T":1591274595442,"t":0,"rp": "0","b":"0","a":"0","m":false,"R":false,"wt":"CONTRACT_PRICE",'
+                '"ot":"TRAILING_STOP_MARKET","ps":"LONG","cp":false,"AP":"9476.8","cr":"5.0","pP": false}}')
+        view = UnicornFy.binance_com_coin_futures_websocket(data, as_view=True)
+        self.assertEqual(view['callback_rate'], "5.0")
+        self.assertEqual(view['unicorn_fied'][0], "binance.com-coin_futures")
+        self.assertEqual(view, UnicornFy.binance_com_coin_futures_websocket(data))
+
+    def test_24hr_ticker(self):
+        data = ('{"stream":"btcusdt@ticker","data":{"e":"24hrTicker","E":123456789,"s":"BTCUSDT","p":"0.0015",'
+                '"P":"250.00","w":"0.0018","x":"0.0009","c":"0.0025","Q":"10","b":"0.0024","B":"10","a":"0.0026",'
+                '"A":"100","o":"0.0010","h":"0.0025","l":"0.0010","v":"10000","q":"18","O":0,"C":86400000,"F":0,'
+                '"L":18150,"n":18151}}')
+        unicorn_fied_data = UnicornFy.binance_com_websocket(data, as_view=True)
+        self.assertIsInstance(unicorn_fied_data['data'][0], RecordView)
+        self.assertEqual(unicorn_fied_data['data'][0]['last_price'], "0.0025")
+        self.assertEqual(unicorn_fied_data, UnicornFy.binance_com_websocket(data))
+
+
+class TestRecordSerializer(unittest.TestCase):
+    def setUp(self):
+        self.payloads = [
+            '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1700000000000,"s":"BTCUSDT","a":12345,'
+            '"p":"37000.10","q":"0.0100","f":100,"l":105,"T":1700000000000,"m":true,"M":true}}',
+            '{"stream":"btcusdt@bookTicker","data":{"u":1,"s":"BTCUSDT","b":"1.0","B":"1.0","a":"2.0","A":"1.0"}}',
+            '{"stream":"btcusdt@depth@100ms","data":{"e":"depthUpdate","E":1,"s":"BTCUSDT","U":1,"u":2,'
+            '"b":[["1.0","2.0"]],"a":[]}}',
+            '{"e":"balanceUpdate","E":1615926131286,"a":"USDT","d":"1.00000000","T":1615926131285}']
+
+    def test_to_json_bytes(self):
+        record_serializer = RecordSerializer("binance_com_websocket")
+        for payload in self.payloads:
+            self.assertEqual(record_serializer.to_json_bytes(payload),
+                             json.dumps(UnicornFy.binance_com_websocket(payload), separators=(",", ":")).encode())
+        lines = record_serializer.to_json_bytes_batch(self.payloads).splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(json.loads(lines[1])['best_ask_price'], "2.0")
+
+    def test_futures(self):
+        record_serializer = RecordSerializer("binance_com_futures_websocket")
+        payload = ('{"stream":"btcusdt@depth5","data":{"e":"depthUpdate","E":1,"T":1,"s":"BTCUSDT","U":1,"u":2,'
+                   '"pu":0,"b":[],"a":[]}}')
+        self.assertEqual(json.loads(record_serializer.to_json_bytes(payload))['depth_level'], 5)
+        payload = ('{"stream":"btcusdt@bookTicker","data":{"e":"bookTicker","u":1,"E":1,"T":1,"s":"BTCUSDT",'
+                   '"ps":"BTCUSDT","b":"1.0","B":"1.0","a":"2.0","A":"1.0"}}')
+        self.assertEqual(json.loads(record_serializer.to_json_bytes(payload)),
+                         UnicornFy.binance_com_futures_websocket(payload))
+
+    def test_templates_match_converters(self):
+        payloads = {
+            'binance_com_websocket': self.payloads[:3] + [
+                '{"stream":"btcusdt@trade","data":{"e":"trade","E":1,"s":"BTCUSDT","t":7,"p":"1.5","q":"2",'
+                '"b":1,"a":2,"T":1,"m":false,"M":true}}'],
+            'binance_com_futures_websocket': [
+                '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1,"a":2,"s":"BTCUSDT","p":"1.0","q":"1.0",'
+                '"f":1,"l":1,"T":1,"m":true}}',
+                '{"stream":"btcusdt@bookTicker","data":{"e":"bookTicker","u":1,"E":1,"T":1,"s":"BTCUSDT",'
+                '"b":"1.0","B":"1.0","a":"2.0","A":"1.0"}}']}
+        for converter, converter_payloads in payloads.items():
+            record_serializer = RecordSerializer(converter)
+            self.assertEqual(len(converter_payloads), len(record_serializer.templates))
+            for payload in converter_payloads:
+                self.assertIsNotNone(record_serializer._get_values(payload))
+                self.assertEqual(record_serializer.to_json_bytes(payload),
+                                 json.dumps(getattr(UnicornFy, converter)(payload), separators=(",", ":")).encode())
+
+    @unittest.skipUnless(importlib.util.find_spec("msgpack"), "msgpack is not installed")
+    def test_to_msgpack(self):
+        import msgpack
+        record_serializer = RecordSerializer()
+        self.assertEqual(msgpack.unpackb(record_serializer.to_msgpack(self.payloads[0])),
+                         UnicornFy.binance_com_websocket(self.payloads[0]))
+        unpacker = msgpack.Unpacker()
+        unpacker.feed(record_serializer.to_msgpack_batch(self.payloads))
+        self.assertEqual(len(list(unpacker)), 4)
+
+
+class TestBinaryCodec(unittest.TestCase):
+    def setUp(self):
+        self.records = [
+            UnicornFy.binance_com_websocket(
+                '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1700000000000,"s":"BTCUSDT","a":12345,'
+                '"p":"37000.10","q":"0.0100","f":100,"l":105,"T":1700000000000,"m":true,"M":true}}'),
+            UnicornFy.binance_com_websocket(
+                '{"stream":"btcusdt@trade","data":{"e":"trade","E":1,"s":"BTCUSDT","t":7,"p":"1.5","q":"2",'
+                '"b":1,"a":2,"T":1,"m":false,"M":true}}'),
+            UnicornFy.binance_com_futures_websocket(
+                '{"stream":"btcusdt@bookTicker","data":{"e":"bookTicker","u":1,"s":"BTCUSDT","ps":"BTCUSDT",'
+                '"b":"1.0","B":"1.0","a":"2.0","A":"1.0"}}'),
+            UnicornFy.binance_com_futures_websocket(
+                '{"stream":"btcusdt@depth@100ms","data":{"e":"depthUpdate","E":1,"T":1,"s":"BTCUSDT","U":1,"u":2,'
+                '"pu":0,"b":[["1.0","2.0"]],"a":[["2.5","-0.01"],["3.0","0.0"]]}}')]
+        del self.records[1]['ignore']
+
+    def test_round_trip(self):
+        binary_codec = BinaryCodec(price_decimals=2)
+        encoded = bytes(binary_codec.encode_batch(self.records + [{'event_type': "kline"}]))
+        self.assertEqual(len(encoded), sum(binary_codec.get_size(record) for record in self.records))
+        decoded = BinaryCodec(price_decimals=2, strings=binary_codec.get_strings()).decode_batch(encoded)
+        self.assertEqual(decoded[0]['price'], "37000.10")
+        self.assertEqual(decoded[0]['quantity'], "0.01")
+        self.assertEqual(decoded[3]['asks'], [["2.50", "-0.01"], ["3.00", "0.00"]])
+        self.assertIs(decoded[3]['depth_level'], False)
+        self.assertNotIn('ignore', decoded[1])
+        for record, decoded_record in zip(self.records, decoded):
+            self.assertEqual(set(record), set(decoded_record))
+            self.assertEqual(decoded_record['unicorn_fied'], record['unicorn_fied'])
+
+    def test_float_prices(self):
+        binary_codec = BinaryCodec()
+        decoded, offset = binary_codec.decode(binary_codec.encode(self.records[0]))
+        self.assertEqual(offset, binary_codec.get_size(self.records[0]))
+        self.assertEqual(decoded['price'], "37000.1")
+        decoded, _ = binary_codec.decode(binary_codec.encode(self.records[2]), as_float=True)
+        self.assertEqual(decoded['best_ask_price'], 2.0)
+        self.assertEqual(decoded['pair'], "BTCUSDT")
+        self.assertIsNone(binary_codec.encode({'event_type': "kline"}))
+
+    def test_without_unicorn_fied(self):
+        binary_codec = BinaryCodec()
+        record = dict(self.records[1])
+        del record['unicorn_fied']
+        decoded, _ = binary_codec.decode(binary_codec.encode(record))
+        self.assertEqual(set(decoded), set(record))
+        self.assertEqual(binary_codec.get_strings(), ["btcusdt@trade", "BTCUSDT"])
+
+    def test_preallocated_buffer(self):
+        binary_codec = BinaryCodec()
+        buffer = bytearray(1024)
+        view = binary_codec.encode_batch(self.records, buffer)
+        self.assertEqual(len(binary_codec.decode_batch(view)), 4)
+        with self.assertRaises(ValueError):
+            binary_codec.encode_batch(self.records, bytearray(10))
+
+
+class TestDeduplicator(unittest.TestCase):
+    @staticmethod
+    def get_frame(aggregate_trade_id, symbol="BTCUSDT"):
+        return ('{"stream":"%s@aggTrade","data":{"e":"aggTrade","E":1,"s":"%s","a":%d,"p":"1.0","q":"1.0","f":1,'
+                '"l":1,"T":1,"m":true,"M":true}}' % (symbol.lower(), symbol, aggregate_trade_id))
+
+    def test_frames(self):
+        deduplicator = Deduplicator(window_size=8)
+        frames = [self.get_frame(i) for i in range(10)]
+        self.assertEqual(len(deduplicator.filter_frames(frames + frames[-3:] + [self.get_frame(5, "ETHUSDT")])), 11)
+        self.assertEqual(deduplicator.get_key(frames[0]), ('aggTrade', ('aggTrade', "BTCUSDT"), 0))
+        self.assertIsNone(deduplicator.get_key('{"stream":"btcusdt@bookTicker","data":{"u":1,"s":"BTCUSDT"}}'))
+        # out of order within the window is passed once, behind the window is dropped
+        self.assertFalse(deduplicator.is_duplicate_frame(self.get_frame(20)))
+        self.assertFalse(deduplicator.is_duplicate_frame(self.get_frame(15)))
+        self.assertTrue(deduplicator.is_duplicate_frame(self.get_frame(15)))
+        self.assertTrue(deduplicator.is_duplicate_frame(self.get_frame(11)))
+        stats = deduplicator.get_stats()
+        self.assertEqual(stats['duplicates'], 5)
+        self.assertEqual(stats['expired_ids'], 1)
+        self.assertEqual(stats['scopes'], 2)
+
+    def test_unicorn_fied_data(self):
+        deduplicator = Deduplicator()
+        depth_update = UnicornFy.binance_com_websocket(
+            '{"stream":"btcusdt@depth@100ms","data":{"e":"depthUpdate","E":1,"s":"BTCUSDT","U":1,"u":2,'
+            '"b":[],"a":[]}}')
+        self.assertFalse(deduplicator.is_duplicate(depth_update))
+        self.assertTrue(deduplicator.is_duplicate(dict(depth_update)))
+        order = {'event_type': "executionReport", 'event_time': 1, 'symbol': "BTCUSDT", 'order_id': 5,
+                 'trade_id': -1, 'current_execution_type': "NEW", 'current_order_status': "NEW"}
+        self.assertFalse(deduplicator.is_duplicate(order))
+        self.assertTrue(deduplicator.is_duplicate(dict(order)))
+        fill = dict(order, event_time=2, trade_id=7, current_execution_type="TRADE", current_order_status="FILLED")
+        self.assertFalse(deduplicator.is_duplicate(fill))
+        self.assertTrue(deduplicator.is_duplicate(dict(fill, event_time=3)))
+        self.assertFalse(deduplicator.is_duplicate({'event_type': "bookTicker"}))
+
+    def test_approximate(self):
+        deduplicator = Deduplicator(approximate=True, capacity=1000, error_rate=0.000001)
+        frames = [self.get_frame(i) for i in range(2000)]
+        self.assertEqual(len(deduplicator.filter_frames(frames + frames[-200:])), 2000)
+        # ids of the rotated out generation are forgotten
+        self.assertFalse(deduplicator.is_duplicate_frame(frames[0]))
+
+
+class TestStreamName(unittest.TestCase):
+    def test_parse_stream_name(self):
+        self.assertEqual(parse_stream_name("btcusdt@depth20@100ms"),
+                         StreamName("btcusdt@depth20@100ms", "BTCUSDT", "depth", 20, 100, False))
+        stream_name = parse_stream_name("!markPrice@arr@1s")
+        self.assertIsNone(stream_name.symbol)
+        self.assertEqual((stream_name.channel, stream_name.update_speed, stream_name.is_array),
+                         ("markPrice", 1000, True))
+        self.assertEqual(parse_stream_name("btcusdt_perpetual@continuousKline_1m").symbol, "BTCUSDT_PERPETUAL")
+        self.assertIs(parse_stream_name("btcusdt@depth@100ms").depth_level, False)
+        self.assertIsNone(parse_stream_name("pqia91ma19a5s61cv6a81va65sdf19v8a65a1a5s61cv6a81va65sdf19v8a65a1").symbol)
+        self.assertIs(parse_stream_name("btcusdt@bookTicker"), parse_stream_name("btcusdt@bookTicker"))
+
+    def test_converters(self):
+        unicorn_fied_data = UnicornFy.binance_com_websocket(
+            '{"stream":"btcusdt@depth10@100ms","data":{"lastUpdateId":1,"bids":[],"asks":[]}}')
+        self.assertEqual((unicorn_fied_data['symbol'], unicorn_fied_data['event_type']), ("BTCUSDT", "depth"))
+        unicorn_fied_data = UnicornFy.binance_com_futures_websocket(
+            '{"stream":"btcusdt@depth5","data":{"e":"depthUpdate","E":1,"T":1,"s":"BTCUSDT","U":1,"u":2,"pu":0,'
+            '"b":[],"a":[]}}')
+        self.assertEqual(unicorn_fied_data['depth_level'], 5)
+
+
+class TestFrameBuilder(unittest.TestCase):
+    def setUp(self):
+        self.agg_trades = [UnicornFy.binance_com_websocket(
+            '{"stream":"%s@aggTrade","data":{"e":"aggTrade","E":%d,"s":"%s","a":%d,"p":"37000.10","q":"0.0100",'
+            '"f":100,"l":105,"T":1700000000000,"m":true,"M":true}}' % (symbol.lower(), i, symbol, i))
+            for i in range(10) for symbol in ("BTCUSDT", "ETHUSDT")]
+
+    def test_add(self):
+        frame_builder = FrameBuilder(chunk_size=4)
+        self.assertEqual(frame_builder.add_batch(self.agg_trades + [{'event_type': "depthUpdate"}, "x"]), 20)
+        self.assertEqual(frame_builder.get_row_count('aggTrade'), 20)
+        self.assertEqual(frame_builder.get_event_types(), ['aggTrade'])
+        frame_builder.clear()
+        self.assertEqual(frame_builder.get_row_count('aggTrade'), 0)
+
+    @unittest.skipUnless(importlib.util.find_spec("pandas"), "pandas is not installed")
+    def test_to_dataframe(self):
+        frame_builder = FrameBuilder(chunk_size=4)
+        frame_builder.add_batch(self.agg_trades)
+        frame_builder.add({'stream_type': "btcusdt@aggTrade", 'event_type': "aggTrade", 'aggregate_trade_id': 99})
+        dataframe = frame_builder.to_dataframe('aggTrade')
+        self.assertEqual(len(dataframe), 21)
+        self.assertEqual(str(dataframe['price'].dtype), "float64")
+        self.assertEqual(str(dataframe['aggregate_trade_id'].dtype), "int64")
+        self.assertEqual(str(dataframe['is_market_maker'].dtype), "bool")
+        self.assertEqual(str(dataframe['symbol'].dtype), "category")
+        self.assertEqual(list(dataframe['symbol'].cat.categories), ["BTCUSDT", "ETHUSDT"])
+        self.assertEqual(dataframe['price'].iloc[0], 37000.1)
+        self.assertEqual(dataframe['aggregate_trade_id'].iloc[-1], 99)
+        self.assertTrue(dataframe['price'].isna().iloc[-1])
+        self.assertTrue(dataframe['symbol'].isna().iloc[-1])
+        self.assertEqual(len(frame_builder.to_dataframe('trade')), 0)
+
+    @unittest.skipUnless(importlib.util.find_spec("pandas"), "pandas is not installed")
+    def test_kline_and_mark_price(self):
+        frame_builder = FrameBuilder()
+        frame_builder.add(UnicornFy.binance_com_futures_websocket(
+            '{"stream":"btcusdt@kline_1m","data":{"e":"kline","E":1,"s":"BTCUSDT","k":{"t":1,"T":2,"s":"BTCUSDT",'
+            '"i":"1m","f":1,"L":2,"o":"1.0","c":"2.0","h":"3.0","l":"0.5","v":"10","n":2,"x":false,"q":"20",'
+            '"V":"5","Q":"10","B":"0"}}}'))
+        frame_builder.add(UnicornFy.binance_com_futures_websocket(
+            '[{"e":"markPriceUpdate","E":1,"s":"BTCUSDT","p":"1.5","i":"1.4","P":"1.6","r":"0.0001","T":2},'
+            '{"e":"markPriceUpdate","E":1,"s":"ETHUSDT","p":"2.5","i":"2.4","P":"2.6","r":"0.0001","T":2}]'))
+        self.assertEqual(frame_builder.to_dataframe('kline')['high_price'].iloc[0], 3.0)
+        self.assertEqual(list(frame_builder.to_dataframe('markPriceUpdate')['mark_price']), [1.5, 2.5])
+
+
+class TestRestConverter(unittest.TestCase):
+    def setUp(self):
+        self.klines = ('[[1700000000000,"37000.10","37100.00","36900.00","37050.00","12.5",1700000059999,"463000.1",'
+                       '1234,"6.1","225000.5","0"],[1700000060000,"37050.00","37060.00","37040.00","37055.00","1.5",'
+                       '1700000119999,"55000.0",12,"0.7","26000.0","0"]]')
+        self.agg_trades = '[{"a":26129,"p":"0.01633102","q":"4.70443515","f":27781,"l":27781,"T":1498793709153,' \
+                          '"m":true,"M":true}]'
+
+    def test_klines(self):
+        klines = RestConverter.klines(self.klines, "btcusdt", "1m", now=1700000100000)
+        websocket_kline = UnicornFy.binance_com_websocket(
+            '{"stream":"btcusdt@kline_1m","data":{"e":"kline","E":1,"s":"BTCUSDT","k":{"t":1,"T":2,"s":"BTCUSDT",'
+            '"i":"1m","f":1,"L":2,"o":"1.0","c":"2.0","h":"3.0","l":"0.5","v":"10","n":2,"x":false,"q":"20",'
+            '"V":"5","Q":"10","B":"0"}}}')
+        self.assertEqual(set(klines[0]), set(websocket_kline))
+        self.assertEqual(set(klines[0]['kline']), set(websocket_kline['kline']))
+        self.assertEqual(klines[0]['stream_type'], "btcusdt@kline_1m")
+        self.assertEqual(klines[0]['kline']['open_price'], "37000.10")
+        self.assertEqual([kline['kline']['is_closed'] for kline in klines], [True, False])
+
+    def test_futures_klines(self):
+        klines = RestConverter.klines(self.klines, "btcusdt", "1m", exchange="binance.com-futures",
+                                      now=1700000100000)
+        websocket_kline = UnicornFy.binance_com_futures_websocket(
+            '{"stream":"btcusdt@kline_1m","data":{"e":"kline","E":1,"s":"BTCUSDT","k":{"t":1,"T":2,"s":"BTCUSDT",'
+            '"i":"1m","f":1,"L":2,"o":"1.0","c":"2.0","h":"3.0","l":"0.5","v":"10","n":2,"x":false,"q":"20",'
+            '"V":"5","Q":"10","B":"0"}}}')
+        self.assertEqual(set(klines[0]), set(websocket_kline))
+        self.assertEqual(set(klines[0]['kline']), set(websocket_kline['kline']))
+        self.assertNotIn('ignore', klines[0]['kline'])
+
+    def test_klines_to_columns(self):
+        columns = RestConverter.klines_to_columns(self.klines, now=1700000100000)
+        columns = RestConverter.klines_to_columns(json.loads(self.klines), columns=columns, now=1800000000000)
+        self.assertEqual(list(columns['high_price']), [37100.0, 37060.0, 37100.0, 37060.0])
+        self.assertEqual(list(columns['number_of_trades']), [1234, 12, 1234, 12])
+        self.assertEqual(list(columns['is_closed']), [1, 0, 1, 1])
+
+    def test_agg_trades(self):
+        agg_trade = RestConverter.agg_trades(self.agg_trades, "BTCUSDT")[0]
+        websocket_agg_trade = UnicornFy.binance_com_websocket(
+            '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade","E":1,"s":"BTCUSDT","a":1,"p":"1.0","q":"1.0",'
+            '"f":1,"l":1,"T":1,"m":true,"M":true}}')
+        self.assertEqual(set(agg_trade), set(websocket_agg_trade))
+        self.assertIsNone(agg_trade['event_time'])
+        self.assertEqual(agg_trade['aggregate_trade_id'], 26129)
+        columns = RestConverter.agg_trades_to_columns(self.agg_trades)
+        self.assertEqual(list(columns['price']), [0.01633102])
+        self.assertEqual(list(columns['is_market_maker']), [1])
+
+    def test_depth(self):
+        depth = RestConverter.depth('{"lastUpdateId":1027024,"bids":[["4.00000000","431.00000000"]],"asks":[]}',
+                                    "BTCUSDT")
+        websocket_depth = UnicornFy.binance_com_websocket(
+            '{"stream":"btcusdt@depth5","data":{"lastUpdateId":1,"bids":[],"asks":[]}}')
+        self.assertEqual(set(depth), set(websocket_depth))
+        self.assertEqual(depth['last_update_id'], 1027024)
+        self.assertEqual(depth['stream_type'], "btcusdt@depth_snapshot")
+        depth = RestConverter.depth({'lastUpdateId': 1, 'E': 2, 'T': 3, 'bids': [], 'asks': []}, "BTCUSDT",
+                                    exchange="binance.com-futures")
+        self.assertEqual((depth['event_time'], depth['transaction_time']), (2, 3))
+
+
+class TestDepthDiffTracker(unittest.TestCase):
+    @staticmethod
+    def get_snapshot(last_update_id, bids, asks):
+        return UnicornFy.binance_com_websocket(json.dumps({'stream': "btcusdt@depth5@100ms",
+                                                           'data': {'lastUpdateId': last_update_id,
+                                                                    'bids': bids, 'asks': asks}}))
+
+    def test_update(self):
+        depth_diff_tracker = DepthDiffTracker()
+        diff = depth_diff_tracker.update(self.get_snapshot(1, [["10.0", "1"], ["9.5", "2"], ["9.0", "3"]],
+                                                           [["10.5", "1"], ["11.0", "2"]]))
+        self.assertEqual(diff['event_type'], "depthDiff")
+        self.assertEqual(len(diff['bids']['insert']), 3)
+        diff = depth_diff_tracker.update(self.get_snapshot(2, [["10.0", "1"], ["9.7", "5"], ["9.0", "4"]],
+                                                           [["10.5", "1"], ["11.0", "2"], ["11.5", "1"]]))
+        self.assertEqual(diff['bids'], {'insert': [["9.7", "5"]], 'update': [["9.0", "4"]], 'delete': ["9.5"]})
+        self.assertEqual(diff['asks'], {'insert': [["11.5", "1"]], 'update': [], 'delete': []})
+        self.assertEqual(diff['last_update_id'], 2)
+        diff = depth_diff_tracker.update(self.get_snapshot(3, [["10.0", "1"]], [["10.25", "3"], ["10.5", "1"]]))
+        self.assertEqual(diff['bids']['delete'], ["9.7", "9.0"])
+        self.assertEqual(diff['asks'], {'insert': [["10.25", "3"]], 'update': [], 'delete': ["11.0", "11.5"]})
+        # unchanged and stale snapshots
+        self.assertIsNone(depth_diff_tracker.update(self.get_snapshot(4, [["10.0", "1"]],
+                                                                      [["10.25", "3"], ["10.5", "1"]])))
+        self.assertIsNone(depth_diff_tracker.update(self.get_snapshot(4, [], [])))
+        self.assertEqual(depth_diff_tracker.get_book("btcusdt@depth5@100ms")['bids'], [["10.0", "1"]])
+        stats = depth_diff_tracker.get_stats()
+        self.assertEqual((stats['snapshots'], stats['unchanged_snapshots'], stats['stale_snapshots']), (5, 1, 1))
+        self.assertTrue(depth_diff_tracker.remove_stream("btcusdt@depth5@100ms"))
+
+    def test_futures(self):
+        depth_diff_tracker = DepthDiffTracker()
+        payload = ('{"stream":"btcusdt@depth5","data":{"e":"depthUpdate","E":1,"T":1,"s":"BTCUSDT","U":1,"u":%d,'
+                   '"pu":0,"b":[["1.0","%s"]],"a":[]}}')
+        depth_diff_tracker.update(UnicornFy.binance_com_futures_websocket(payload % (2, "1")))
+        diff = depth_diff_tracker.update(UnicornFy.binance_com_futures_websocket(payload % (3, "2")))
+        self.assertEqual(diff['bids']['update'], [["1.0", "2"]])
+        self.assertEqual(diff['depth_level'], 5)
+        self.assertIsNone(depth_diff_tracker.update(UnicornFy.binance_com_futures_websocket(
+            payload.replace("@depth5", "@depth@100ms") % (4, "3"))))
+
+
+class TestThreadedConverter(unittest.TestCase):
+    @staticmethod
+    def get_frame(symbol, trade_id):
+        return '{"stream":"' + symbol + '@aggTrade","data":{"e":"aggTrade","E":1592584651517,"s":"' + symbol.upper() + '","a":' + str(trade_id) + ',"p":"9319.00000000","q":"0.01864900","f":343675554,"l":343675554,"T":1592584651516,"m":true,"M":true}}'
+
+    def test_is_gil_enabled(self):
+        self.assertIsInstance(is_gil_enabled(), bool)
+        self.assertEqual(ThreadedConverter().threads, 1 if is_gil_enabled() else (os.cpu_count() or 1))
+
+    def test_order_per_symbol(self):
+        gap_detector = SequenceGapDetector()
+        with ThreadedConverter(threads=3, batch_size=7, converter_kwargs={'gap_detector': gap_detector}) as converter:
+            self.assertIsInstance(converter.converter_kwargs['gap_detector'], SynchronizedProxy)
+            for trade_id in range(20):
+                for symbol in ("btcusdt", "ethusdt", "bnbusdt"):
+                    converter.add(self.get_frame(symbol, trade_id))
+        trade_ids = {}
+        while True:
+            batch = converter.get_batch(timeout=30)
+            if batch is None:
+                break
+            for unicorn_fied_data in batch:
+                trade_ids.setdefault(unicorn_fied_data['symbol'], []).append(unicorn_fied_data['aggregate_trade_id'])
+        converter.join()
+        self.assertEqual(trade_ids, {symbol: list(range(20)) for symbol in ("BTCUSDT", "ETHUSDT", "BNBUSDT")})
+        self.assertEqual(gap_detector.get_stats()['gaps'], 0)
+
+    def test_convert_batch(self):
+        frames = [self.get_frame(symbol, trade_id) for trade_id in range(50) for symbol in ("btcusdt", "ethusdt")]
+        frames.insert(3, '{"stream":"btcusdt@aggTrade","data":{"e":"aggTrade"}}')
+        with ThreadedConverter(threads=4) as converter:
+            results = converter.convert_batch(frames)
+        self.assertIsNone(results[3])
+        del results[3], frames[3]
+        self.assertEqual(results, [UnicornFy.binance_com_websocket(frame) for frame in frames])
+        self.assertRaises(RuntimeError, converter.convert_batch, frames)
+
+    def test_synchronized_proxy(self):
+        top_of_book = TopOfBook()
+        proxy = SynchronizedProxy(top_of_book)
+        threads = [threading.Thread(target=lambda symbol: [proxy.update_values(symbol, update_id, 1.0, 2.0, 3.0, 4.0)
+                                                           for update_id in range(1000)], args=(f"SYM{number}",))
+                   for number in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(top_of_book.get("SYM3")['order_book_update_id'], 999)
+        self.assertIs(proxy.hook, top_of_book)
+
+
+class TestFileSink(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.records = [{'event_type': 'trade', 'symbol': 'BTCUSDT', 'trade_id': trade_id, 'price': 9302.0}
+                        for trade_id in range(3000)]
+
+    def tearDown(self):
+        for file_name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, file_name))
+        os.rmdir(self.directory)
+
+    def read_records(self, files, open_file=open):
+        records = []
+        for path in files:
+            with open_file(path, "rb") as file:
+                records.extend(json.loads(line) for line in file.read().splitlines())
+        return records
+
+    def test_rotate_by_size(self):
+        closed_files = []
+        with FileSink(directory=self.directory, max_file_size=20000, buffer_size=4096,
+                      on_file_closed=closed_files.append) as file_sink:
+            for record in self.records:
+                self.assertTrue(file_sink.add(record))
+        self.assertGreater(len(file_sink.get_files()), 1)
+        self.assertEqual(closed_files, file_sink.get_files())
+        self.assertTrue(all(path.endswith(".ndjson") for path in closed_files))
+        self.assertEqual(self.read_records(closed_files), self.records)
+        stats = file_sink.get_stats()
+        self.assertEqual(stats['written_records'], 3000)
+        self.assertEqual(stats['dropped_records'], 0)
+
+    def test_compression(self):
+        import gzip
+        import lzma
+        for compression, open_file in (("gzip", gzip.open), ("lzma", lzma.open)):
+            with FileSink(directory=self.directory, prefix=compression, compression=compression) as file_sink:
+                for record in self.records:
+                    file_sink.add(record)
+            self.assertEqual(len(file_sink.get_files()), 1)
+            self.assertEqual(self.read_records(file_sink.get_files(), open_file), self.records)
+
+    def test_rotate_by_time(self):
+        with FileSink(directory=self.directory, rotation_interval=0.1, flush_interval=0.01) as file_sink:
+            file_sink.add(self.records[0])
+            time.sleep(0.5)
+            file_sink.add(self.records[1])
+        self.assertEqual(len(file_sink.get_files()), 2)
+        self.assertEqual(self.read_records(file_sink.get_files()), self.records[:2])
+
+    def test_flush_steady_trickle(self):
+        with FileSink(directory=self.directory, flush_interval=0.2) as file_sink:
+            for record in self.records[:30]:
+                file_sink.add(record)
+                time.sleep(0.02)
+            written_records = file_sink.get_stats()['written_records']
+        self.assertGreater(written_records, 0)
+        self.assertEqual(self.read_records(file_sink.get_files()), self.records[:30])
+
+    def test_overflow(self):
+        file_sink = FileSink(directory=self.directory, capacity=2, overflow="drop")
+        record = RecordPool().acquire(BookTickerRecord)
+        record['symbol'] = "BTCUSDT"
+        self.assertTrue(file_sink.add(self.records[0]))
+        self.assertTrue(file_sink.add(record))
+        record.clear()
+        self.assertFalse(file_sink.add(self.records[2]))
+        self.assertEqual(file_sink.ring_buffer.pop_batch(), [self.records[0], {'symbol': "BTCUSDT"}])
+        file_sink = FileSink(directory=self.directory, capacity=2, block_timeout=0.05)
+        file_sink.add(self.records[0])
+        file_sink.add(self.records[1])
+        self.assertFalse(file_sink.add(self.records[2]))
+        self.assertEqual(file_sink.get_stats()['dropped_records'], 1)
+        file_sink.start()
+        file_sink.block_timeout = None
+        self.assertTrue(file_sink.add(self.records[2]))
+        file_sink.stop()
+        self.assertEqual(self.read_records(file_sink.get_files()), self.records[:3])
+        # Stopped sink, a blocking `add()` must not wait forever
+        self.assertTrue(file_sink.add(self.records[3]))
+        self.assertTrue(file_sink.add(self.records[4]))
+        self.assertFalse(file_sink.add(self.records[5]))
+        self.assertEqual(file_sink.get_stats()['dropped_records'], 2)
+        self.assertRaises(ValueError, FileSink, directory=self.directory, compression="zip")
+        self.assertRaises(ValueError, FileSink, directory=self.directory, overflow="wait")
+
+
 UBWA = unicorn_binance_websocket_api.BinanceWebSocketApiManager(exchange="binance.us")
 
 